@@ -0,0 +1,5 @@
+"""
+Performance benchmarks for finiteautomata (not shipped with the package).
+
+Run from the repository root, e.g. `python -m benchmarks.run`; see benchmarks/run.py.
+"""
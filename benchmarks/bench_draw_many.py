@@ -0,0 +1,51 @@
+"""
+Measure draw_many() throughput as the number of worker processes grows.
+
+    python -m benchmarks.bench_draw_many --items 2000 --workers 1 2 4 8
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from finiteautomata import FiniteAutomata, draw_many
+
+
+def random_automaton(states: int, seed: int) -> FiniteAutomata:
+    rng = random.Random(seed)
+    fsm = FiniteAutomata()
+    fsm.start("q0").accept(f"q{states - 1}")
+    for idx in range(states):
+        for symbol in "ab":
+            fsm.transition(f"q{idx}", symbol, f"q{rng.randrange(states)}")
+    return fsm
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=2000)
+    parser.add_argument("--states", type=int, default=12)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument("--formats", nargs="+", default=["svg"])
+    args = parser.parse_args()
+
+    machines = [random_automaton(args.states, seed) for seed in range(args.items)]
+    baseline = None
+    with tempfile.TemporaryDirectory() as out_dir:
+        for workers in args.workers:
+            # Warm the pool so process start-up is not part of the measurement.
+            list(draw_many([(os.path.join(out_dir, "warm"), machines[0])], args.formats, workers))
+            items = ((os.path.join(out_dir, f"fsm{idx}"), fsm) for idx, fsm in enumerate(machines))
+            started = time.perf_counter()
+            failures = sum(not result.ok for result in draw_many(items, args.formats, workers))
+            elapsed = time.perf_counter() - started
+            baseline = baseline or elapsed
+            print(
+                f"workers={workers:<3} {elapsed:7.3f}s  {args.items / elapsed:8.1f} items/s  "
+                f"speedup={baseline / elapsed:4.2f}x  failures={failures}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Time layout engines on random sparse automata and count the edge crossings they produce.
+
+"legacy" is the original list-based BFS with alphabetical level ordering, kept
+here as the reference point; "classic" and "layered" are the RendererConfig engines.
+
+    python -m benchmarks.bench_layout --sizes 1000 10000 50000
+"""
+import argparse
+import time
+from typing import Dict, List, Tuple
+
+from benchmarks.generators import random_sparse
+from finiteautomata.renderer import AutomataRenderer, RendererConfig
+from finiteautomata.transitions import TransitionStore
+
+
+def legacy_layout(states, start_state, transitions, config) -> Dict[str, Tuple[float, float]]:
+    levels: Dict[str, int] = {}
+    adjacency: Dict[str, List[str]] = {}
+    for src, _, dst in transitions:
+        adjacency.setdefault(src, []).append(dst)
+    queue = [start_state]
+    levels[start_state] = 0
+    while queue:
+        current = queue.pop(0)
+        for nxt in adjacency.get(current, []):
+            if nxt == current:
+                continue
+            tentative = levels[current] + 1
+            if nxt not in levels or tentative < levels[nxt]:
+                levels[nxt] = tentative
+                queue.append(nxt)
+    levels_to_states: Dict[int, List[str]] = {}
+    for state, level in levels.items():
+        levels_to_states.setdefault(level, []).append(state)
+    positions = {}
+    for level, level_states in levels_to_states.items():
+        for idx, state in enumerate(sorted(level_states)):
+            positions[state] = (level * config.horizontal_gap, idx * config.vertical_gap)
+    return positions
+
+
+def count_crossings(positions: Dict[str, Tuple[float, float]], transitions, gap: float) -> int:
+    """Crossings between edges joining adjacent columns, counted by inversions (O(E log E))."""
+    by_column: Dict[int, List[Tuple[float, float]]] = {}
+    for src, _, dst in transitions:
+        (sx, sy), (dx, dy) = positions[src], positions[dst]
+        if abs(dx - sx) == gap:
+            if dx < sx:
+                sx, sy, dx, dy = dx, dy, sx, sy
+            by_column.setdefault(int(sx // gap), []).append((sy, dy))
+    total = 0
+    for edges in by_column.values():
+        edges.sort()
+        total += _inversions([dy for _, dy in edges])
+    return total
+
+
+def _inversions(values: List[float]) -> int:
+    if len(values) < 2:
+        return 0
+    mid = len(values) // 2
+    left, right = values[:mid], values[mid:]
+    count = _inversions(left) + _inversions(right)
+    merged, i, j = [], 0, 0
+    while i < len(left) and j < len(right):
+        if right[j] < left[i]:
+            merged.append(right[j])
+            count += len(left) - i
+            j += 1
+        else:
+            merged.append(left[i])
+            i += 1
+    merged.extend(left[i:])
+    merged.extend(right[j:])
+    values[:] = merged
+    return count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--sweeps", type=int, default=4)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        spec = random_sparse(size)
+        states, start, store = spec.states, spec.start, TransitionStore(spec.transitions)
+        for engine in ("legacy", "classic", "layered"):
+            config = RendererConfig(layout="classic" if engine == "legacy" else engine,
+                                    crossing_sweeps=args.sweeps)
+            started = time.perf_counter()
+            if engine == "legacy":
+                positions = legacy_layout(states, start, store, config)
+            else:
+                positions = AutomataRenderer(states, start, [], store, config=config)._positions
+            elapsed = time.perf_counter() - started
+            crossings = count_crossings(positions, store, config.horizontal_gap)
+            print(f"states={size:<7} {engine:<8} {elapsed:8.3f}s  crossings={crossings}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Compare peak memory of writing SVG + HTML by joining the document into one string
+(the old approach) against streaming it element by element.
+
+Layout is computed before measuring, so the numbers cover output generation only.
+The streamed peak should stay flat while the joined peak grows with the output.
+
+The draw rows go through FiniteAutomata.draw(), layout included, and also report what
+fsm.render_cache still holds afterwards: "retain-all" keeps every SVG fragment
+(max_fragments=None), "bounded" uses the default limit.
+
+    python -m benchmarks.bench_memory --sizes 1000 10000 50000
+"""
+import argparse
+import gc
+import os
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.generators import random_sparse
+from finiteautomata.renderer import _HTML_TAIL, DEFAULT_MAX_FRAGMENTS, AutomataRenderer
+
+
+def joined(renderer: AutomataRenderer, base: str) -> None:
+    svg_content = renderer._build_svg(inline=True)
+    with open(base + ".svg", "w", encoding="utf-8") as fh:
+        fh.write(svg_content + "\n")
+    with open(base + ".html", "w", encoding="utf-8") as fh:
+        fh.write(renderer._html_head(base) + svg_content + _HTML_TAIL)
+
+
+def streamed(renderer: AutomataRenderer, base: str) -> None:
+    renderer.render(base, ("svg", "html"))
+
+
+def measure(size: int, method, directory: str):
+    spec = random_sparse(size)
+    renderer = AutomataRenderer(spec.states, spec.start, spec.states[-1:], spec.transitions)
+    base = os.path.join(directory, f"{method.__name__}-{size}")
+    tracemalloc.start()
+    started = time.perf_counter()
+    method(renderer, base)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    output = os.path.getsize(base + ".svg") + os.path.getsize(base + ".html")
+    return elapsed, peak, output
+
+
+def measure_draw(size: int, max_fragments, directory: str):
+    spec = random_sparse(size)
+    fsm = spec.build()
+    fsm.configure_renderer(formats=("svg", "html"))
+    fsm.render_cache.max_fragments = max_fragments
+    base = os.path.join(directory, f"draw-{size}")
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    fsm.draw(base)
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, retained
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            for method in (joined, streamed):
+                elapsed, peak, output = measure(size, method, directory)
+                print(
+                    f"states={size:<7} {method.__name__:<9} {elapsed:7.3f}s  "
+                    f"peak={peak / 1e6:8.2f} MB  output={output / 1e6:8.2f} MB"
+                )
+            for label, limit in (("retain-all", None), ("bounded", DEFAULT_MAX_FRAGMENTS)):
+                elapsed, peak, retained = measure_draw(size, limit, directory)
+                print(
+                    f"states={size:<7} draw {label:<10} {elapsed:7.3f}s  "
+                    f"peak={peak / 1e6:8.2f} MB  retained={retained / 1e6:8.2f} MB"
+                )
+
+
+if __name__ == "__main__":
+    main()
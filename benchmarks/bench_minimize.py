@@ -0,0 +1,55 @@
+"""
+Benchmark Hopcroft minimization on random DFAs.
+
+Each machine is `copies` interleaved copies of a random complete DFA with
+`states // copies` states: every transition jumps to the matching state of a
+random copy, so the minimal automaton is at most `states // copies` states.
+
+    python -m benchmarks.bench_minimize --states 100000
+"""
+import argparse
+import random
+import time
+
+from finiteautomata import FiniteAutomata
+
+
+def random_redundant_dfa(states: int, symbols: str = "ab", copies: int = 10, seed: int = 0):
+    rng = random.Random(seed)
+    base = max(1, states // copies)
+    accepting = {q for q in range(base) if rng.random() < 0.3}
+    targets = {(q, s): rng.randrange(base) for q in range(base) for s in symbols}
+
+    fsm = FiniteAutomata()
+    fsm.start("c0_q0")
+    for copy_idx in range(copies):
+        for q in range(base):
+            name = f"c{copy_idx}_q{q}"
+            if q in accepting:
+                fsm.accept(name)
+            for symbol in symbols:
+                dst = f"c{rng.randrange(copies)}_q{targets[(q, symbol)]}"
+                fsm.transition(name, symbol, dst)
+    return fsm
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--states", type=int, default=100_000)
+    parser.add_argument("--copies", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    fsm = random_redundant_dfa(args.states, copies=args.copies, seed=args.seed)
+    built = time.perf_counter()
+    minimal = fsm.minimize()
+    finished = time.perf_counter()
+
+    print(f"states: {len(fsm.states)} -> {len(minimal.states)}")
+    print(f"transitions: {len(fsm.transitions)} -> {len(minimal.transitions)}")
+    print(f"build: {built - started:.3f}s  minimize: {finished - built:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Time spatial edge routing (routing="spatial") on random sparse automata and count the
+transition labels left overlapping, against the fixed placement of routing="direct".
+
+Routing should stay near-linear: the per-edge cost in the last column ought to stay
+roughly flat as the machine grows.
+
+    python -m benchmarks.bench_routing --edges 12500 25000 50000 100000
+"""
+import argparse
+import time
+
+from benchmarks.generators import random_sparse
+from finiteautomata.renderer import AutomataRenderer, RendererConfig
+from finiteautomata.routing import label_overlaps
+
+
+def drawn_label_overlaps(renderer: AutomataRenderer) -> int:
+    positions = renderer._positions
+    labels = (
+        (renderer._edge_geometry(src, dst, positions[src], positions[dst])[2], ", ".join(symbols))
+        for (src, dst), symbols in renderer._grouped_transitions.items()
+    )
+    return label_overlaps(labels, renderer.config.state_radius * 2)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--edges", type=int, nargs="+", default=[12500, 25000, 50000, 100000])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for edges in args.edges:
+        # random_sparse adds about two edges per state.
+        spec = random_sparse(edges // 2, seed=args.seed)
+        results = {}
+        for routing in ("direct", "spatial"):
+            started = time.perf_counter()
+            renderer = AutomataRenderer(
+                spec.states, spec.start, spec.accept, spec.transitions, config=RendererConfig(routing=routing)
+            )
+            elapsed = time.perf_counter() - started
+            results[routing] = (renderer, elapsed, drawn_label_overlaps(renderer))
+        renderer, elapsed, overlaps = results["spatial"]
+        routed = renderer.stats["route"]
+        print(
+            f"edges={len(renderer._grouped_transitions):<7} "
+            f"prepare direct={results['direct'][1]:6.2f}s spatial={elapsed:6.2f}s  "
+            f"label overlaps direct={results['direct'][2]:<6} spatial={overlaps:<6} "
+            f"route={routed.seconds:6.2f}s ({routed.seconds / routed.elements * 1e6:5.1f} us/edge)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Compare the memory held by the indexed TransitionStore against the interned,
+array-backed CompactTransitionStore (FiniteAutomata(compact=True)).
+
+For each machine, `retained` is what the built automaton keeps alive (the spec's own
+strings excluded), also given per transition, and `peak` the high-water mark while
+building it. Build times include tracemalloc's overhead, which penalizes the compact
+store's short-lived merge buffers. The script fails if the compact store does not
+retain fewer bytes per transition than the indexed one.
+
+    python -m benchmarks.bench_store --sizes 10000 100000 --generator dense
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+from benchmarks.generators import GENERATORS
+
+
+def measure(spec, compact: bool):
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    fsm = spec.build(compact=compact)
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return fsm, elapsed, retained, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--generator", choices=sorted(GENERATORS), default="dense")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        spec = GENERATORS[args.generator](size, seed=args.seed)
+        results = {}
+        for label, compact in (("indexed", False), ("compact", True)):
+            fsm, elapsed, retained, peak = measure(spec, compact)
+            per_edge = retained / max(1, len(fsm.transitions))
+            results[label] = per_edge
+            print(
+                f"states={size:<7} transitions={len(fsm.transitions):<8} {label:<8} "
+                f"build={elapsed:7.3f}s  retained={retained / 1e6:8.2f} MB ({per_edge:6.1f} B/edge)  "
+                f"peak={peak / 1e6:8.2f} MB"
+            )
+            del fsm
+        print(f"{'':<36} compact/indexed = {results['compact'] / results['indexed']:.2f}")
+        assert results["compact"] < results["indexed"], "compact store retains more bytes per edge"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Seeded synthetic automata for benchmarks.
+
+Every generator takes a state count and a seed and returns an AutomatonSpec, a plain
+description that can be timed separately from FiniteAutomata construction. The same
+(states, seed) pair always produces the same machine.
+"""
+import math
+import random
+from typing import Callable, Dict, List, NamedTuple, Tuple
+
+from finiteautomata import FiniteAutomata
+
+Transition = Tuple[str, str, str]
+
+
+class AutomatonSpec(NamedTuple):
+    states: List[str]
+    start: str
+    accept: List[str]
+    transitions: List[Transition]
+
+    def build(self, compact: bool = False) -> FiniteAutomata:
+        fsm = FiniteAutomata(compact=compact)
+        fsm.start(self.start)
+        for state in self.states:
+            fsm.state(state)
+        for state in self.accept:
+            fsm.accept(state)
+        for from_state, symbol, to_state in self.transitions:
+            fsm.transition(from_state, symbol, to_state)
+        return fsm
+
+
+def _names(states: int) -> List[str]:
+    return [f"q{idx}" for idx in range(max(1, states))]
+
+
+def chain(states: int, seed: int = 0) -> AutomatonSpec:
+    """q0 -a-> q1 -a-> ... with the last state accepting."""
+    names = _names(states)
+    transitions = [(names[idx], "a", names[idx + 1]) for idx in range(len(names) - 1)]
+    return AutomatonSpec(names, names[0], names[-1:], transitions)
+
+
+def grid(states: int, seed: int = 0) -> AutomatonSpec:
+    """A square-ish grid moving right on 'r' and down on 'd'; the far corner accepts."""
+    names = _names(states)
+    width = max(1, int(math.sqrt(len(names))))
+    transitions = []
+    for idx, name in enumerate(names):
+        if (idx + 1) % width and idx + 1 < len(names):
+            transitions.append((name, "r", names[idx + 1]))
+        if idx + width < len(names):
+            transitions.append((name, "d", names[idx + width]))
+    return AutomatonSpec(names, names[0], names[-1:], transitions)
+
+
+def random_sparse(states: int, seed: int = 0, extra_edges_per_state: float = 1.0) -> AutomatonSpec:
+    """
+    A random spanning tree (each state hangs off one of the 64 states before it) plus
+    about `extra_edges_per_state` short forward edges per state on 'b'.
+    """
+    rng = random.Random(seed)
+    names = _names(states)
+    count = len(names)
+    transitions = []
+    for idx in range(1, count):
+        parent = rng.randrange(max(0, idx - 64), idx)
+        transitions.append((names[parent], "a", names[idx]))
+    for _ in range(int(count * extra_edges_per_state)):
+        src = rng.randrange(count)
+        dst = min(count - 1, src + rng.randrange(1, 128))
+        transitions.append((names[src], "b", names[dst]))
+    accept = [name for name in names if rng.random() < 0.1]
+    return AutomatonSpec(names, names[0], accept, transitions)
+
+
+def random_dense(states: int, seed: int = 0, symbols: int = 16) -> AutomatonSpec:
+    """A random complete DFA: every state has a transition on each of `symbols` symbols."""
+    rng = random.Random(seed)
+    names = _names(states)
+    alphabet = [f"s{idx}" for idx in range(symbols)]
+    transitions = [
+        (name, symbol, names[rng.randrange(len(names))]) for name in names for symbol in alphabet
+    ]
+    accept = [name for name in names if rng.random() < 0.3]
+    return AutomatonSpec(names, names[0], accept, transitions)
+
+
+def self_loops(states: int, seed: int = 0, loops: int = 3) -> AutomatonSpec:
+    """A chain where every state also loops on `loops` symbols of its own."""
+    rng = random.Random(seed)
+    spec = chain(states, seed)
+    transitions = list(spec.transitions)
+    for name in spec.states:
+        for symbol in rng.sample("bcdefgh", loops):
+            transitions.append((name, symbol, name))
+    return spec._replace(transitions=transitions)
+
+
+GENERATORS: Dict[str, Callable[..., AutomatonSpec]] = {
+    "chain": chain,
+    "grid": grid,
+    "sparse": random_sparse,
+    "dense": random_dense,
+    "loops": self_loops,
+}
@@ -0,0 +1,68 @@
+"""
+Run the benchmark suite, optionally save a JSON baseline, and fail on regressions.
+
+    python -m benchmarks.run --save benchmarks/baseline.json
+    python -m benchmarks.run --baseline benchmarks/baseline.json --threshold 0.2
+    python -m benchmarks.run --generators sparse dense --sizes 10 1000 100000
+
+Exits with status 1 when any phase is slower, or uses more peak memory, than the
+baseline by more than the threshold.
+"""
+import argparse
+import sys
+from typing import List, Optional
+
+from .generators import GENERATORS
+from .suite import PHASES, Measurement, compare, load_results, run_suite, save_results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--generators", nargs="+", choices=sorted(GENERATORS), default=list(GENERATORS))
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--phases", nargs="+", choices=PHASES, default=list(PHASES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--save", metavar="PATH", help="write the results as a JSON baseline")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against a saved baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown as a fraction (default 0.25)")
+    parser.add_argument("--memory-threshold", type=float, default=None,
+                        help="allowed peak memory growth (defaults to --threshold)")
+    args = parser.parse_args(argv)
+
+    def progress(key: str, measurement: Measurement) -> None:
+        print(f"{key:<28} {measurement.seconds * 1000:10.2f} ms  "
+              f"{measurement.peak_bytes / 1e6:9.2f} MB", flush=True)
+
+    results = run_suite(
+        args.generators,
+        args.sizes,
+        phases=args.phases,
+        repeat=args.repeat,
+        memory=not args.no_memory,
+        seed=args.seed,
+        progress=progress,
+    )
+    if args.save:
+        save_results(args.save, results)
+
+    if not args.baseline:
+        return 0
+    regressions = compare(
+        load_results(args.baseline), results, args.threshold, args.memory_threshold
+    )
+    for regression in regressions:
+        print(
+            f"REGRESSION {regression.key} {regression.metric}: "
+            f"{regression.baseline:.6g} -> {regression.current:.6g} ({regression.ratio:.2f}x)"
+        )
+    if regressions:
+        return 1
+    print("No regressions against", args.baseline)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
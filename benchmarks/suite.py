@@ -0,0 +1,168 @@
+"""
+Per-phase timing and peak memory for building and rendering synthetic automata.
+
+Phases, measured on the same machine in order:
+
+- construct: FiniteAutomata construction from the generated spec
+- layout:    AutomataRenderer._compute_layout from a cold cache
+- group:     grouping transitions by (source, target): a fresh store built from the
+             automaton's transitions and its first grouped() call (the renderer
+             itself reuses the store's incrementally maintained grouping)
+- svg:       generating the full SVG document (_iter_svg)
+- write:     render() to svg and html files
+
+Results are keyed "generator/states/phase" and stored as JSON baselines.
+"""
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+from finiteautomata.renderer import AutomataRenderer
+from finiteautomata.transitions import TransitionStore
+
+from .generators import GENERATORS
+
+PHASES = ("construct", "layout", "group", "svg", "write")
+
+
+class Measurement(NamedTuple):
+    seconds: float
+    peak_bytes: int
+
+
+class Regression(NamedTuple):
+    key: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline if self.baseline else float("inf")
+
+
+def _timed(func: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _peak(func: Callable[[], object]) -> int:
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _phases(generator: str, states: int, seed: int, directory: str) -> Dict[str, Callable[[], object]]:
+    spec = GENERATORS[generator](states, seed)
+    fsm = spec.build()
+    renderer = AutomataRenderer(fsm.states, fsm.start_state, fsm.accept_states, fsm.transitions)
+    base = os.path.join(directory, f"{generator}-{states}")
+
+    def layout() -> None:
+        renderer.cache.reset_layout()
+        renderer._compute_layout()
+
+    def group() -> None:
+        TransitionStore.from_unique(fsm.transitions).grouped()
+
+    def svg() -> None:
+        for _ in renderer._iter_svg():
+            pass
+
+    return {
+        "construct": spec.build,
+        "layout": layout,
+        "group": group,
+        "svg": svg,
+        "write": lambda: renderer.render(base, ("svg", "html")),
+    }
+
+
+def run_suite(
+    generators: Iterable[str],
+    sizes: Iterable[int],
+    phases: Sequence[str] = PHASES,
+    repeat: int = 3,
+    memory: bool = True,
+    seed: int = 0,
+    progress: Optional[Callable[[str, Measurement], None]] = None,
+) -> Dict[str, Measurement]:
+    """
+    Measure every phase for every (generator, size) pair. Time is the best of `repeat`
+    runs; peak memory comes from one extra run under tracemalloc, so tracing overhead
+    does not distort the timings.
+    """
+    results: Dict[str, Measurement] = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for generator in generators:
+            for states in sizes:
+                steps = _phases(generator, states, seed, directory)
+                for phase in phases:
+                    seconds = _timed(steps[phase], repeat)
+                    peak = _peak(steps[phase]) if memory else 0
+                    key = f"{generator}/{states}/{phase}"
+                    results[key] = Measurement(seconds, peak)
+                    if progress is not None:
+                        progress(key, results[key])
+    return results
+
+
+def save_results(path: str, results: Dict[str, Measurement]) -> None:
+    document = {
+        "meta": {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": {key: measurement._asdict() for key, measurement in sorted(results.items())},
+    }
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(document, fh, indent=2)
+        fh.write("\n")
+
+
+def load_results(path: str) -> Dict[str, Measurement]:
+    with open(path, encoding="utf-8") as fh:
+        document = json.load(fh)
+    return {key: Measurement(**value) for key, value in document["results"].items()}
+
+
+def compare(
+    baseline: Dict[str, Measurement],
+    current: Dict[str, Measurement],
+    threshold: float = 0.25,
+    memory_threshold: Optional[float] = None,
+    min_seconds: float = 0.005,
+    min_bytes: int = 64 * 1024,
+) -> List[Regression]:
+    """
+    Report phases that got slower (or used more memory) than the baseline by more than
+    `threshold` (a fraction, 0.25 = 25%). Differences below `min_seconds` / `min_bytes`
+    are treated as noise. Keys missing from either side are ignored.
+    """
+    if memory_threshold is None:
+        memory_threshold = threshold
+    regressions: List[Regression] = []
+    for key in sorted(baseline.keys() & current.keys()):
+        old, new = baseline[key], current[key]
+        if new.seconds - old.seconds > min_seconds and new.seconds > old.seconds * (1 + threshold):
+            regressions.append(Regression(key, "seconds", old.seconds, new.seconds))
+        if (
+            old.peak_bytes
+            and new.peak_bytes - old.peak_bytes > min_bytes
+            and new.peak_bytes > old.peak_bytes * (1 + memory_threshold)
+        ):
+            regressions.append(Regression(key, "peak_bytes", old.peak_bytes, new.peak_bytes))
+    return regressions
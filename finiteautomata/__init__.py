@@ -1,5 +1,15 @@
+from .batch import BatchResult, draw_many
 from .core import FiniteAutomata
+from .engine import EPSILON, CompiledDFA
+from .equivalence import LanguageCheck
+from .lazy import LazyDFA
+from .nfa import BitsetNFA
+from .product import SINK, ProductAutomaton
+from .profiling import PhaseStats, RenderHook, RenderStats
+from .regex import clear_regex_cache, regex_cache_info
 from .renderer import RendererConfig, RendererTheme
+from .serialize import AutomatonImage
+from .stream import Match, StreamMatcher
 
-__all__ = ['FiniteAutomata', 'RendererConfig', 'RendererTheme']
+__all__ = ['FiniteAutomata', 'AutomatonImage', 'BatchResult', 'BitsetNFA', 'CompiledDFA', 'EPSILON', 'LanguageCheck', 'LazyDFA', 'Match', 'PhaseStats', 'ProductAutomaton', 'RenderHook', 'RenderStats', 'RendererConfig', 'RendererTheme', 'SINK', 'StreamMatcher', 'clear_regex_cache', 'draw_many', 'regex_cache_info']
 
@@ -0,0 +1,163 @@
+import asyncio
+import io
+import os
+import tempfile
+import threading
+from typing import TYPE_CHECKING, Dict, Optional, Sequence
+from weakref import WeakKeyDictionary
+
+from .profiling import RenderOutputs
+from .renderer import _import_cairosvg, _rasterize, get_executor
+
+if TYPE_CHECKING:
+    from .core import FiniteAutomata
+    from .renderer import RendererTheme
+
+_SEMAPHORES: "WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[int, asyncio.Semaphore]]" = (
+    WeakKeyDictionary()
+)
+_SEMAPHORES_LOCK = threading.Lock()
+
+
+class _Abandoned(Exception):
+    """Raised inside a worker once the awaiting task has been cancelled."""
+
+
+def render_semaphore(limit: int) -> asyncio.Semaphore:
+    """
+    Return the semaphore bounding concurrent draw_async() renders on the running loop.
+    Renders configured with the same limit share one semaphore per loop.
+    """
+    if limit < 1:
+        raise ValueError("async_limit must be at least 1.")
+    loop = asyncio.get_event_loop()
+    with _SEMAPHORES_LOCK:
+        per_loop = _SEMAPHORES.setdefault(loop, {})
+        semaphore = per_loop.get(limit)
+        if semaphore is None:
+            semaphore = per_loop[limit] = asyncio.Semaphore(limit)
+        return semaphore
+
+
+async def draw_async(
+    fsm: "FiniteAutomata",
+    filename: str,
+    formats: Sequence[str],
+    theme: Optional["RendererTheme"],
+    in_memory: bool,
+    semaphore: Optional[asyncio.Semaphore],
+) -> RenderOutputs:
+    """
+    Run a render on the shared thread pool without blocking the event loop.
+
+    The layout is taken on the loop thread, so the worker never reads the live
+    automaton while other coroutines edit it; it is usually served from the render
+    cache. Document generation, file writes and rasterization happen in the worker.
+    Cancelling the awaiting task abandons the render at the next write and removes any
+    partially written files.
+    """
+    requested = []
+    for fmt in formats:
+        fmt_lower = fmt.lower()
+        if fmt_lower not in ("svg", "html", "png"):
+            raise ValueError(f"Unsupported output format '{fmt}'. Expected one of svg, png, html.")
+        requested.append(fmt_lower)
+    if "png" in requested:
+        _import_cairosvg()
+
+    config = fsm.renderer_config
+    if semaphore is None:
+        semaphore = render_semaphore(config.async_limit)
+    executor = get_executor("thread", config.max_workers)
+    abandoned = threading.Event()
+    render = _render_in_memory if in_memory else _render_files
+    async with semaphore:
+        renderer = fsm._renderer(theme)
+        renderer._freeze()
+        future = executor.submit(render, renderer, fsm.render_cache.lock, filename, requested, abandoned)
+        done = asyncio.wrap_future(future)
+        try:
+            return await asyncio.shield(done)
+        except asyncio.CancelledError:
+            abandoned.set()
+            future.cancel()  # drops it if it has not started yet
+            # The worker stops at its next write: hold the slot until it has.
+            while not done.done():
+                try:
+                    await asyncio.wait((done,))
+                except asyncio.CancelledError:
+                    pass
+            if not done.cancelled():
+                done.exception()  # retrieved, so an _Abandoned is not logged
+            raise
+
+
+def _check(abandoned: threading.Event) -> None:
+    if abandoned.is_set():
+        raise _Abandoned()
+
+
+def _render_files(renderer, lock, filename, requested, abandoned) -> RenderOutputs:
+    paths = {fmt: f"{filename}.{fmt}" for fmt in requested}
+    svg_path = paths.get("svg")
+    temporary_svg = "png" in paths and svg_path is None
+    if temporary_svg:
+        fd, svg_path = tempfile.mkstemp(suffix=".svg", dir=os.path.dirname(os.path.abspath(filename)))
+        os.close(fd)
+    created = [svg_path] if temporary_svg else []
+    try:
+        with lock:
+            _check(abandoned)
+            created.extend(path for path in (paths.get("svg"), paths.get("html")) if path is not None)
+            renderer._stream_documents(
+                svg_path, paths.get("html"), filename, check=lambda: _check(abandoned)
+            )
+        if "png" in paths:
+            _check(abandoned)
+            created.append(paths["png"])
+            probe = renderer._probe
+            started = probe.start("png", memory=False)
+            _rasterize(svg_path, paths["png"], temporary_svg)
+            probe.finish("png", started, os.path.getsize(paths["png"]), elements=1, memory=False)
+    except BaseException:
+        for path in created:
+            if os.path.exists(path):
+                os.remove(path)
+        raise
+    return RenderOutputs({fmt: paths[fmt] for fmt in requested}, renderer.stats)
+
+
+def _render_in_memory(renderer, lock, filename, requested, abandoned) -> RenderOutputs:
+    with lock:
+        _check(abandoned)
+        probe = renderer._probe
+        started = probe.start("svg")
+        documents: Dict[str, bytes] = {}
+        if "svg" in requested or "png" in requested:
+            documents["svg"] = _capture(renderer.write_svg, abandoned)
+        if "html" in requested:
+            documents["html"] = _capture(lambda stream: renderer.write_html(stream, filename), abandoned)
+        elements = len(renderer._positions) + len(renderer._grouped_transitions)
+        probe.finish("svg", started, sum(map(len, documents.values())), elements)
+    if "png" in requested:
+        _check(abandoned)
+        started = probe.start("png", memory=False)
+        documents["png"] = _import_cairosvg().svg2png(bytestring=documents["svg"])
+        probe.finish("png", started, len(documents["png"]), elements=1, memory=False)
+    return RenderOutputs({fmt: documents[fmt] for fmt in requested}, renderer.stats)
+
+
+class _GuardedBuffer(io.StringIO):
+    def __init__(self, abandoned: threading.Event):
+        super().__init__()
+        self._abandoned = abandoned
+
+    def write(self, chunk: str) -> int:
+        _check(self._abandoned)
+        return super().write(chunk)
+
+
+def _capture(write_document, abandoned: threading.Event) -> bytes:
+    buffer = _GuardedBuffer(abandoned)
+    write_document(buffer)
+    return buffer.getvalue().encode("utf-8")
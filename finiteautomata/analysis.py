@@ -0,0 +1,205 @@
+from typing import (
+    AbstractSet,
+    Callable,
+    Dict,
+    FrozenSet,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from .engine import ordered
+from .transitions import STORE_TYPES, Transition, TransitionStore
+
+
+class Structure(NamedTuple):
+    """
+    Structural facts about an automaton, computed in O(states + transitions).
+
+    - reachable: states reachable from the start state
+    - coreachable: states from which some accepting state is reachable
+    - useful: reachable and co-reachable (the states trim() keeps)
+    - dead: reachable but not co-reachable (no accepting continuation)
+    - unreachable: states the start state never reaches
+    - components: strongly connected components in reverse topological order
+      (every edge leaving a component points to one listed earlier)
+    """
+
+    reachable: FrozenSet[Hashable]
+    coreachable: FrozenSet[Hashable]
+    useful: FrozenSet[Hashable]
+    dead: FrozenSet[Hashable]
+    unreachable: FrozenSet[Hashable]
+    components: Tuple[Tuple[Hashable, ...], ...]
+
+
+def strongly_connected_components(
+    nodes: Iterable[Hashable], successors: Callable[[Hashable], Iterable[Hashable]]
+) -> List[Tuple[Hashable, ...]]:
+    """
+    Tarjan's algorithm with an explicit stack, so deep graphs never hit the recursion
+    limit. Components come out in reverse topological order.
+    """
+    index: Dict[Hashable, int] = {}
+    lowlink: Dict[Hashable, int] = {}
+    on_stack = set()
+    stack: List[Hashable] = []
+    components: List[Tuple[Hashable, ...]] = []
+    counter = 0
+    for root in nodes:
+        if root in index:
+            continue
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        work: List[Tuple[Hashable, Iterator[Hashable]]] = [(root, iter(successors(root)))]
+        while work:
+            node, children = work[-1]
+            for child in children:
+                if child not in index:
+                    index[child] = lowlink[child] = counter
+                    counter += 1
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(successors(child))))
+                    break
+                if child in on_stack and index[child] < lowlink[node]:
+                    lowlink[node] = index[child]
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if lowlink[node] < lowlink[parent]:
+                        lowlink[parent] = lowlink[node]
+                if lowlink[node] == index[node]:
+                    members = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        members.append(member)
+                        if member == node:
+                            break
+                    components.append(tuple(members))
+    return components
+
+
+def _closure(seeds: Iterable[Hashable], neighbours: Callable[[Hashable], AbstractSet[Hashable]]) -> FrozenSet[Hashable]:
+    seen = set(seeds)
+    frontier = list(seen)
+    while frontier:
+        state = frontier.pop()
+        for nxt in neighbours(state):
+            if nxt not in seen:
+                seen.add(nxt)
+                frontier.append(nxt)
+    return frozenset(seen)
+
+
+def analyze(
+    states: Iterable[Hashable],
+    start_state: Optional[Hashable],
+    accept_states: Iterable[Hashable],
+    transitions: Iterable[Transition],
+) -> Structure:
+    if not isinstance(transitions, STORE_TYPES):
+        transitions = TransitionStore(transitions)
+    states = ordered(states)
+    state_set = set(states)
+    reachable = _closure([start_state] if start_state in state_set else [], transitions.successors)
+    coreachable = _closure([s for s in accept_states if s in state_set], transitions.predecessors)
+    components = strongly_connected_components(states, transitions.successors)
+    return Structure(
+        reachable=reachable,
+        coreachable=coreachable,
+        useful=reachable & coreachable,
+        dead=reachable - coreachable,
+        unreachable=frozenset(state_set - reachable),
+        components=tuple(components),
+    )
+
+
+class Cluster(NamedTuple):
+    """A strongly connected component drawn as one summary node."""
+
+    name: str
+    members: Tuple[Hashable, ...]
+    entry: Hashable
+    accepting: Tuple[Hashable, ...]
+    transitions: Tuple[Transition, ...]  # edges inside the component
+
+
+class StructuralView(NamedTuple):
+    """The automaton as the renderer draws it after trimming and collapsing."""
+
+    states: List[Hashable]
+    start_state: Optional[Hashable]
+    accept_states: FrozenSet[Hashable]
+    transitions: TransitionStore
+    clusters: Tuple[Cluster, ...]
+
+
+def structural_view(
+    states: Iterable[Hashable],
+    start_state: Optional[Hashable],
+    accept_states: Iterable[Hashable],
+    transitions: Iterable[Transition],
+    trim: bool = False,
+    collapse_threshold: Optional[int] = None,
+) -> StructuralView:
+    """
+    Drop useless states (trim; the start state always stays) and replace every strongly
+    connected component of at least `collapse_threshold` states by one summary node.
+    A summary node accepts when a member does, is the start state when it contains it,
+    and carries the union of the edges between its members and the rest of the graph.
+    """
+    if not isinstance(transitions, STORE_TYPES):
+        transitions = TransitionStore(transitions)
+    accept = set(accept_states)
+    structure = analyze(states, start_state, accept, transitions)
+    kept = set(structure.useful if trim else ordered(states))
+    if trim and start_state is not None:
+        kept.add(start_state)
+
+    representative: Dict[Hashable, Hashable] = {}
+    clusters: List[Cluster] = []
+    if collapse_threshold is not None:
+        for component in structure.components:
+            members = tuple(ordered(m for m in component if m in kept))
+            if len(members) < max(collapse_threshold, 2):
+                continue
+            member_set = set(members)
+            entry = start_state if start_state in member_set else members[0]
+            name = f"⟨{entry} +{len(members) - 1}⟩"
+            internal = tuple(
+                (src, symbol, dst)
+                for src in members
+                for dst in transitions.successors(src)
+                if dst in member_set
+                for symbol in transitions.symbols_between(src, dst)
+            )
+            accepting = tuple(member for member in members if member in accept)
+            clusters.append(Cluster(name, members, entry, accepting, internal))
+            for member in members:
+                representative[member] = name
+
+    def node(state: Hashable) -> Hashable:
+        return representative.get(state, state)
+
+    view_states = ordered({node(state) for state in kept})
+    view_transitions = TransitionStore(
+        (node(src), symbol, node(dst))
+        for src, symbol, dst in transitions
+        if src in kept and dst in kept and not (src in representative and node(src) == node(dst))
+    )
+    return StructuralView(
+        states=view_states,
+        start_state=node(start_state) if start_state is not None else None,
+        accept_states=frozenset(node(state) for state in accept if state in kept),
+        transitions=view_transitions,
+        clusters=tuple(clusters),
+    )
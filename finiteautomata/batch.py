@@ -0,0 +1,135 @@
+import dataclasses
+import os
+from array import array
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Dict, Hashable, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from .engine import intern_states, ordered
+from .renderer import AutomataRenderer, RendererConfig, RendererTheme, get_executor
+
+
+class AutomatonSnapshot(NamedTuple):
+    """
+    Compact, picklable description of an automaton for shipping to worker processes.
+    State and symbol names are interned once; transitions are a flat array of
+    (src, symbol, dst) index triples and accept flags are one byte per state.
+    """
+
+    states: Tuple[Hashable, ...]
+    symbols: Tuple[str, ...]
+    start: int
+    accepting: bytes
+    edges: array
+    config: RendererConfig
+
+    @classmethod
+    def from_automaton(cls, fsm, theme: Optional[RendererTheme] = None) -> "AutomatonSnapshot":
+        states, state_index = intern_states(fsm.states, fsm.start_state)
+        transitions = list(fsm.transitions)
+        symbols = tuple(ordered({symbol for _, symbol, _ in transitions}))
+        symbol_index = {symbol: idx for idx, symbol in enumerate(symbols)}
+        edges = array("I")
+        for src, symbol, dst in transitions:
+            edges.extend((state_index[src], symbol_index[symbol], state_index[dst]))
+        accepting = bytes(name in fsm.accept_states for name in states)
+        start = 0 if fsm.start_state is not None else -1
+        config = fsm._effective_config(theme)
+        if config.hooks:
+            # Hooks live in this process; workers report through BatchResult.outputs.stats.
+            config = dataclasses.replace(config, hooks=())
+        return cls(states, symbols, start, accepting, edges, config)
+
+    def renderer(self) -> AutomataRenderer:
+        states, symbols, edges = self.states, self.symbols, self.edges
+        transitions = [
+            (states[edges[idx]], symbols[edges[idx + 1]], states[edges[idx + 2]])
+            for idx in range(0, len(edges), 3)
+        ]
+        accept_states = [name for name, flag in zip(states, self.accepting) if flag]
+        start_state = states[self.start] if self.start >= 0 else None
+        config = self.config
+        if config.executor != "inline":
+            # Workers write their own outputs; no nested pools.
+            config = dataclasses.replace(config, executor="inline")
+        return AutomataRenderer(states, start_state, accept_states, transitions, config=config)
+
+
+class BatchResult(NamedTuple):
+    index: int
+    filename: str
+    outputs: Optional[Dict[str, str]]
+    error: Optional[BaseException]
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+Job = Tuple[int, str, AutomatonSnapshot, Optional[Tuple[str, ...]]]
+
+
+def _render_chunk(jobs: Sequence[Job]) -> List[BatchResult]:
+    results = []
+    for index, filename, snapshot, formats in jobs:
+        try:
+            selected = formats if formats is not None else tuple(snapshot.config.formats)
+            outputs = snapshot.renderer().render(filename, selected)
+            results.append(BatchResult(index, filename, outputs, None))
+        except Exception as exc:
+            results.append(BatchResult(index, filename, None, exc))
+    return results
+
+
+def draw_many(
+    items: Iterable[Tuple[str, object]],
+    formats: Optional[Iterable[str]] = None,
+    workers: Optional[int] = None,
+    *,
+    chunk_size: int = 8,
+    theme: Optional[RendererTheme] = None,
+) -> Iterator[BatchResult]:
+    """
+    Render many automata in parallel on a pool of worker processes.
+
+    - items: iterable of (filename, FiniteAutomata) pairs; consumed lazily
+    - formats: formats for every item (defaults to each automaton's configured formats)
+    - workers: number of worker processes (defaults to the CPU count)
+    - chunk_size: automata shipped per task, amortizing inter-process overhead
+    - theme: optional RendererTheme applied to every item
+
+    Automata are sent as compact AutomatonSnapshot objects, the worker pool is shared and
+    kept warm across calls (cairosvg is imported once per worker), and a BatchResult is
+    yielded for every item as soon as its chunk finishes; failures are reported through
+    `BatchResult.error` instead of aborting the batch. Each result's outputs carry the
+    worker-side RenderStats as `.stats`; configured render hooks are not run in workers.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1.")
+    workers = workers or os.cpu_count() or 1
+    selected = tuple(fmt.lower() for fmt in formats) if formats is not None else None
+    executor = get_executor("process", workers)
+    max_pending = workers * 2
+    pending: Set["Future[List[BatchResult]]"] = set()
+
+    def drain(block_until_room: bool) -> Iterator[BatchResult]:
+        nonlocal pending
+        while pending and (not block_until_room or len(pending) >= max_pending):
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+
+    chunk: List[Job] = []
+    try:
+        for index, (filename, fsm) in enumerate(items):
+            snapshot = AutomatonSnapshot.from_automaton(fsm, theme)
+            chunk.append((index, str(filename), snapshot, selected))
+            if len(chunk) >= chunk_size:
+                pending.add(executor.submit(_render_chunk, chunk))
+                chunk = []
+                yield from drain(block_until_room=True)
+        if chunk:
+            pending.add(executor.submit(_render_chunk, chunk))
+        yield from drain(block_until_room=False)
+    finally:
+        for future in pending:
+            future.cancel()
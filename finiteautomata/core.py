@@ -1,33 +1,103 @@
-from typing import Iterable, Optional, Sequence, TYPE_CHECKING
+import asyncio
+import copy
+import dataclasses
+from typing import Iterable, Iterator, List, Optional, Sequence, TextIO, TYPE_CHECKING
 
-from .renderer import AutomataRenderer, RendererConfig
+from . import aio
+from .analysis import Structure, analyze
+from .counting import LiveDFA
+from .engine import CompiledDFA
+from .equivalence import LanguageCheck, Word, check_equivalence, check_inclusion
+from .lazy import LazyDFA, determinize_automaton
+from .minimize import minimize_automaton
+from .product import ProductAutomaton, nfa_of
+from .regex import from_regex
+from .stream import DEFAULT_CHUNK_SIZE, Match, StreamMatcher
+from .transitions import STORE_TYPES, CompactTransitionStore, Transition, TransitionStore
+from .nfa import BitsetNFA
+from .profiling import RenderOutputs
+from .serialize import detect_format, format_for, load_binary, load_json, save_binary, save_json
+from .renderer import AutomataRenderer, RenderCache, RendererConfig
 
 if TYPE_CHECKING:
+    from .profiling import RenderHook
     from .renderer import RendererTheme
 
 class FiniteAutomata:
-    def __init__(self):
+    def __init__(self, *, compact: bool = False):
+        """
+        With compact=True, transitions are kept in a CompactTransitionStore (interned ids
+        in array('I') columns) instead of an indexed TransitionStore: several times less
+        memory for very large machines, at the cost of rebuilding adjacency after edits.
+        """
         self.states = set()
         self.start_state = None
         self.accept_states = set()
-        self.transitions = []  # (from_state, symbol, to_state)
+        self._version = 0
+        self._compact = compact
+        self.transitions = CompactTransitionStore() if compact else TransitionStore()
         self.renderer_config = RendererConfig()
+        self.render_cache = RenderCache()
+
+    @classmethod
+    def from_regex(cls, pattern: str, *, deterministic: bool = False) -> "FiniteAutomata":
+        """
+        Build an automata from a regular expression (literals, |, *, +, ?, groups, [a-z]
+        classes and \\ escapes) with Thompson's construction, i.e. with EPSILON moves.
+        With deterministic=True the result is determinized and minimized instead.
+        Compiled patterns are cached per process (see regex_cache_info()); each call
+        returns a new, independent automata.
+        """
+        return from_regex(cls, pattern, deterministic)
+
+    @property
+    def version(self) -> int:
+        """
+        Structural version, bumped whenever a state, transition, start or accept state
+        changes, including edits made straight to the store (fsm.transitions.remove(...)).
+        """
+        return self._version + self._transitions.mutations
+
+    @property
+    def compact(self) -> bool:
+        """True when transitions are kept in a CompactTransitionStore."""
+        return self._compact
+
+    @property
+    def transitions(self) -> TransitionStore:
+        """Indexed, deduplicated transitions; iterates like a list of (from, symbol, to) tuples."""
+        return self._transitions
+
+    @transitions.setter
+    def transitions(self, transitions: Iterable[Transition]) -> None:
+        if not isinstance(transitions, STORE_TYPES):
+            transitions = CompactTransitionStore(transitions) if self._compact else TransitionStore(transitions)
+        previous = getattr(self, "_transitions", None)
+        # Fold the old store's edits in, so the version never goes back.
+        self._version += 1 + (previous.mutations if previous is not None else 0)
+        self._transitions = transitions
 
     def state(self, state):
         """Add a state to the automata."""
-        self.states.add(state)
+        if state not in self.states:
+            self.states.add(state)
+            self._version += 1
         return self
 
     def start(self, state):
         """Define the start state."""
         self.state(state)
-        self.start_state = state
+        if self.start_state != state:
+            self.start_state = state
+            self._version += 1
         return self
 
     def accept(self, state):
         """Mark a state as accepting."""
         self.state(state)
-        self.accept_states.add(state)
+        if state not in self.accept_states:
+            self.accept_states.add(state)
+            self._version += 1
         return self
 
     def transition(self, from_state, symbol, to_state):
@@ -35,12 +105,236 @@ class FiniteAutomata:
         Define a transition from one state to another.
         Example: transition('q0', 'a', 'q1') makes input 'a' cause a move from q0 to q1.
         Self-transitions (where from_state == to_state) are supported.
+        Repeating an existing transition has no effect.
         """
         self.state(from_state)
         self.state(to_state)
-        self.transitions.append((from_state, symbol, to_state))
+        self._transitions.add(from_state, symbol, to_state)
         return self
+
+    def compile(self) -> CompiledDFA:
+        """
+        Build an immutable, table-driven executor for this (deterministic) automata.
+        The result exposes accepts(word) and run(word) and is safe to share across threads.
+        Raises ValueError when the automata is nondeterministic or has no start state.
+        """
+        return CompiledDFA.build(
+            self.states, self.start_state, self.accept_states, self.transitions
+        )
+
+    def compile_nfa(self) -> BitsetNFA:
+        """
+        Build a bit-parallel simulator that handles nondeterminism and epsilon (EPSILON) moves.
+        The result exposes accepts(word) and run(word), which returns the set of active states.
+        """
+        return BitsetNFA.build(
+            self.states, self.start_state, self.accept_states, self.transitions
+        )
+
+    def compile_lazy(self, cache_size: int = 4096) -> LazyDFA:
+        """
+        Build a lazily determinized executor: DFA states are created only when input reaches them
+        and discovered edges live in an LRU cache bounded by `cache_size` (see cache_info()).
+        """
+        return LazyDFA.build(
+            self.states,
+            self.start_state,
+            self.accept_states,
+            self.transitions,
+            cache_size=cache_size,
+        )
+
+    def matcher(self, *, search: bool = True, cache_size: int = 4096) -> StreamMatcher:
+        """
+        Build an incremental byte scanner; feed() it chunks (e.g. from a socket) and it
+        carries automaton state across chunk boundaries.
+        With search=True matches may start at any offset; otherwise the stream is one anchored run.
+        """
+        automaton = LazyDFA.build(
+            self.states,
+            self.start_state,
+            self.accept_states,
+            self.transitions,
+            cache_size=cache_size,
+            unanchored=search,
+        )
+        return StreamMatcher(automaton)
+
+    def scan(
+        self,
+        source,
+        *,
+        search: bool = True,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        cache_size: int = 4096,
+    ) -> Iterator[Match]:
+        """
+        Scan a file path, binary file object, mmap or memoryview without loading it into memory.
+        Yields Match(offset, state) events, where offset is the end of the matched bytes.
+        """
+        return self.matcher(search=search, cache_size=cache_size).scan(source, chunk_size=chunk_size)
+
+    def determinize(self) -> "FiniteAutomata":
+        """
+        Return an equivalent deterministic automata built by subset construction over the
+        reachable subsets only. States are renamed q0, q1, ... (q0 is the start state).
+        """
+        return determinize_automaton(self)
+
+    def analyze(self) -> Structure:
+        """
+        Linear-time structural analysis: reachable, co-reachable, useful, dead and
+        unreachable states plus the strongly connected components (iterative Tarjan).
+        """
+        return analyze(self.states, self.start_state, self.accept_states, self._transitions)
+
+    def trim(self) -> "FiniteAutomata":
+        """
+        Return a copy without useless states, i.e. those unreachable from the start state
+        or unable to reach an accepting state. The start state is always kept.
+        """
+        useful = set(self.analyze().useful)
+        result = type(self)(compact=self._compact)
+        result.renderer_config = copy.copy(self.renderer_config)
+        if self.start_state is not None:
+            result.start(self.start_state)
+        for state in self.states & useful:
+            result.state(state)
+        for state in self.accept_states & useful:
+            result.accept(state)
+        for src, symbol, dst in self._transitions:
+            if src in useful and dst in useful:
+                result.transition(src, symbol, dst)
+        return result
+
+    def minimize(self, trim: bool = True) -> "FiniteAutomata":
+        """
+        Return a new, equivalent automata with the minimum number of states (Hopcroft's algorithm).
+        With trim=True, states unreachable from the start state are dropped first.
+        Raises ValueError when the automata is nondeterministic.
+        """
+        return minimize_automaton(self, trim=trim)
+
+    def product(self, other: Optional["FiniteAutomata"], operation: str) -> ProductAutomaton:
+        """
+        Build a lazy product with `other` ("intersection", "union", "difference", or
+        "complement" with other=None). Nothing is explored until it is queried: use
+        accepts(word), is_empty(), find_word() or to_automaton(cls).
+        """
+        return ProductAutomaton.build(self, other, operation)
+
+    def intersects(self, other: "FiniteAutomata") -> bool:
+        """True when some word is accepted by both; stops at the first common word found."""
+        return not self.product(other, "intersection").is_empty()
+
+    def is_empty(self) -> bool:
+        """True when the automata accepts no word (an automata without a start state is empty)."""
+        if self.start_state is None:
+            return True
+        seen = {self.start_state}
+        frontier = [self.start_state]
+        while frontier:
+            state = frontier.pop()
+            if state in self.accept_states:
+                return False
+            for target in self._transitions.successors(state):
+                if target not in seen:
+                    seen.add(target)
+                    frontier.append(target)
+        return True
+
+    def equivalent(self, other: "FiniteAutomata") -> LanguageCheck:
+        """
+        Check that both automata accept the same language (Hopcroft-Karp, stopping at the
+        first disagreement). The result is truthy on success and otherwise carries a
+        shortest word accepted by exactly one of them as `.counterexample`.
+        """
+        return check_equivalence(nfa_of(self), nfa_of(other))
+
+    def is_subset_of(self, other: "FiniteAutomata") -> LanguageCheck:
+        """
+        Check that every word accepted here is accepted by `other` (antichain algorithm,
+        neither side is fully determinized). On failure `.counterexample` is a shortest
+        word accepted here but not by `other`.
+        """
+        return check_inclusion(nfa_of(self), nfa_of(other))
+
+    def count_accepted(self, length: int, *, method: str = "dp", backend: str = "python") -> int:
+        """
+        Count the distinct words of exactly `length` symbols the automata accepts
+        (nondeterministic machines are determinized first, so no word counts twice).
+
+        - method: "dp" steps a count vector `length` times (O(length * transitions));
+          "matrix" raises the transfer matrix to `length` by repeated squaring
+          (O(states^3 log length)), better for huge lengths on small machines.
+        - backend: "python" or "numpy" (object arrays, exact) for the matrix method.
+        """
+        dfa = LiveDFA.build(self)
+        if method == "dp":
+            return dfa.count(length)
+        if method == "matrix":
+            return dfa.count_matrix(length, backend)
+        raise ValueError(f"Unsupported counting method '{method}'. Expected one of dp, matrix.")
+
+    def count_accepted_by_length(self, max_length: int) -> List[int]:
+        """Accepted-word counts for every length from 0 to `max_length`, in one DP pass."""
+        return LiveDFA.build(self).count_by_length(max_length)
+
+    def accepted_words(self, max_length: Optional[int] = None) -> Iterator[Word]:
+        """
+        Lazily yield accepted words in shortlex order, up to `max_length` symbols (no
+        bound by default; the generator ends when the language is exhausted). Branches
+        that cannot end in an accepted word of the current length are never entered.
+        Words are strings, or tuples of symbols when some symbol is longer than one character.
+        """
+        return LiveDFA.build(self).words(max_length)
+
+    def _combine(self, other: Optional["FiniteAutomata"], operation: str) -> "FiniteAutomata":
+        result = self.product(other, operation).to_automaton(type(self))
+        result.renderer_config = copy.copy(self.renderer_config)
+        return result
+
+    def __and__(self, other: "FiniteAutomata") -> "FiniteAutomata":
+        if not isinstance(other, FiniteAutomata):
+            return NotImplemented
+        return self._combine(other, "intersection")
+
+    def __or__(self, other: "FiniteAutomata") -> "FiniteAutomata":
+        if not isinstance(other, FiniteAutomata):
+            return NotImplemented
+        return self._combine(other, "union")
+
+    def __sub__(self, other: "FiniteAutomata") -> "FiniteAutomata":
+        if not isinstance(other, FiniteAutomata):
+            return NotImplemented
+        return self._combine(other, "difference")
+
+    def __invert__(self) -> "FiniteAutomata":
+        return self._combine(None, "complement")
     
+    def save(self, path, format: Optional[str] = None) -> None:
+        """
+        Write the automaton to `path`.
+
+        - format: "json" (stable interchange format) or "binary" (compact, memory-mappable;
+          string names only). Defaults to JSON for *.json paths and binary otherwise.
+        """
+        if format_for(path, format) == "json":
+            save_json(self, path)
+        else:
+            save_binary(self, path)
+
+    @classmethod
+    def load(cls, path, format: Optional[str] = None) -> "FiniteAutomata":
+        """
+        Read an automaton written by save(); the format is detected from the file contents.
+        For serving very large binary files without materializing them, see AutomatonImage.
+        """
+        fmt = detect_format(path) if format is None else format_for(path, format)
+        if fmt == "json":
+            return load_json(path, cls)
+        return load_binary(path, cls)
+
     def configure_renderer(
         self,
         *,
@@ -50,6 +344,19 @@ class FiniteAutomata:
         horizontal_gap: Optional[int] = None,
         vertical_gap: Optional[int] = None,
         state_radius: Optional[int] = None,
+        executor: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        layout: Optional[str] = None,
+        crossing_sweeps: Optional[int] = None,
+        compact: Optional[bool] = None,
+        precision: Optional[int] = None,
+        html_viewer: Optional[str] = None,
+        profile: Optional[bool] = None,
+        hooks: Optional[Sequence["RenderHook"]] = None,
+        async_limit: Optional[int] = None,
+        trim: Optional[bool] = None,
+        collapse_threshold: Optional[int] = None,
+        routing: Optional[str] = None,
     ):
         """
         Update the rendering configuration.
@@ -57,6 +364,23 @@ class FiniteAutomata:
         - formats: iterable of output formats to use when draw() is called without overrides.
         - theme: RendererTheme instance to customize colors and typography.
         - numeric parameters adjust spacing and sizing heuristics.
+        - executor: pool used for PNG rasterization ("thread", "process" or "inline").
+        - max_workers: size of that pool (defaults to the executor's own default).
+        - layout: "classic" (BFS columns, alphabetical) or "layered" (crossing-reduced, for large machines).
+        - crossing_sweeps: number of barycenter sweeps used by the layered layout.
+        - compact: emit shared <defs> shapes, CSS classes and relative path data for smaller SVGs.
+        - precision: decimals kept for coordinates in compact output and the canvas viewer.
+        - html_viewer: "svg" embeds the static drawing; "canvas" embeds a JSON layout drawn by a
+          pan/zoom viewer that only paints what is on screen (for thousands of states).
+        - profile: also record peak allocations per phase (uses tracemalloc; slower).
+        - hooks: RenderHook instances notified at every phase boundary of each draw().
+        - async_limit: how many draw_async() renders may run at once per event loop.
+        - trim: leave unreachable and dead states out of the drawing.
+        - collapse_threshold: draw strongly connected components with at least this many
+          states as one summary node; HTML output lists each one in an expandable section.
+          Pass 0 to stop collapsing.
+        - routing: "direct" (fixed bends and label positions) or "spatial" (bend lanes and
+          label positions chosen against a spatial index of what is already drawn).
         """
         if formats is not None:
             self.renderer_config.formats = tuple(formats)
@@ -70,6 +394,36 @@ class FiniteAutomata:
             self.renderer_config.vertical_gap = vertical_gap
         if state_radius is not None:
             self.renderer_config.state_radius = state_radius
+        if executor is not None:
+            self.renderer_config.executor = executor
+        if max_workers is not None:
+            self.renderer_config.max_workers = max_workers
+        if layout is not None:
+            self.renderer_config.layout = layout
+        if crossing_sweeps is not None:
+            self.renderer_config.crossing_sweeps = crossing_sweeps
+        if compact is not None:
+            self.renderer_config.compact = compact
+        if precision is not None:
+            if precision < 0:
+                raise ValueError("precision must be non-negative.")
+            self.renderer_config.precision = precision
+        if html_viewer is not None:
+            self.renderer_config.html_viewer = html_viewer
+        if profile is not None:
+            self.renderer_config.profile = profile
+        if hooks is not None:
+            self.renderer_config.hooks = tuple(hooks)
+        if async_limit is not None:
+            if async_limit < 1:
+                raise ValueError("async_limit must be at least 1.")
+            self.renderer_config.async_limit = async_limit
+        if trim is not None:
+            self.renderer_config.trim = trim
+        if collapse_threshold is not None:
+            self.renderer_config.collapse_threshold = collapse_threshold or None
+        if routing is not None:
+            self.renderer_config.routing = routing
         return self
 
     def draw(
@@ -80,7 +434,8 @@ class FiniteAutomata:
         formats: Optional[Iterable[str]] = None,
         view: bool = False,
         theme: Optional["RendererTheme"] = None,
-    ):
+        wait: bool = True,
+    ) -> RenderOutputs:
         """
         Render the automata using the custom rendering engine.
 
@@ -89,6 +444,10 @@ class FiniteAutomata:
         - formats: iterable of requested formats (svg, png, html)
         - view: automatically open the first generated artifact
         - theme: optional RendererTheme to override colors for this render
+        - wait: when False, return immediately with futures resolving to the output paths
+          (the documents are written on a worker thread, PNG is rasterized after them)
+
+        The returned mapping also carries `.stats`, a RenderStats with per-phase timings.
         """
         selected_formats: Sequence[str]
         if formats is not None:
@@ -98,26 +457,69 @@ class FiniteAutomata:
         else:
             selected_formats = self.renderer_config.formats
 
-        renderer = AutomataRenderer(
+        renderer = self._renderer(theme)
+        outputs = renderer.render(filename, selected_formats, view=view, wait=wait)
+        return outputs
+
+    async def draw_async(
+        self,
+        filename: str = 'fsm',
+        *,
+        formats: Optional[Iterable[str]] = None,
+        theme: Optional["RendererTheme"] = None,
+        in_memory: bool = False,
+        semaphore: Optional[asyncio.Semaphore] = None,
+    ) -> RenderOutputs:
+        """
+        Render without blocking the event loop for long: the layout is taken on the loop
+        thread (usually from the render cache), then document generation, file writes and
+        rasterization run on a worker thread.
+
+        - filename: base filename used for outputs (the HTML title when in_memory=True)
+        - formats: iterable of requested formats (defaults to the configured ones)
+        - theme: optional RendererTheme to override colors for this render
+        - in_memory: return the encoded documents as bytes instead of writing files
+        - semaphore: bounds concurrent renders; defaults to one per event loop sized by
+          configure_renderer(async_limit=...)
+
+        Cancelling the awaiting task stops the render at its next write and removes any
+        partially written files.
+        """
+        selected_formats = self.renderer_config.formats if formats is None else tuple(formats)
+        return await aio.draw_async(self, filename, selected_formats, theme, in_memory, semaphore)
+
+    def draw_to(
+        self, stream: TextIO, format: str = 'svg', *, theme: Optional["RendererTheme"] = None
+    ) -> None:
+        """
+        Stream the rendering to a writable text stream (a file handle, socket wrapper,
+        io.StringIO, ...) as it is produced, without building the whole document first.
+
+        - stream: any object with a `write(str)` method
+        - format: 'svg' or 'html'
+        - theme: optional RendererTheme to override colors for this render
+        """
+        fmt = format.lower()
+        if fmt not in ('svg', 'html'):
+            raise ValueError(f"Unsupported stream format '{format}'. Expected one of svg, html.")
+        renderer = self._renderer(theme)
+        if fmt == 'svg':
+            renderer.write_svg(stream)
+        else:
+            renderer.write_html(stream)
+
+    def _renderer(self, theme: Optional["RendererTheme"]) -> AutomataRenderer:
+        return AutomataRenderer(
             self.states,
             self.start_state,
             self.accept_states,
             self.transitions,
             config=self._effective_config(theme),
+            cache=self.render_cache,
+            version=self.version,
         )
-        outputs = renderer.render(filename, selected_formats, view=view)
-        return outputs
 
     def _effective_config(self, theme_override: Optional["RendererTheme"]) -> RendererConfig:
         if theme_override is None:
             return self.renderer_config
-        config_copy = RendererConfig(
-            formats=self.renderer_config.formats,
-            theme=theme_override,
-            canvas_padding=self.renderer_config.canvas_padding,
-            horizontal_gap=self.renderer_config.horizontal_gap,
-            vertical_gap=self.renderer_config.vertical_gap,
-            state_radius=self.renderer_config.state_radius,
-            arrow_size=self.renderer_config.arrow_size,
-        )
-        return config_copy
\ No newline at end of file
+        return dataclasses.replace(self.renderer_config, theme=theme_override)
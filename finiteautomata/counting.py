@@ -0,0 +1,187 @@
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from .engine import require_numpy
+from .equivalence import Word, as_word
+from .nfa import BitsetNFA
+
+
+class LiveDFA:
+    """
+    The determinized automaton restricted to live states.
+
+    Subsets are explored from the start state and then trimmed to the states from
+    which some accepting state is reachable, so every remaining edge extends a prefix
+    of at least one accepted word. A missing edge (-1) leads to the implicit dead
+    state. Counting distinct words needs determinism: in an NFA one word can follow
+    several paths.
+    """
+
+    __slots__ = ("symbols", "rows", "accepting")
+
+    def __init__(self, symbols: Sequence[str], rows: Sequence[Sequence[int]], accepting: Sequence[bool]):
+        self.symbols = tuple(symbols)
+        self.rows = tuple(tuple(row) for row in rows)
+        self.accepting = tuple(accepting)
+
+    @classmethod
+    def build(cls, fsm) -> "LiveDFA":
+        if fsm.start_state is None:
+            return cls((), [[]], [False])
+        nfa = BitsetNFA.build(fsm.states, fsm.start_state, fsm.accept_states, fsm.transitions)
+        width = len(nfa.alphabet)
+        index = {nfa.initial: 0}
+        order = [nfa.initial]
+        rows: List[List[int]] = []
+        for subset in order:
+            row = []
+            for column in range(width):
+                target = nfa.step(subset, column)
+                if not target:
+                    row.append(-1)
+                    continue
+                target_id = index.get(target)
+                if target_id is None:
+                    target_id = index[target] = len(order)
+                    order.append(target)
+                row.append(target_id)
+            rows.append(row)
+        accepting = [nfa.is_accepting(subset) for subset in order]
+
+        live = [False] * len(order)
+        predecessors: List[List[int]] = [[] for _ in order]
+        for state, row in enumerate(rows):
+            for target in row:
+                if target >= 0:
+                    predecessors[target].append(state)
+        frontier = [state for state, flag in enumerate(accepting) if flag]
+        for state in frontier:
+            live[state] = True
+        while frontier:
+            state = frontier.pop()
+            for pred in predecessors[state]:
+                if not live[pred]:
+                    live[pred] = True
+                    frontier.append(pred)
+
+        # Keep the start state (as 0) even when the language is empty.
+        kept = [0] + [state for state in range(1, len(order)) if live[state]]
+        local = {state: idx for idx, state in enumerate(kept)}
+        trimmed = [
+            [local.get(target, -1) if target >= 0 and live[target] else -1 for target in rows[state]]
+            for state in kept
+        ]
+        return cls(nfa.alphabet.symbols, trimmed, [accepting[state] for state in kept])
+
+    def count(self, length: int) -> int:
+        """Number of accepted words of exactly `length` symbols (forward DP, big ints)."""
+        return self.count_by_length(length)[length]
+
+    def count_by_length(self, max_length: int) -> List[int]:
+        """Accepted-word counts for every length 0..max_length in O(max_length * |edges|)."""
+        if max_length < 0:
+            raise ValueError("Word length must be non-negative.")
+        vector = [0] * len(self.rows)
+        vector[0] = 1
+        totals = []
+        for step in range(max_length + 1):
+            totals.append(sum(count for count, flag in zip(vector, self.accepting) if flag))
+            if step == max_length:
+                break
+            following = [0] * len(vector)
+            for state, count in enumerate(vector):
+                if count:
+                    for target in self.rows[state]:
+                        if target >= 0:
+                            following[target] += count
+            vector = following
+        return totals
+
+    def count_matrix(self, length: int, backend: str = "python") -> int:
+        """
+        Number of accepted words of exactly `length` symbols by repeated squaring of the
+        transfer matrix: O(|Q|^3 log length) exact big-int arithmetic. The "numpy" backend
+        keeps the matrices in object arrays so products run as vectorized dot products.
+        """
+        if length < 0:
+            raise ValueError("Word length must be non-negative.")
+        size = len(self.rows)
+        matrix = [[0] * size for _ in range(size)]
+        for state, row in enumerate(self.rows):
+            for target in row:
+                if target >= 0:
+                    matrix[state][target] += 1
+        if backend == "numpy":
+            np = require_numpy()
+            power = np.linalg.matrix_power(np.array(matrix, dtype=object), length)
+            first_row = [int(value) for value in power[0]]
+        elif backend == "python":
+            first_row = _vector_power([1] + [0] * (size - 1), matrix, length)
+        else:
+            raise ValueError(f"Unsupported counting backend '{backend}'. Expected one of python, numpy.")
+        return sum(count for count, flag in zip(first_row, self.accepting) if flag)
+
+    def words(self, max_length: Optional[int] = None) -> Iterator[Word]:
+        """
+        Yield accepted words in shortlex order (by length, then by symbol order).
+
+        For each length L the states that can still finish in exactly r more symbols
+        are known (finish[r]), so the depth-first walk only enters branches that end in
+        an accepted word; memory is O(L) plus |Q| flags per length. The generator ends
+        once no word of any greater length exists.
+        """
+        rows, symbols = self.rows, self.symbols
+        finish = [list(self.accepting)]
+        length = 0
+        while max_length is None or length <= max_length:
+            if len(finish) <= length:
+                previous = finish[-1]
+                finish.append([any(t >= 0 and previous[t] for t in row) for row in rows])
+            current = finish[length]
+            if not any(current):
+                # finish[r + 1] depends only on finish[r]: once empty, always empty.
+                return
+            if current[0]:
+                yield from self._spell(length, finish, symbols)
+            length += 1
+
+    def _spell(self, length: int, finish, symbols) -> Iterator[Word]:
+        rows = self.rows
+        path: List[int] = []
+        stack: List[Tuple[int, int]] = [(0, 0)]
+        while stack:
+            state, column = stack[-1]
+            remaining = length - len(path)
+            if remaining == 0:
+                yield as_word(symbols, path)
+                stack.pop()
+                if path:
+                    path.pop()
+                continue
+            row = rows[state]
+            while column < len(row) and (row[column] < 0 or not finish[remaining - 1][row[column]]):
+                column += 1
+            if column == len(row):
+                stack.pop()
+                if path:
+                    path.pop()
+                continue
+            stack[-1] = (state, column + 1)
+            path.append(column)
+            stack.append((row[column], 0))
+
+
+def _vector_power(vector: List[int], matrix: List[List[int]], exponent: int) -> List[int]:
+    """Return vector · matrix**exponent, squaring the matrix and applying set bits to the vector."""
+    size = len(matrix)
+    while exponent:
+        if exponent & 1:
+            vector = [
+                sum(vector[k] * matrix[k][j] for k in range(size) if vector[k]) for j in range(size)
+            ]
+        exponent >>= 1
+        if exponent:
+            matrix = [
+                [sum(row[k] * matrix[k][j] for k in range(size) if row[k]) for j in range(size)]
+                for row in matrix
+            ]
+    return vector
@@ -0,0 +1,284 @@
+from itertools import chain, repeat
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+try:  # pragma: no cover - optional dependency
+    import numpy
+except ImportError:  # pragma: no cover - optional dependency
+    numpy = None
+
+EPSILON = "ε"
+
+
+def require_numpy():
+    if numpy is None:
+        raise RuntimeError(
+            "Batch evaluation requires the optional dependency 'numpy'. "
+            "Install it via `pip install finiteautomata[numpy]`."
+        )
+    return numpy
+
+
+def ordered(items: Iterable[Hashable]) -> List[Hashable]:
+    """Sort states or symbols deterministically, tolerating mixed types."""
+    items = list(items)
+    try:
+        return sorted(items)
+    except TypeError:
+        return sorted(items, key=repr)
+
+
+def intern_states(
+    states: Iterable[Hashable], start_state: Optional[Hashable]
+) -> Tuple[Tuple[Hashable, ...], Dict[Hashable, int]]:
+    """
+    Assign dense integer ids to states.
+    The start state (when present) always receives id 0.
+    """
+    names = ordered(s for s in states if s != start_state)
+    if start_state is not None:
+        names.insert(0, start_state)
+    return tuple(names), {name: idx for idx, name in enumerate(names)}
+
+
+def intern_symbols(
+    transitions: Iterable[Tuple[Hashable, str, Hashable]]
+) -> Tuple[Tuple[str, ...], Dict[str, int]]:
+    """Assign dense integer ids to every non-epsilon symbol used by `transitions`."""
+    names = tuple(ordered({symbol for _, symbol, _ in transitions if symbol != EPSILON}))
+    return names, {name: idx for idx, name in enumerate(names)}
+
+
+class _ColumnTable(dict):
+    """str.translate table mapping every unknown code point to the reject column."""
+
+    __slots__ = ("unknown",)
+
+    def __init__(self, mapping: Dict[int, str], unknown: str):
+        super().__init__(mapping)
+        self.unknown = unknown
+
+    def __missing__(self, key: int) -> str:
+        return self.unknown
+
+
+class SymbolTable:
+    """
+    Interned alphabet shared by the execution engines.
+    Symbol i maps to column i; every unknown symbol maps to column `unknown`.
+    """
+
+    __slots__ = ("symbols", "unknown", "_index", "_translate")
+
+    def __init__(self, symbols: Sequence[str]):
+        self.symbols = tuple(symbols)
+        self.unknown = len(self.symbols)
+        self._index = {name: idx for idx, name in enumerate(self.symbols)}
+        self._translate = None
+        if self.unknown < 256 and all(isinstance(s, str) and len(s) == 1 for s in self.symbols):
+            self._translate = _ColumnTable(
+                {ord(symbol): chr(idx) for idx, symbol in enumerate(self.symbols)},
+                chr(self.unknown),
+            )
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def index(self, symbol: str) -> int:
+        return self._index.get(symbol, self.unknown)
+
+    def encode(self, word: Iterable[str]) -> Iterable[int]:
+        """
+        Encode `word` as column ids.
+        Strings are split into characters; any other iterable is read symbol by symbol.
+        """
+        if self._translate is not None and isinstance(word, str):
+            return word.translate(self._translate).encode("latin-1")
+        return map(self._index.get, word, repeat(self.unknown))
+
+
+class CompiledDFA:
+    """
+    Immutable, table-driven form of a deterministic automaton.
+
+    States and symbols are interned to integers and transitions live in a dense
+    row-per-state table. One extra absorbing "dead" state receives every missing
+    transition and one extra column receives every unknown symbol, so stepping
+    is a single indexed load per input symbol. Instances never mutate after
+    construction and can be shared freely between threads.
+    """
+
+    __slots__ = (
+        "states",
+        "symbols",
+        "start",
+        "dead",
+        "width",
+        "_rows",
+        "_accepting",
+        "_state_index",
+        "_alphabet",
+        "_numpy_rows",
+    )
+
+    def __init__(
+        self,
+        states: Sequence[Hashable],
+        symbols: Sequence[str],
+        rows: Sequence[Sequence[int]],
+        accepting: Sequence[bool],
+    ):
+        width = len(symbols) + 1
+        if len(rows) != len(states) + 1 or any(len(row) != width for row in rows):
+            raise ValueError("Transition table shape does not match states and symbols.")
+        assign = object.__setattr__
+        assign(self, "states", tuple(states))
+        assign(self, "symbols", tuple(symbols))
+        assign(self, "start", 0)
+        assign(self, "dead", len(states))
+        assign(self, "width", width)
+        assign(self, "_rows", tuple(tuple(row) for row in rows))
+        assign(self, "_accepting", tuple(bool(flag) for flag in accepting) + (False,))
+        assign(self, "_state_index", {name: idx for idx, name in enumerate(self.states)})
+        assign(self, "_alphabet", SymbolTable(self.symbols))
+        assign(self, "_numpy_rows", None)
+
+    @classmethod
+    def build(
+        cls,
+        states: Iterable[Hashable],
+        start_state: Optional[Hashable],
+        accept_states: Iterable[Hashable],
+        transitions: Iterable[Tuple[Hashable, str, Hashable]],
+    ) -> "CompiledDFA":
+        """Intern an automaton description and build its transition table."""
+        if start_state is None:
+            raise ValueError("Cannot compile an automaton without a start state.")
+        transitions = list(transitions)
+        state_names, state_index = intern_states(states, start_state)
+        symbol_names, symbol_index = intern_symbols(transitions)
+
+        dead = len(state_names)
+        width = len(symbol_names) + 1
+        rows = [[dead] * width for _ in range(dead + 1)]
+        for src, symbol, dst in transitions:
+            if symbol == EPSILON:
+                raise ValueError(
+                    f"Epsilon transition from '{src}' makes the automaton nondeterministic."
+                )
+            row = rows[state_index[src]]
+            column = symbol_index[symbol]
+            target = state_index[dst]
+            if row[column] != dead and row[column] != target:
+                raise ValueError(
+                    f"State '{src}' has several transitions on '{symbol}'; "
+                    "the automaton is not deterministic."
+                )
+            row[column] = target
+
+        accept = set(accept_states)
+        accepting = [name in accept for name in state_names]
+        return cls(state_names, symbol_names, rows, accepting)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __repr__(self) -> str:
+        return f"<CompiledDFA states={len(self.states)} symbols={len(self.symbols)}>"
+
+    # Execution ----------------------------------------------------------------
+    def columns(self, word: Iterable[str]) -> Iterable[int]:
+        """Encode `word` as table columns (see SymbolTable.encode)."""
+        return self._alphabet.encode(word)
+
+    def step_index(self, state: int, word: Iterable[str]) -> int:
+        """Advance from integer state `state` over `word` and return the integer state reached."""
+        rows = self._rows
+        for column in self.columns(word):
+            state = rows[state][column]
+        return state
+
+    def accepts(self, word: Iterable[str]) -> bool:
+        """Return True when the automaton accepts `word`."""
+        rows = self._rows
+        state = self.start
+        for column in self.columns(word):
+            state = rows[state][column]
+        return self._accepting[state]
+
+    def run(self, word: Iterable[str]) -> Optional[Hashable]:
+        """
+        Run `word` and return the name of the state it ends in,
+        or None when a missing transition rejected the input.
+        """
+        state = self.step_index(self.start, word)
+        if state == self.dead:
+            return None
+        return self.states[state]
+
+    def accepts_many(self, words: Iterable[Iterable[str]]) -> "numpy.ndarray":
+        """
+        Classify a whole batch of words at once and return a boolean NumPy array.
+
+        The batch is encoded into one flat integer array and the words are ordered by
+        length, so at step j the words still running form a prefix and advance in
+        lockstep via `state = table[state, column]`. Requires the optional numpy dependency.
+        """
+        np = require_numpy()
+        words = list(words)
+        count = len(words)
+        lengths = np.fromiter(map(len, words), dtype=np.intp, count=count)
+        table = self._numpy_table()
+        accepting = np.array(self._accepting, dtype=bool)
+
+        flat = self._encode_flat(words, int(lengths.sum()))
+        starts = np.cumsum(lengths) - lengths
+        order = np.argsort(-lengths, kind="stable")
+        descending = -lengths[order]
+        starts = starts[order]
+
+        state = np.full(count, self.start, dtype=table.dtype)
+        for position in range(int(lengths.max()) if count else 0):
+            running = int(np.searchsorted(descending, -position, side="left"))
+            state[:running] = table[state[:running], flat[starts[:running] + position]]
+
+        result = np.empty(count, dtype=bool)
+        result[order] = accepting[state]
+        return result
+
+    def _numpy_table(self) -> "numpy.ndarray":
+        # Built on first use; concurrent first calls at worst build it twice.
+        table = self._numpy_rows
+        if table is None:
+            table = require_numpy().array(self._rows, dtype=numpy.intp)
+            table.setflags(write=False)
+            object.__setattr__(self, "_numpy_rows", table)
+        return table
+
+    def _encode_flat(self, words: Sequence[Iterable[str]], total: int) -> "numpy.ndarray":
+        """Encode the concatenation of `words` as one array of columns."""
+        np = require_numpy()
+        try:
+            # One translate call for the whole batch instead of one per word.
+            encoded = self._alphabet.encode("".join(words))
+        except TypeError:  # some words are symbol sequences rather than strings
+            encoded = chain.from_iterable(self._alphabet.encode(word) for word in words)
+        if isinstance(encoded, bytes):
+            return np.frombuffer(encoded, dtype=np.uint8).astype(np.intp)
+        return np.fromiter(encoded, dtype=np.intp, count=total)
+
+    # Introspection ------------------------------------------------------------
+    def state_id(self, state: Hashable) -> int:
+        return self._state_index[state]
+
+    def symbol_id(self, symbol: str) -> int:
+        return self._alphabet.index(symbol)
+
+    def is_accepting(self, state: int) -> bool:
+        return self._accepting[state]
+
+    @property
+    def rows(self) -> Tuple[Tuple[int, ...], ...]:
+        return self._rows
@@ -0,0 +1,151 @@
+from collections import deque
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from .nfa import BitsetNFA, iter_bits
+from .product import shared_alphabet
+
+Word = Union[str, Tuple[str, ...]]
+
+
+class LanguageCheck(NamedTuple):
+    """
+    Outcome of a language comparison; truthy exactly when the relation holds.
+    `counterexample` is a shortest word witnessing the failure (None on success): a str
+    when every symbol is a single character, otherwise a tuple of symbols.
+    """
+
+    holds: bool
+    counterexample: Optional[Word] = None
+
+    def __bool__(self) -> bool:
+        return self.holds
+
+
+class _UnionFind:
+    __slots__ = ("_parent",)
+
+    def __init__(self):
+        self._parent: Dict[Tuple[int, int], Tuple[int, int]] = {}
+
+    def find(self, node: Tuple[int, int]) -> Tuple[int, int]:
+        parent = self._parent
+        root = node
+        while root in parent:
+            root = parent[root]
+        while node != root:
+            following = parent[node]
+            parent[node] = root
+            node = following
+        return root
+
+    def union(self, a: Tuple[int, int], b: Tuple[int, int]) -> bool:
+        """Merge the classes of `a` and `b`; returns False when they already coincide."""
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return False
+        self._parent[a] = b
+        return True
+
+
+def check_equivalence(left: BitsetNFA, right: BitsetNFA) -> LanguageCheck:
+    """
+    Hopcroft-Karp equivalence on the lazily determinized machines.
+
+    DFA states are subset masks tagged with their side. Each explored pair is merged in
+    a union-find, and a pair whose two states are already in one class is skipped, so
+    at most |D1| + |D2| pairs are ever expanded. The walk is breadth-first and stops at
+    the first pair that disagrees on acceptance, which yields a shortest counterexample.
+    """
+    alphabet, (left_columns, right_columns) = shared_alphabet((left, right))
+    start = (left.initial, right.initial)
+    if left.is_accepting(start[0]) != right.is_accepting(start[1]):
+        return LanguageCheck(False, as_word(alphabet.symbols, []))
+
+    classes = _UnionFind()
+    classes.union((0, start[0]), (1, start[1]))
+    parents: Dict[Tuple[int, int], Tuple[Tuple[int, int], int]] = {}
+    queue = deque([start])
+    width = len(alphabet)
+    while queue:
+        pair = queue.popleft()
+        left_mask, right_mask = pair
+        for column in range(width):
+            target = (
+                left.step(left_mask, left_columns[column]) if left_mask else 0,
+                right.step(right_mask, right_columns[column]) if right_mask else 0,
+            )
+            if not classes.union((0, target[0]), (1, target[1])):
+                continue
+            parents[target] = (pair, column)
+            if left.is_accepting(target[0]) != right.is_accepting(target[1]):
+                return LanguageCheck(False, _trace(alphabet.symbols, parents, target))
+            queue.append(target)
+    return LanguageCheck(True)
+
+
+def check_inclusion(left: BitsetNFA, right: BitsetNFA) -> LanguageCheck:
+    """
+    Antichain inclusion check L(left) <= L(right) that never determinizes `left`.
+
+    The walk explores (state of left, subset of right) pairs breadth-first. A pair is
+    discarded when an already visited pair has the same left state and a subset of
+    its right subset: anything that fails from the larger subset also fails, no later,
+    from the smaller one. The first pair whose left state accepts while its right
+    subset does not gives a shortest counterexample.
+    """
+    alphabet, (left_columns, right_columns) = shared_alphabet((left, right))
+    antichain: Dict[int, List[int]] = {}
+    parents: Dict[Tuple[int, int], Tuple[Tuple[int, int], int]] = {}
+    queue: deque = deque()
+
+    def visit(pair: Tuple[int, int]) -> bool:
+        state, subset = pair
+        minimal = antichain.setdefault(state, [])
+        for other in minimal:
+            if not other & ~subset:
+                return False
+        minimal[:] = [other for other in minimal if other & ~subset]
+        minimal.append(subset)
+        queue.append(pair)
+        return True
+
+    accept_mask = left.accept_mask
+    for state in iter_bits(left.initial):
+        visit((state, right.initial))
+        if accept_mask >> state & 1 and not right.is_accepting(right.initial):
+            return LanguageCheck(False, as_word(alphabet.symbols, []))
+
+    width = len(alphabet)
+    while queue:
+        pair = queue.popleft()
+        state, subset = pair
+        for column in range(width):
+            targets = left.step(1 << state, left_columns[column])
+            if not targets:
+                continue
+            image = right.step(subset, right_columns[column]) if subset else 0
+            for target_state in iter_bits(targets):
+                target = (target_state, image)
+                if not visit(target):
+                    continue
+                parents[target] = (pair, column)
+                if accept_mask >> target_state & 1 and not right.is_accepting(image):
+                    return LanguageCheck(False, _trace(alphabet.symbols, parents, target))
+    return LanguageCheck(True)
+
+
+def _trace(symbols: Sequence[str], parents, pair) -> Word:
+    columns: List[int] = []
+    while pair in parents:
+        pair, column = parents[pair]
+        columns.append(column)
+    columns.reverse()
+    return as_word(symbols, columns)
+
+
+def as_word(symbols: Sequence[str], columns: Iterable[int]) -> Word:
+    """Spell symbol columns as a str when every symbol is one character, else a tuple."""
+    letters = tuple(symbols[column] for column in columns)
+    if all(isinstance(letter, str) and len(letter) == 1 for letter in letters):
+        return "".join(letters)
+    return letters
@@ -0,0 +1,152 @@
+from collections import deque
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+from .engine import ordered
+
+Neighbors = Callable[[Hashable], Iterable[Hashable]]
+
+
+def bfs_levels(
+    states: Sequence[Hashable], start_state: Optional[Hashable], successors: Neighbors
+) -> Dict[Hashable, int]:
+    """
+    Assign every state a level with a linear-time BFS from the start state.
+    States it cannot reach are laid out component by component after the deepest
+    level, each component starting from its smallest state.
+    """
+    levels: Dict[Hashable, int] = {}
+
+    def visit(root: Hashable, base: int) -> int:
+        levels[root] = base
+        deepest = base
+        queue = deque([root])
+        while queue:
+            current = queue.popleft()
+            level = levels[current] + 1
+            for nxt in successors(current):
+                if nxt not in levels:
+                    levels[nxt] = level
+                    deepest = max(deepest, level)
+                    queue.append(nxt)
+        return deepest
+
+    deepest = -1
+    if start_state is not None and start_state in set(states):
+        deepest = visit(start_state, 0)
+    remaining = [state for state in states if state not in levels]
+    if remaining:
+        base = deepest + 1
+        for state in ordered(remaining):
+            if state not in levels:
+                deepest = max(deepest, visit(state, base))
+    return levels
+
+
+def reduce_crossings(
+    levels: Dict[Hashable, int],
+    successors: Neighbors,
+    predecessors: Neighbors,
+    sweeps: int = 4,
+) -> List[List[Hashable]]:
+    """
+    Order the states of each level to reduce edge crossings with the barycenter heuristic.
+    Each sweep runs down then up the levels, so the cost is O(sweeps * (E + n log n)).
+    """
+    depth = max(levels.values(), default=-1) + 1
+    rows: List[List[Hashable]] = [[] for _ in range(depth)]
+    for state, level in levels.items():
+        rows[level].append(state)
+
+    above: Dict[Hashable, List[Hashable]] = {state: [] for state in levels}
+    below: Dict[Hashable, List[Hashable]] = {state: [] for state in levels}
+    for state, level in levels.items():
+        for neighbors in (successors(state), predecessors(state)):
+            for other in neighbors:
+                other_level = levels.get(other)
+                if other_level == level + 1:
+                    below[state].append(other)
+                elif other_level == level - 1:
+                    above[state].append(other)
+
+    index: Dict[Hashable, int] = {}
+    for row in rows:
+        for idx, state in enumerate(row):
+            index[state] = idx
+
+    def reorder(row: List[Hashable], neighbors: Dict[Hashable, List[Hashable]]) -> None:
+        def barycenter(item: Tuple[int, Hashable]) -> float:
+            position, state = item
+            linked = neighbors[state]
+            if not linked:
+                return float(position)
+            return sum(index[other] for other in linked) / len(linked)
+
+        row[:] = [state for _, state in sorted(enumerate(row), key=barycenter)]
+        for idx, state in enumerate(row):
+            index[state] = idx
+
+    for _ in range(sweeps):
+        for level in range(1, depth):
+            reorder(rows[level], above)
+        for level in range(depth - 2, -1, -1):
+            reorder(rows[level], below)
+    return rows
+
+
+def assign_coordinates(
+    rows: List[List[Hashable]],
+    above: Callable[[Hashable], Iterable[Hashable]],
+    horizontal_gap: float,
+    vertical_gap: float,
+) -> Dict[Hashable, Tuple[float, float]]:
+    """
+    Place each level's states at x = level * horizontal_gap and pull them toward the
+    mean height of their neighbors on the previous level, keeping their order and at
+    least `vertical_gap` between them. Linear in the number of states and edges.
+    """
+    positions: Dict[Hashable, Tuple[float, float]] = {}
+    for level, row in enumerate(rows):
+        count = len(row)
+        x = level * horizontal_gap
+        desired = []
+        for idx, state in enumerate(row):
+            placed = [positions[other][1] for other in above(state) if other in positions]
+            if placed:
+                desired.append(sum(placed) / len(placed))
+            else:
+                desired.append((idx - (count - 1) / 2) * vertical_gap)
+
+        # Resolve overlaps pushing down, then pushing up, and average the two.
+        down = list(desired)
+        for idx in range(1, count):
+            down[idx] = max(down[idx], down[idx - 1] + vertical_gap)
+        up = list(desired)
+        for idx in range(count - 2, -1, -1):
+            up[idx] = min(up[idx], up[idx + 1] - vertical_gap)
+        for idx, state in enumerate(row):
+            positions[state] = (x, (down[idx] + up[idx]) / 2)
+    return positions
+
+
+def layered_layout(
+    states: Sequence[Hashable],
+    start_state: Optional[Hashable],
+    successors: Neighbors,
+    predecessors: Neighbors,
+    horizontal_gap: float,
+    vertical_gap: float,
+    sweeps: int = 4,
+) -> Tuple[Dict[Hashable, int], List[List[Hashable]], Dict[Hashable, Tuple[float, float]]]:
+    """Compute levels, per-level ordering and coordinates for a layered drawing."""
+    levels = bfs_levels(states, start_state, successors)
+    rows = reduce_crossings(levels, successors, predecessors, sweeps)
+
+    def upper_neighbors(state: Hashable) -> Iterable[Hashable]:
+        level = levels[state] - 1
+        for neighbors in (predecessors(state), successors(state)):
+            for other in neighbors:
+                if levels.get(other) == level:
+                    yield other
+
+    positions = assign_coordinates(rows, upper_neighbors, horizontal_gap, vertical_gap)
+    return levels, rows, positions
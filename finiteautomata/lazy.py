@@ -0,0 +1,129 @@
+import copy
+from typing import FrozenSet, Hashable, Iterable, Optional, Tuple
+
+from .cache import CacheStats, LRUCache
+from .nfa import BitsetNFA
+from .transitions import TransitionStore
+
+
+class LazyDFA:
+    """
+    On-demand subset construction over a BitsetNFA.
+
+    A DFA state is the bitmask of NFA states it stands for and is only created when
+    input actually reaches it. Discovered (subset, symbol) -> subset edges are kept in
+    a bounded LRU cache, so memory stays fixed however large the full DFA would be;
+    an evicted edge is simply recomputed from the NFA the next time it is needed.
+    With `unanchored`, the start state is re-entered before every symbol, which turns
+    the automaton into a searcher for matches ending anywhere in the input.
+    Instances mutate their cache and should not be shared between threads.
+    """
+
+    __slots__ = ("nfa", "_cache", "_restart")
+
+    def __init__(self, nfa: BitsetNFA, cache_size: int = 4096, unanchored: bool = False):
+        self.nfa = nfa
+        self._cache: LRUCache[int] = LRUCache(cache_size)
+        self._restart = nfa.initial if unanchored else 0
+
+    @classmethod
+    def build(
+        cls,
+        states: Iterable[Hashable],
+        start_state: Optional[Hashable],
+        accept_states: Iterable[Hashable],
+        transitions: Iterable[Tuple[Hashable, str, Hashable]],
+        cache_size: int = 4096,
+        unanchored: bool = False,
+    ) -> "LazyDFA":
+        nfa = BitsetNFA.build(states, start_state, accept_states, transitions)
+        return cls(nfa, cache_size=cache_size, unanchored=unanchored)
+
+    def __repr__(self) -> str:
+        stats = self._cache.stats()
+        return f"<LazyDFA nfa_states={len(self.nfa.states)} cached_edges={stats.size}/{stats.maxsize}>"
+
+    @property
+    def initial(self) -> int:
+        return self.nfa.initial
+
+    @property
+    def unanchored(self) -> bool:
+        return bool(self._restart)
+
+    def next(self, subset: int, column: int) -> int:
+        """Return the DFA state reached from `subset` on symbol column `column`."""
+        key = (subset, column)
+        target = self._cache.get(key)
+        if target is None:
+            target = self.nfa.step(subset, column) | self._restart
+            self._cache.put(key, target)
+        return target
+
+    def advance(self, subset: int, word: Iterable[str]) -> int:
+        """Run `word` from DFA state `subset`; returns 0 once every run has died."""
+        cache = self._cache
+        step = self.nfa.step
+        restart = self._restart
+        for column in self.nfa.alphabet.encode(word):
+            key = (subset, column)
+            target = cache.get(key)
+            if target is None:
+                target = step(subset, column) | restart
+                cache.put(key, target)
+            if not target:
+                return 0
+            subset = target
+        return subset
+
+    def accepts(self, word: Iterable[str]) -> bool:
+        return self.nfa.is_accepting(self.advance(self.nfa.initial, word))
+
+    def run(self, word: Iterable[str]) -> FrozenSet[Hashable]:
+        """Return the names of the NFA states making up the DFA state reached by `word`."""
+        return self.nfa.names(self.advance(self.nfa.initial, word))
+
+    def is_accepting(self, subset: int) -> bool:
+        return self.nfa.is_accepting(subset)
+
+    # Cache management -----------------------------------------------------------
+    def cache_info(self) -> CacheStats:
+        """Hit, miss and eviction counters of the edge cache."""
+        return self._cache.stats()
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
+
+
+def determinize_automaton(fsm):
+    """
+    Return a deterministic automaton of the same type as `fsm` accepting the same
+    language. Only subsets reachable from the start state are built; they are named
+    q0, q1, ... in breadth-first order, and the empty subset is left implicit.
+    """
+    result = type(fsm)(compact=fsm.compact)
+    result.renderer_config = copy.copy(fsm.renderer_config)
+    if fsm.start_state is None:
+        return result
+    nfa = BitsetNFA.build(fsm.states, fsm.start_state, fsm.accept_states, fsm.transitions)
+    symbols = nfa.alphabet.symbols
+    index = {nfa.initial: 0}
+    order = [nfa.initial]
+    transitions = []
+    for source, subset in enumerate(order):
+        for column, symbol in enumerate(symbols):
+            target = nfa.step(subset, column)
+            if not target:
+                continue
+            target_id = index.get(target)
+            if target_id is None:
+                target_id = index[target] = len(order)
+                order.append(target)
+            transitions.append((f"q{source}", symbol, f"q{target_id}"))
+    result.start("q0")
+    for idx, subset in enumerate(order):
+        result.state(f"q{idx}")
+        if nfa.is_accepting(subset):
+            result.accept(f"q{idx}")
+    result.transitions = transitions if fsm.compact else TransitionStore.from_unique(transitions)
+    return result
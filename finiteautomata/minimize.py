@@ -0,0 +1,120 @@
+import copy
+from typing import Dict, List, Sequence, Set, Tuple
+
+from .engine import CompiledDFA
+
+
+def reachable_states(rows: Sequence[Sequence[int]], start: int) -> List[int]:
+    """Return the integer states reachable from `start`, in BFS order."""
+    seen = {start}
+    order = [start]
+    for state in order:
+        for target in rows[state]:
+            if target not in seen:
+                seen.add(target)
+                order.append(target)
+    return order
+
+
+def hopcroft(
+    rows: Sequence[Sequence[int]], accepting: Sequence[bool], symbols: int
+) -> List[int]:
+    """
+    Partition the states of a complete DFA into Myhill-Nerode classes.
+
+    `rows[q][c]` is the successor of state q on symbol column c (for c < `symbols`).
+    Runs Hopcroft's partition refinement in O(n k log n) and returns the block id of
+    every state.
+    """
+    size = len(rows)
+    inverse: List[List[List[int]]] = [[[] for _ in range(size)] for _ in range(symbols)]
+    for state, row in enumerate(rows):
+        for column in range(symbols):
+            inverse[column][row[column]].append(state)
+
+    accept_block = {q for q in range(size) if accepting[q]}
+    reject_block = set(range(size)) - accept_block
+    blocks: List[Set[int]] = [b for b in (accept_block, reject_block) if b]
+    block_of = [0] * size
+    for idx, block in enumerate(blocks):
+        for state in block:
+            block_of[state] = idx
+
+    worklist: Set[Tuple[int, int]] = set()
+    if len(blocks) == 2:
+        smaller = 0 if len(blocks[0]) <= len(blocks[1]) else 1
+        worklist.update((smaller, column) for column in range(symbols))
+
+    while worklist:
+        splitter, column = worklist.pop()
+        predecessors = inverse[column]
+        touched: Dict[int, List[int]] = {}
+        for state in blocks[splitter]:
+            for pred in predecessors[state]:
+                touched.setdefault(block_of[pred], []).append(pred)
+
+        for block_id, members in touched.items():
+            block = blocks[block_id]
+            if len(members) == len(block):
+                continue
+            new_id = len(blocks)
+            new_block = set(members)
+            block -= new_block
+            blocks.append(new_block)
+            for state in members:
+                block_of[state] = new_id
+            for sym in range(symbols):
+                if (block_id, sym) in worklist or len(new_block) <= len(block):
+                    worklist.add((new_id, sym))
+                else:
+                    worklist.add((block_id, sym))
+    return block_of
+
+
+def minimize_automaton(fsm, trim: bool = True):
+    """
+    Return a new automaton of the same type as `fsm` that accepts the same language
+    with the fewest states. Each merged state keeps the name of one of its members
+    (the start state always keeps its own name). With `trim`, states unreachable from
+    the start state are dropped before minimizing; dead states are always removed.
+    Raises ValueError for nondeterministic automata.
+    """
+    dfa = CompiledDFA.build(fsm.states, fsm.start_state, fsm.accept_states, fsm.transitions)
+    symbols = len(dfa.symbols)
+    rows = dfa.rows
+
+    kept = reachable_states(rows, dfa.start) if trim else list(range(len(rows)))
+    if dfa.dead not in kept:
+        kept.append(dfa.dead)
+    kept.sort()
+    local = {state: idx for idx, state in enumerate(kept)}
+    local_rows = [[local[rows[state][c]] for c in range(symbols)] for state in kept]
+    local_accepting = [dfa.is_accepting(state) for state in kept]
+
+    block_of = hopcroft(local_rows, local_accepting, symbols)
+    dead_block = block_of[local[dfa.dead]]
+
+    names: Dict[int, object] = {}
+    for idx, state in enumerate(kept):
+        block = block_of[idx]
+        if block != dead_block and block not in names:
+            names[block] = dfa.states[state]
+
+    result = type(fsm)(compact=fsm.compact)
+    result.renderer_config = copy.copy(fsm.renderer_config)
+    result.start(fsm.start_state)
+    seen_blocks = set()
+    for idx, state in enumerate(kept):
+        block = block_of[idx]
+        if block == dead_block or block in seen_blocks:
+            continue
+        seen_blocks.add(block)
+        name = names[block]
+        result.state(name)
+        if local_accepting[idx]:
+            result.accept(name)
+        for column in range(symbols):
+            target = block_of[local_rows[idx][column]]
+            if target != dead_block:
+                result.transition(name, dfa.symbols[column], names[target])
+    return result
@@ -0,0 +1,156 @@
+from typing import FrozenSet, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+from .engine import EPSILON, SymbolTable, intern_states, intern_symbols
+
+
+def iter_bits(mask: int) -> Iterable[int]:
+    """Yield the indexes of the set bits of `mask`, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class BitsetNFA:
+    """
+    Bit-parallel simulation of a nondeterministic automaton.
+
+    The active state set is a Python int used as a bitmask (bit i set means state i
+    is active); Python ints are arbitrary-width packed words, so the same code serves
+    machines of any size. Epsilon closures are precomputed per state and folded into
+    one successor mask per (state, symbol), so a step is one OR per active state.
+    """
+
+    __slots__ = (
+        "states",
+        "alphabet",
+        "initial",
+        "accept_mask",
+        "closures",
+        "_successors",
+    )
+
+    def __init__(
+        self,
+        states: Sequence[Hashable],
+        alphabet: SymbolTable,
+        closures: Sequence[int],
+        successors: Sequence[Sequence[int]],
+        accept_mask: int,
+    ):
+        self.states = tuple(states)
+        self.alphabet = alphabet
+        self.closures = tuple(closures)
+        self._successors = tuple(tuple(column) for column in successors)
+        self.accept_mask = accept_mask
+        self.initial = self.closures[0] if self.states else 0
+
+    @classmethod
+    def build(
+        cls,
+        states: Iterable[Hashable],
+        start_state: Optional[Hashable],
+        accept_states: Iterable[Hashable],
+        transitions: Iterable[Tuple[Hashable, str, Hashable]],
+    ) -> "BitsetNFA":
+        """Intern an automaton description and precompute closures and successor masks."""
+        if start_state is None:
+            raise ValueError("Cannot simulate an automaton without a start state.")
+        transitions = list(transitions)
+        state_names, state_index = intern_states(states, start_state)
+        symbol_names, symbol_index = intern_symbols(transitions)
+        size = len(state_names)
+
+        epsilon_edges: List[int] = [0] * size
+        direct: List[List[int]] = [[0] * size for _ in symbol_names]
+        for src, symbol, dst in transitions:
+            bit = 1 << state_index[dst]
+            if symbol == EPSILON:
+                epsilon_edges[state_index[src]] |= bit
+            else:
+                direct[symbol_index[symbol]][state_index[src]] |= bit
+
+        closures = [0] * size
+        for state in range(size):
+            closure = 1 << state
+            frontier = epsilon_edges[state]
+            while frontier & ~closure:
+                frontier &= ~closure
+                closure |= frontier
+                reached = 0
+                for idx in iter_bits(frontier):
+                    reached |= epsilon_edges[idx]
+                frontier = reached
+            closures[state] = closure
+
+        successors = []
+        for column in direct:
+            closed = []
+            for mask in column:
+                result = 0
+                for idx in iter_bits(mask):
+                    result |= closures[idx]
+                closed.append(result)
+            successors.append(closed)
+        # Unknown symbols lead nowhere.
+        successors.append([0] * size)
+
+        accept = set(accept_states)
+        accept_mask = 0
+        for idx, name in enumerate(state_names):
+            if name in accept:
+                accept_mask |= 1 << idx
+        return cls(state_names, SymbolTable(symbol_names), closures, successors, accept_mask)
+
+    def __repr__(self) -> str:
+        return f"<BitsetNFA states={len(self.states)} symbols={len(self.alphabet)}>"
+
+    # Execution ----------------------------------------------------------------
+    def step(self, mask: int, column: int) -> int:
+        """Return the (epsilon-closed) set of states reached from `mask` on symbol column `column`."""
+        table = self._successors[column]
+        result = 0
+        while mask:
+            low = mask & -mask
+            result |= table[low.bit_length() - 1]
+            mask ^= low
+        return result
+
+    def advance(self, mask: int, word: Iterable[str]) -> int:
+        """Run `word` from the state set `mask` and return the resulting state set."""
+        successors = self._successors
+        for column in self.alphabet.encode(word):
+            table = successors[column]
+            result = 0
+            while mask:
+                low = mask & -mask
+                result |= table[low.bit_length() - 1]
+                mask ^= low
+            if not result:
+                return 0
+            mask = result
+        return mask
+
+    def accepts(self, word: Iterable[str]) -> bool:
+        """Return True when some run over `word` ends in an accepting state."""
+        return bool(self.advance(self.initial, word) & self.accept_mask)
+
+    def run(self, word: Iterable[str]) -> FrozenSet[Hashable]:
+        """Return the names of all states active after reading `word`."""
+        return self.names(self.advance(self.initial, word))
+
+    # Introspection ------------------------------------------------------------
+    def names(self, mask: int) -> FrozenSet[Hashable]:
+        """Translate a state bitmask back into state names."""
+        return frozenset(self.states[idx] for idx in iter_bits(mask))
+
+    def mask(self, states: Iterable[Hashable]) -> int:
+        """Translate state names into a bitmask."""
+        index = {name: idx for idx, name in enumerate(self.states)}
+        result = 0
+        for name in states:
+            result |= 1 << index[name]
+        return result
+
+    def is_accepting(self, mask: int) -> bool:
+        return bool(mask & self.accept_mask)
@@ -0,0 +1,210 @@
+from collections import deque
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+from .engine import SymbolTable, ordered
+from .nfa import BitsetNFA, iter_bits
+
+# Name given to the empty subset (the implicit sink) when a product is materialized.
+SINK = "∅"
+
+Pair = Tuple[int, int]
+
+# operation -> (accepts(left, right), dead(left_mask, right_mask))
+_OPERATIONS: Dict[str, Tuple[Callable[[bool, bool], bool], Callable[[int, int], bool]]] = {
+    "intersection": (lambda l, r: l and r, lambda l, r: not (l and r)),
+    "union": (lambda l, r: l or r, lambda l, r: not (l or r)),
+    "difference": (lambda l, r: l and not r, lambda l, r: not l),
+    "complement": (lambda l, r: not l, lambda l, r: False),
+}
+
+
+class ProductAutomaton:
+    """
+    Lazy synchronous product of two automata (or of one, for the complement).
+
+    A product state is a pair of BitsetNFA subset masks, so nondeterministic and
+    epsilon machines are determinized on the fly; the empty mask is the implicit sink
+    of a side that has no move. Pairs are only created when a walk from the start pair
+    reaches them, and pairs that can no longer accept under the operation (e.g. a
+    dead side of an intersection) are pruned instead of explored, so the full
+    |Q1| x |Q2| grid is never built. The alphabet is the union of both alphabets.
+    """
+
+    __slots__ = ("left", "right", "operation", "alphabet", "_columns", "_accept", "_dead")
+
+    def __init__(self, left: BitsetNFA, right: Optional[BitsetNFA], operation: str):
+        if operation not in _OPERATIONS:
+            raise ValueError(
+                f"Unknown product operation '{operation}'. "
+                f"Expected one of {', '.join(_OPERATIONS)}."
+            )
+        if (right is None) != (operation == "complement"):
+            raise ValueError("The complement takes exactly one automaton; other operations take two.")
+        self.left = left
+        self.right = right
+        self.operation = operation
+        sides = (left,) if right is None else (left, right)
+        self.alphabet, self._columns = shared_alphabet(sides)
+        self._accept, self._dead = _OPERATIONS[operation]
+
+    @classmethod
+    def build(cls, left, right, operation: str) -> "ProductAutomaton":
+        """Combine two FiniteAutomata-like objects (right is None for the complement)."""
+        return cls(nfa_of(left), None if right is None else nfa_of(right), operation)
+
+    def __repr__(self) -> str:
+        return f"<ProductAutomaton {self.operation} symbols={len(self.alphabet)}>"
+
+    # Execution ----------------------------------------------------------------
+    @property
+    def initial(self) -> Pair:
+        return (self.left.initial, 0 if self.right is None else self.right.initial)
+
+    def step(self, pair: Pair, column: int) -> Pair:
+        """Return the pair reached from `pair` on product column `column`."""
+        left_mask, right_mask = pair
+        left = self.left.step(left_mask, self._columns[0][column]) if left_mask else 0
+        right = 0
+        if right_mask:
+            right = self.right.step(right_mask, self._columns[1][column])
+        return (left, right)
+
+    def is_accepting(self, pair: Pair) -> bool:
+        left_mask, right_mask = pair
+        right = self.right is not None and self.right.is_accepting(right_mask)
+        return self._accept(self.left.is_accepting(left_mask), right)
+
+    def is_dead(self, pair: Pair) -> bool:
+        """True when no continuation from `pair` can be accepted."""
+        return self._dead(*pair)
+
+    def accepts(self, word: Iterable[str]) -> bool:
+        """Words using symbols outside the product alphabet are rejected."""
+        pair = self.initial
+        unknown = self.alphabet.unknown
+        for column in self.alphabet.encode(word):
+            if column == unknown or self.is_dead(pair):
+                return False
+            pair = self.step(pair, column)
+        return self.is_accepting(pair)
+
+    # Exploration --------------------------------------------------------------
+    def find_word(self) -> Optional[Tuple[str, ...]]:
+        """
+        Return a shortest accepted word as a tuple of symbols, or None when the language
+        is empty. The breadth-first walk stops at the first accepting pair it reaches.
+        """
+        start = self.initial
+        if self.is_accepting(start):
+            return ()
+        parents: Dict[Pair, Tuple[Pair, int]] = {start: (start, -1)}
+        queue = deque([start])
+        width = len(self.alphabet)
+        while queue:
+            pair = queue.popleft()
+            if self.is_dead(pair):
+                continue
+            for column in range(width):
+                target = self.step(pair, column)
+                if target in parents:
+                    continue
+                parents[target] = (pair, column)
+                if self.is_accepting(target):
+                    return self._trace(parents, target)
+                queue.append(target)
+        return None
+
+    def is_empty(self) -> bool:
+        """True when the product accepts no word at all."""
+        return self.find_word() is None
+
+    def explore(self) -> Tuple[List[Pair], List[Tuple[Pair, int, Pair]]]:
+        """Return the live pairs reachable from the start pair (BFS order) and their edges."""
+        start = self.initial
+        seen = {start}
+        order = [start]
+        edges: List[Tuple[Pair, int, Pair]] = []
+        width = len(self.alphabet)
+        for pair in order:
+            if self.is_dead(pair):
+                continue
+            for column in range(width):
+                target = self.step(pair, column)
+                if self.is_dead(target):
+                    continue
+                edges.append((pair, column, target))
+                if target not in seen:
+                    seen.add(target)
+                    order.append(target)
+        return order, edges
+
+    def to_automaton(self, cls):
+        """
+        Materialize the reachable, live part of the product as an instance of `cls`.
+        States are named (left, right) after the component subsets (a single state's own
+        name, a frozenset of names, or SINK when empty); the complement keeps one name.
+        """
+        pairs, edges = self.explore()
+        names = {pair: self.name(pair) for pair in pairs}
+        result = cls()
+        result.start(names[pairs[0]])
+        for pair in pairs:
+            if self.is_accepting(pair):
+                result.accept(names[pair])
+        symbols = self.alphabet.symbols
+        for src, column, dst in edges:
+            result.transition(names[src], symbols[column], names[dst])
+        return result
+
+    def name(self, pair: Pair) -> Hashable:
+        left = _label(self.left, pair[0])
+        if self.right is None:
+            return left
+        return (left, _label(self.right, pair[1]))
+
+    def _trace(self, parents: Dict[Pair, Tuple[Pair, int]], pair: Pair) -> Tuple[str, ...]:
+        columns: List[int] = []
+        while True:
+            pair, column = parents[pair]
+            if column < 0:
+                break
+            columns.append(column)
+        symbols = self.alphabet.symbols
+        return tuple(symbols[column] for column in reversed(columns))
+
+
+def shared_alphabet(
+    sides: Sequence[BitsetNFA],
+) -> Tuple[SymbolTable, Tuple[Tuple[int, ...], ...]]:
+    """
+    Return the union of the alphabets of `sides` and, per side, the side's own column
+    for every shared column (its unknown column when the side lacks the symbol).
+    """
+    symbols = ordered({s for side in sides for s in side.alphabet.symbols})
+    columns = tuple(tuple(side.alphabet.index(symbol) for symbol in symbols) for side in sides)
+    return SymbolTable(symbols), columns
+
+
+# Interned in place of a missing start state; never active, since the run starts empty.
+_NO_START = object()
+
+
+def nfa_of(fsm) -> BitsetNFA:
+    """
+    The simulator products and language checks run on. An automaton without a start
+    state accepts nothing, so it starts from the empty state set.
+    """
+    if fsm.start_state is not None:
+        return BitsetNFA.build(fsm.states, fsm.start_state, fsm.accept_states, fsm.transitions)
+    nfa = BitsetNFA.build(fsm.states, _NO_START, fsm.accept_states, fsm.transitions)
+    nfa.initial = 0
+    return nfa
+
+
+def _label(nfa: BitsetNFA, mask: int) -> Hashable:
+    if not mask:
+        return SINK
+    members = list(iter_bits(mask))
+    if len(members) == 1:
+        return nfa.states[members[0]]
+    return frozenset(nfa.states[idx] for idx in members)
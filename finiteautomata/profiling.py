@@ -0,0 +1,160 @@
+import threading
+import time
+import tracemalloc
+from typing import Dict, Iterator, NamedTuple, Optional, Sequence
+
+
+# tracemalloc is process-global: probes share one session, started by the first and
+# stopped by the last (unless someone else started it), under this lock.
+_TRACING_LOCK = threading.Lock()
+_tracing_users = 0
+_tracing_owned = False
+
+
+class PhaseStats(NamedTuple):
+    """Measurements for one render phase; peak_bytes is None unless profiling is enabled."""
+
+    seconds: float
+    bytes_written: int = 0
+    elements: int = 0
+    peak_bytes: Optional[int] = None
+
+
+class RenderStats:
+    """
+    Per-phase measurements of a render, keyed by phase name:
+
+    - "layout": state placement (elements = states placed)
+    - "group": transition grouping (elements = grouped edges)
+    - "route": spatial edge routing, only with routing="spatial" (elements = routed edges)
+    - "svg": document assembly (elements = states + edges, bytes_written = text outputs)
+    - "write": time spent writing and closing the text outputs (instrumented renders only;
+      otherwise it is part of "svg")
+    - "png": rasterization, until the PNG is on disk
+    """
+
+    def __init__(self) -> None:
+        self.phases: Dict[str, PhaseStats] = {}
+
+    def __getitem__(self, phase: str) -> PhaseStats:
+        return self.phases[phase]
+
+    def __contains__(self, phase: object) -> bool:
+        return phase in self.phases
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.phases)
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(stats.seconds for stats in self.phases.values())
+
+    @property
+    def bytes_written(self) -> int:
+        return sum(stats.bytes_written for stats in self.phases.values())
+
+    def as_dict(self) -> Dict[str, Dict[str, object]]:
+        return {phase: dict(stats._asdict()) for phase, stats in self.phases.items()}
+
+    def __repr__(self) -> str:
+        phases = ", ".join(f"{phase}={stats.seconds * 1000:.2f}ms" for phase, stats in self.phases.items())
+        return f"RenderStats({phases})"
+
+
+class RenderHook:
+    """
+    Base class for render instrumentation (e.g. forwarding to a metrics system).
+    Register instances with configure_renderer(hooks=[...]) and override what you need;
+    both methods may be called from worker threads for the "png" phase.
+    """
+
+    def phase_started(self, phase: str) -> None:
+        pass
+
+    def phase_finished(self, phase: str, stats: PhaseStats) -> None:
+        pass
+
+
+class RenderOutputs(dict):
+    """The format -> path (or future) mapping returned by render(), carrying `.stats`."""
+
+    def __init__(self, outputs=(), stats: Optional[RenderStats] = None):
+        super().__init__(outputs)
+        self.stats = stats if stats is not None else RenderStats()
+
+
+class Probe:
+    """
+    Records phases into a RenderStats. Timing is always on (one clock read per boundary);
+    hooks are only called when registered and tracemalloc only runs with `trace_memory`.
+
+    Memory stats are per process: phases traced at the same time on other threads
+    (wait=False writes, draw_many workers, draw_async renders) share one tracemalloc
+    session, so each one's peak_bytes also counts the others' allocations.
+    """
+
+    def __init__(self, stats: RenderStats, hooks: Sequence[RenderHook] = (), trace_memory: bool = False):
+        self.stats = stats
+        self.hooks = tuple(hooks)
+        self.trace_memory = trace_memory
+        self.active = bool(self.hooks) or trace_memory
+        self._tracing = False
+        self._baseline = 0
+
+    def start(self, phase: str, memory: bool = True) -> float:
+        """Begin a phase; memory=False skips allocation tracing (e.g. work done in a pool)."""
+        for hook in self.hooks:
+            hook.phase_started(phase)
+        if memory and self.trace_memory:
+            self._start_tracing()
+        return time.perf_counter()
+
+    def finish(
+        self,
+        phase: str,
+        started: float,
+        bytes_written: int = 0,
+        elements: int = 0,
+        seconds: Optional[float] = None,
+        memory: bool = True,
+    ) -> PhaseStats:
+        if seconds is None:
+            seconds = time.perf_counter() - started
+        peak = self._stop_tracing() if memory and self.trace_memory else None
+        stats = PhaseStats(seconds, bytes_written, elements, peak)
+        self.stats.phases[phase] = stats
+        for hook in self.hooks:
+            hook.phase_finished(phase, stats)
+        return stats
+
+    def _start_tracing(self) -> None:
+        global _tracing_users, _tracing_owned
+        with _TRACING_LOCK:
+            if self._tracing:
+                _tracing_users -= 1
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                _tracing_owned = True
+            elif not _tracing_users:
+                # Only reset the peak when no other phase is measuring against it.
+                reset_peak = getattr(tracemalloc, "reset_peak", None)
+                if reset_peak is not None:
+                    reset_peak()
+            _tracing_users += 1
+            self._tracing = True
+            self._baseline = tracemalloc.get_traced_memory()[0]
+
+    def _stop_tracing(self) -> int:
+        global _tracing_users, _tracing_owned
+        with _TRACING_LOCK:
+            if not self._tracing:
+                return 0
+            self._tracing = False
+            _tracing_users -= 1
+            tracing = tracemalloc.is_tracing()
+            peak = max(0, tracemalloc.get_traced_memory()[1] - self._baseline) if tracing else 0
+            if not _tracing_users and _tracing_owned:
+                if tracing:
+                    tracemalloc.stop()
+                _tracing_owned = False
+            return peak
@@ -0,0 +1,229 @@
+"""
+Regular expressions to automata.
+
+Supported syntax: literals, concatenation, alternation `|`, grouping `( )`, the
+postfix operators `*`, `+` and `?`, character classes `[abc]` / `[a-z]`, and `\\`
+to escape any metacharacter. The empty pattern (or an empty alternative) matches
+the empty word. There is no `.` wildcard, since an automaton has no fixed alphabet.
+
+Patterns are compiled with Thompson's construction into an epsilon-NFA. Compiled
+machines are memoized per process in a bounded LRU cache keyed by pattern and
+options; every call still returns a fresh, independent automaton.
+"""
+import threading
+from typing import Hashable, List, Optional, Tuple
+
+from .cache import CacheStats, LRUCache
+from .engine import EPSILON
+from .transitions import Transition, TransitionStore
+
+DEFAULT_CACHE_SIZE = 256
+
+# (kind, payload): ("symbols", (str, ...)), ("concat" | "alt", (node, ...)),
+# ("star" | "plus" | "optional", node), ("empty", None)
+Node = Tuple[str, object]
+
+# (states, accept states, transitions); the start state is always "q0".
+_Compiled = Tuple[Tuple[str, ...], Tuple[str, ...], Tuple[Transition, ...]]
+
+
+class _Parser:
+    __slots__ = ("pattern", "pos")
+
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+        self.pos = 0
+
+    def parse(self) -> Node:
+        node = self._alternation()
+        if self.pos != len(self.pattern):
+            self._fail("unbalanced ')'")
+        return node
+
+    def _fail(self, reason: str):
+        raise ValueError(f"Invalid regular expression {self.pattern!r} at position {self.pos}: {reason}.")
+
+    def _peek(self) -> Optional[str]:
+        return self.pattern[self.pos] if self.pos < len(self.pattern) else None
+
+    def _alternation(self) -> Node:
+        branches = [self._concatenation()]
+        while self._peek() == "|":
+            self.pos += 1
+            branches.append(self._concatenation())
+        return branches[0] if len(branches) == 1 else ("alt", tuple(branches))
+
+    def _concatenation(self) -> Node:
+        items: List[Node] = []
+        while self._peek() not in (None, "|", ")"):
+            items.append(self._repetition())
+        if not items:
+            return ("empty", None)
+        return items[0] if len(items) == 1 else ("concat", tuple(items))
+
+    def _repetition(self) -> Node:
+        node = self._atom()
+        while self._peek() in ("*", "+", "?"):
+            kind = {"*": "star", "+": "plus", "?": "optional"}[self.pattern[self.pos]]
+            self.pos += 1
+            node = (kind, node)
+        return node
+
+    def _atom(self) -> Node:
+        char = self.pattern[self.pos]
+        if char == "(":
+            self.pos += 1
+            node = self._alternation()
+            if self._peek() != ")":
+                self._fail("missing ')'")
+            self.pos += 1
+            return node
+        if char == "[":
+            return ("symbols", self._class())
+        if char in "*+?":
+            self._fail(f"nothing to repeat before '{char}'")
+        if char == "]":
+            self._fail("unbalanced ']'")
+        return ("symbols", (self._literal(),))
+
+    def _literal(self) -> str:
+        char = self.pattern[self.pos]
+        if char == "\\":
+            self.pos += 1
+            if self.pos == len(self.pattern):
+                self._fail("dangling escape")
+            char = self.pattern[self.pos]
+        self.pos += 1
+        if char == EPSILON:
+            self._fail(f"'{EPSILON}' is reserved for epsilon moves")
+        return char
+
+    def _class(self) -> Tuple[str, ...]:
+        self.pos += 1
+        symbols = {}
+        while self._peek() != "]":
+            if self._peek() is None:
+                self._fail("missing ']'")
+            low = self._literal()
+            if self._peek() == "-" and self.pos + 1 < len(self.pattern) and self.pattern[self.pos + 1] != "]":
+                self.pos += 1
+                high = self._literal()
+                if ord(high) < ord(low):
+                    self._fail(f"bad range {low}-{high}")
+                for code in range(ord(low), ord(high) + 1):
+                    symbols[chr(code)] = None
+            else:
+                symbols[low] = None
+        self.pos += 1
+        if not symbols:
+            self._fail("empty character class")
+        return tuple(symbols)
+
+
+class _Thompson:
+    """Thompson's construction: one fragment (entry, exit) per syntax node."""
+
+    __slots__ = ("count", "transitions")
+
+    def __init__(self):
+        self.count = 0
+        self.transitions: List[Transition] = []
+
+    def new_state(self) -> str:
+        name = f"q{self.count}"
+        self.count += 1
+        return name
+
+    def build(self, node: Node) -> Tuple[str, str]:
+        kind, payload = node
+        edges = self.transitions
+        if kind == "concat":
+            entry, exit_ = self.build(payload[0])
+            for item in payload[1:]:
+                inner_entry, inner_exit = self.build(item)
+                edges.append((exit_, EPSILON, inner_entry))
+                exit_ = inner_exit
+            return entry, exit_
+        entry, exit_ = self.new_state(), self.new_state()
+        if kind == "empty":
+            edges.append((entry, EPSILON, exit_))
+        elif kind == "symbols":
+            edges.extend((entry, symbol, exit_) for symbol in payload)
+        elif kind == "alt":
+            for branch in payload:
+                inner_entry, inner_exit = self.build(branch)
+                edges.append((entry, EPSILON, inner_entry))
+                edges.append((inner_exit, EPSILON, exit_))
+        else:
+            inner_entry, inner_exit = self.build(payload)
+            edges.append((entry, EPSILON, inner_entry))
+            edges.append((inner_exit, EPSILON, exit_))
+            if kind in ("star", "plus"):
+                edges.append((inner_exit, EPSILON, inner_entry))
+            if kind in ("star", "optional"):
+                edges.append((entry, EPSILON, exit_))
+        return entry, exit_
+
+
+def _compile(pattern: str, deterministic: bool, cls) -> _Compiled:
+    builder = _Thompson()
+    _, exit_ = builder.build(_Parser(pattern).parse())
+    # The outermost fragment's entry is the first state created, so it is always q0.
+    states = tuple(f"q{idx}" for idx in range(builder.count))
+    compiled = (states, (exit_,), tuple(dict.fromkeys(builder.transitions)))
+    if deterministic:
+        dfa = _assemble(cls, compiled).determinize().minimize()
+        compiled = _snapshot(dfa)
+    return compiled
+
+
+def _snapshot(fsm) -> _Compiled:
+    names = {fsm.start_state: "q0"}
+    for state in sorted(fsm.states - {fsm.start_state}, key=lambda s: int(s[1:])):
+        names[state] = f"q{len(names)}"
+    return (
+        tuple(names.values()),
+        tuple(sorted(names[state] for state in fsm.accept_states)),
+        tuple((names[src], symbol, names[dst]) for src, symbol, dst in fsm.transitions),
+    )
+
+
+def _assemble(cls, compiled: _Compiled):
+    states, accept, transitions = compiled
+    fsm = cls()
+    fsm.states = set(states)
+    fsm.start_state = "q0"
+    fsm.accept_states = set(accept)
+    fsm.transitions = TransitionStore.from_unique(transitions)
+    return fsm
+
+
+_cache: LRUCache[_Compiled] = LRUCache(DEFAULT_CACHE_SIZE)
+_cache_lock = threading.Lock()
+
+
+def from_regex(cls, pattern: str, deterministic: bool = False):
+    """Compile `pattern` (or fetch it from the cache) and return a new `cls` instance."""
+    key: Hashable = (pattern, deterministic)
+    with _cache_lock:
+        compiled = _cache.get(key)
+    if compiled is None:
+        from .core import FiniteAutomata
+
+        compiled = _compile(pattern, deterministic, FiniteAutomata)
+        with _cache_lock:
+            _cache.put(key, compiled)
+    return _assemble(cls, compiled)
+
+
+def regex_cache_info() -> CacheStats:
+    """Hit, miss and eviction counters of the compiled-pattern cache."""
+    with _cache_lock:
+        return _cache.stats()
+
+
+def clear_regex_cache(maxsize: Optional[int] = None) -> None:
+    """Empty the compiled-pattern cache and reset its counters, optionally resizing it."""
+    global _cache
+    with _cache_lock:
+        _cache = LRUCache(_cache.maxsize if maxsize is None else maxsize)
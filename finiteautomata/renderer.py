@@ -1,8 +1,37 @@
+import html
+import json
 import os
 import sys
+import tempfile
+import threading
+import time
 import webbrowser
-from dataclasses import dataclass, field
-from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from collections import Counter, deque
+from concurrent.futures import CancelledError, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack
+from dataclasses import astuple, dataclass, field, replace
+from functools import partial
+from typing import (
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    TextIO,
+    Tuple,
+)
+
+from .analysis import Cluster, StructuralView, structural_view
+from .engine import ordered
+from .layout import layered_layout
+from .profiling import Probe, RenderHook, RenderOutputs, RenderStats
+from .routing import Geometry, route_edges
+from .transitions import STORE_TYPES, TransitionStore
+from .viewer import CANVAS_TAIL, canvas_head, json_string
 
 
 @dataclass
@@ -27,6 +56,248 @@ class RendererConfig:
     vertical_gap: int = 160
     state_radius: int = 36
     arrow_size: int = 12
+    executor: str = "thread"  # "thread", "process" or "inline"
+    max_workers: Optional[int] = None
+    layout: str = "classic"  # "classic" or "layered"
+    crossing_sweeps: int = 4
+    compact: bool = False  # shared <defs> shapes, CSS classes and relative path data
+    precision: int = 2  # decimals kept for coordinates in compact output and the canvas viewer
+    html_viewer: str = "svg"  # "svg" (static page) or "canvas" (culled pan/zoom viewer)
+    profile: bool = False  # trace peak allocations per phase (tracemalloc)
+    async_limit: int = 4  # concurrent draw_async() renders per event loop
+    trim: bool = False  # drop unreachable and dead states before layout
+    collapse_threshold: Optional[int] = None  # draw SCCs this large as one expandable node
+    routing: str = "direct"  # "direct" (fixed bends) or "spatial" (indexed lanes and label nudging)
+    hooks: Sequence[RenderHook] = ()  # notified at every phase boundary
+
+
+_EXECUTORS: Dict[Tuple[str, Optional[int]], Executor] = {}
+_EXECUTORS_LOCK = threading.Lock()
+
+
+def get_executor(kind: str, max_workers: Optional[int] = None) -> Optional[Executor]:
+    """
+    Return the shared pool used for output writing and rasterization.
+    Pools are created on first use and reused across renders; "inline" returns None.
+    """
+    if kind == "inline":
+        return None
+    if kind not in ("thread", "process"):
+        raise ValueError(f"Unsupported executor '{kind}'. Expected one of thread, process, inline.")
+    key = (kind, max_workers)
+    with _EXECUTORS_LOCK:
+        executor = _EXECUTORS.get(key)
+        if executor is None:
+            if kind == "thread":
+                executor = ThreadPoolExecutor(max_workers, thread_name_prefix="finiteautomata")
+            else:
+                executor = ProcessPoolExecutor(max_workers, initializer=_warm_worker)
+            _EXECUTORS[key] = executor
+        return executor
+
+
+def _warm_worker() -> None:
+    """Process-pool initializer: pay for the cairosvg import once per worker."""
+    try:
+        _import_cairosvg()
+    except RuntimeError:
+        pass
+
+
+def _import_cairosvg():
+    try:
+        import cairosvg  # type: ignore
+    except ImportError as exc:
+        raise RuntimeError(
+            "PNG output requires the optional dependency 'cairosvg'. "
+            "Install it via `pip install finiteautomata[cairo]`."
+        ) from exc
+    return cairosvg
+
+
+def _resolved(func: Callable[..., str], *args) -> "Future[str]":
+    future: "Future[str]" = Future()
+    try:
+        future.set_result(func(*args))
+    except Exception as exc:
+        future.set_exception(exc)
+    return future
+
+
+def _then(source: "Future[object]", step: Callable[[], "Future[str]"]) -> "Future[str]":
+    """A future for the result of `step()`, which is only started once `source` succeeds."""
+    result: "Future[str]" = Future()
+
+    def relay(done: "Future[str]") -> None:
+        if done.cancelled():
+            result.cancel()
+        elif done.exception() is not None:
+            result.set_exception(done.exception())
+        elif result.set_running_or_notify_cancel():
+            try:
+                step().add_done_callback(settle)
+            except Exception as exc:
+                result.set_exception(exc)
+
+    def settle(done: "Future[str]") -> None:
+        if done.cancelled():
+            result.set_exception(CancelledError())
+        elif done.exception() is not None:
+            result.set_exception(done.exception())
+        else:
+            result.set_result(done.result())
+
+    source.add_done_callback(relay)
+    return result
+
+
+def _rasterize(svg_path: str, png_path: str, remove_source: bool = False) -> str:
+    """Rasterize an SVG file to PNG, letting cairosvg read the document from disk."""
+    try:
+        cairosvg = _import_cairosvg()
+        cairosvg.svg2png(url=svg_path, write_to=png_path)
+    finally:
+        if remove_source:
+            os.remove(svg_path)
+    return png_path
+
+
+def _format_number(value: float, precision: int) -> str:
+    """Format with at most `precision` decimals, dropping trailing zeros and the leading zero."""
+    text = f"{value:.{precision}f}"
+    if "." in text:
+        text = text.rstrip("0").rstrip(".")
+    if text in ("-0", ""):
+        return "0"
+    if text.startswith("0."):
+        return text[1:]
+    if text.startswith("-0."):
+        return "-" + text[2:]
+    return text
+
+
+def _join_numbers(numbers: Iterable[str]) -> str:
+    """Join path numbers, omitting the separator where a minus sign already delimits them."""
+    parts: List[str] = []
+    for number in numbers:
+        if parts and not number.startswith("-"):
+            parts.append(" ")
+        parts.append(number)
+    return "".join(parts)
+
+
+def _absolute_path(command: str, points: List[Tuple[float, float]]) -> str:
+    (x, y), rest = points[0], points[1:]
+    if command == "C":
+        return f"M {x:.2f} {y:.2f} C " + " ".join(f"{px:.2f} {py:.2f}" for px, py in rest)
+    return f"M {x:.2f} {y:.2f} " + " ".join(f"L {px:.2f} {py:.2f}" for px, py in rest)
+
+
+def _checked(write: Callable[[str], object], check: Callable[[], None]) -> Callable[[str], object]:
+    def guarded(chunk: str) -> None:
+        check()
+        write(chunk)
+
+    return guarded
+
+
+class _WriteTimer:
+    """Accumulates the time spent inside wrapped write() calls."""
+
+    def __init__(self) -> None:
+        self.seconds = 0.0
+
+    def wrap(self, write: Callable[[str], object]) -> Callable[[str], object]:
+        clock = time.perf_counter
+
+        def timed(chunk: str) -> None:
+            started = clock()
+            write(chunk)
+            self.seconds += clock() - started
+
+        return timed
+
+
+_HTML_TAIL = """
+</body>
+</html>
+"""
+
+
+# Clicking a summary node opens and scrolls to its cluster section.
+_CLUSTER_SCRIPT = """
+<script>
+document.querySelectorAll("svg .state").forEach(function (node) {
+  var name = node.textContent.trim();
+  document.querySelectorAll("details.cluster").forEach(function (section) {
+    if (section.dataset.name !== name) return;
+    node.style.cursor = "pointer";
+    node.addEventListener("click", function () {
+      section.open = true;
+      section.scrollIntoView({behavior: "smooth"});
+    });
+  });
+});
+</script>"""
+
+
+# States plus edges above which a RenderCache stops retaining SVG fragments.
+DEFAULT_MAX_FRAGMENTS = 2000
+
+
+class RenderCache:
+    """
+    Layout and SVG fragments kept between renders of the same automaton.
+
+    `recomputed` counts the work renders actually did: "layout" (full layouts),
+    "layout_incremental", "layout_reused", "levels" (levels repositioned), "routes"
+    (edges routed with routing="spatial"), "structure" (trimmed or collapsed views) and
+    "states" / "edges" (SVG fragments regenerated). When set, `on_recompute` is
+    called with (counter, amount) as that work happens.
+
+    Fragments are only retained while the drawing has at most `max_fragments` states plus
+    edges (DEFAULT_MAX_FRAGMENTS); larger drawings are streamed out without keeping them,
+    so a big automaton does not hold a copy of its whole document between draws. Set
+    `max_fragments = None` to always retain them. With keep_fragments=False nothing is
+    retained, which is what one-off renderers use. `lock` serializes renders that share the cache
+    from worker threads (draw_async()).
+    """
+
+    def __init__(self, keep_fragments: bool = True, max_fragments: Optional[int] = DEFAULT_MAX_FRAGMENTS) -> None:
+        self.keep_fragments = keep_fragments
+        self.max_fragments = max_fragments
+        self.lock = threading.Lock()
+        self.recomputed: Counter = Counter()
+        self.on_recompute: Optional[Callable[[str, int], None]] = None
+        self.clear()
+
+    def clear(self) -> None:
+        self.reset_layout()
+        self.view_key: Optional[Tuple] = None
+        self.view: Optional[StructuralView] = None
+        self.fragment_key: Optional[Tuple] = None
+        self.state_fragments: Dict[str, Tuple[Tuple, str]] = {}
+        self.edge_fragments: Dict[Tuple[str, str], Tuple[Tuple, str]] = {}
+
+    def reset_layout(self) -> None:
+        self.version: Optional[int] = None
+        self.layout_key: Optional[Tuple] = None
+        self.start_state: Optional[str] = None
+        self.store: Optional[TransitionStore] = None
+        self.transition_count = 0
+        self.rewrites = 0
+        self.reachable: Dict[str, int] = {}
+        self.levels: Dict[str, int] = {}
+        self.level_members: Dict[int, List[str]] = {}
+        self.positions: Dict[str, Tuple[float, float]] = {}
+        self.routes_key: Optional[Tuple] = None
+        self.routes: Dict[Tuple[str, str], Geometry] = {}
+
+    def record(self, counter: str, amount: int = 1) -> None:
+        if amount:
+            self.recomputed[counter] += amount
+            if self.on_recompute is not None:
+                self.on_recompute(counter, amount)
 
 
 class AutomataRenderer:
@@ -37,111 +308,549 @@ class AutomataRenderer:
         accept_states: Iterable[str],
         transitions: Iterable[Tuple[str, str, str]],
         config: Optional[RendererConfig] = None,
+        cache: Optional[RenderCache] = None,
+        version: Optional[int] = None,
     ):
         self.states = list(states)
         self.start_state = start_state
         self.accept_states = set(accept_states)
-        self.transitions = list(transitions)
+        if not isinstance(transitions, STORE_TYPES):
+            transitions = TransitionStore(transitions)
+        self.transitions = transitions
         self.config = config or RendererConfig()
+        self.cache = cache if cache is not None else RenderCache(keep_fragments=False)
+        self.version = version
+        self.clusters: Tuple[Cluster, ...] = ()
+        if self.config.trim or self.config.collapse_threshold is not None:
+            self._apply_structure()
         self._positions: Dict[str, Tuple[float, float]] = {}
         self._levels: Dict[str, int] = {}
         self._grouped_transitions: Dict[Tuple[str, str], List[str]] = {}
+        self._routes: Optional[Dict[Tuple[str, str], Geometry]] = None
+        self._keep_fragments = False
+        self.stats = RenderStats()
+        self._probe = Probe(self.stats, self.config.hooks, self.config.profile)
+        probe = self._probe
+        started = probe.start("layout")
         self._compute_layout()
+        probe.finish("layout", started, elements=len(self._positions))
+        started = probe.start("group")
         self._group_transitions()
+        probe.finish("group", started, elements=len(self._grouped_transitions))
+        if self._spatial_routing():
+            started = probe.start("route")
+            self._route_edges()
+            probe.finish("route", started, elements=len(self._routes))
+
+    def _apply_structure(self) -> None:
+        """
+        Replace the drawn graph by its trimmed and/or cluster-collapsed view. The view is
+        kept in the cache per automaton version, so its store (and thus the cached layout)
+        is reused by later draws of an unchanged automaton.
+        """
+        cache = self.cache
+        key = (self.version, len(self.transitions), self.config.trim, self.config.collapse_threshold)
+        view = cache.view
+        if self.version is None or cache.view_key != key or view is None:
+            view = structural_view(
+                self.states,
+                self.start_state,
+                self.accept_states,
+                self.transitions,
+                trim=self.config.trim,
+                collapse_threshold=self.config.collapse_threshold,
+            )
+            cache.view_key, cache.view = key, view
+            cache.record("structure")
+        self.states = list(view.states)
+        self.start_state = view.start_state
+        self.accept_states = set(view.accept_states)
+        self.transitions = view.transitions
+        self.clusters = view.clusters
 
-    def render(self, filename: str, formats: Sequence[str], view: bool = False) -> Dict[str, str]:
-        outputs: Dict[str, str] = {}
+    def render(
+        self, filename: str, formats: Sequence[str], view: bool = False, wait: bool = True
+    ) -> RenderOutputs:
+        """
+        Stream the SVG and HTML outputs to disk in a single pass over the fragments,
+        without materializing the document, and rasterize PNG from the written SVG file.
+
+        Rasterization runs on the pool selected by `config.executor`. With wait=False
+        the mapping holds futures resolving to the output paths and the call returns at
+        once: the documents are streamed on the shared thread pool (unless the executor is
+        "inline") and PNG rasterization is chained off that write. Either way the
+        mapping's `.stats` holds per-phase RenderStats (phases land as they finish).
+        """
+        requested: List[str] = []
         for fmt in formats:
             fmt_lower = fmt.lower()
-            if fmt_lower == "svg":
-                outputs["svg"] = self._render_svg(filename)
-            elif fmt_lower == "html":
-                outputs["html"] = self._render_html(filename)
-            elif fmt_lower == "png":
-                outputs["png"] = self._render_png(filename)
-            else:
+            if fmt_lower not in ("svg", "html", "png"):
                 raise ValueError(f"Unsupported output format '{fmt}'. Expected one of svg, png, html.")
+            requested.append(fmt_lower)
+        if not requested:
+            return RenderOutputs(stats=self.stats)
+        if "png" in requested:
+            _import_cairosvg()  # fail fast, before any work is scheduled
+        for phase in ("svg", "write", "png"):
+            self.stats.phases.pop(phase, None)
+
+        paths = {fmt: f"{filename}.{fmt}" for fmt in requested}
+        svg_path = paths.get("svg")
+        temporary_svg = "png" in paths and svg_path is None
+        if temporary_svg:
+            # PNG alone still goes through a file so cairosvg never needs the string.
+            fd, svg_path = tempfile.mkstemp(
+                suffix=".svg", dir=os.path.dirname(os.path.abspath(filename))
+            )
+            os.close(fd)
+        executor = get_executor(self.config.executor, self.config.max_workers)
+        write = partial(self._write_documents, svg_path, paths.get("html"), filename, temporary_svg)
+        if wait or executor is None:
+            write()
+            written: "Future[str]" = _resolved(str, svg_path)
+        else:
+            self._freeze()
+            written = get_executor("thread", self.config.max_workers).submit(write)
+
+        def rasterize(png_path: str) -> "Future[str]":
+            started = self._probe.start("png", memory=False)
+            if executor is None:
+                future = _resolved(_rasterize, svg_path, png_path, temporary_svg)
+            else:
+                future = executor.submit(_rasterize, svg_path, png_path, temporary_svg)
+            future.add_done_callback(partial(self._png_finished, started))
+            return future
+
+        futures: Dict[str, "Future[str]"] = {}
+        for fmt in requested:
+            if fmt == "png":
+                futures[fmt] = _then(written, partial(rasterize, paths[fmt]))
+            else:
+                futures[fmt] = _then(written, partial(_resolved, str, paths[fmt]))
 
+        if not wait:
+            if view:
+                self._open_when_done(futures, filename)
+            return RenderOutputs(futures, self.stats)
+
+        outputs = RenderOutputs({fmt: future.result() for fmt, future in futures.items()}, self.stats)
         if view and outputs:
             self._open(outputs, filename)
 
         return outputs
 
+    def _freeze(self) -> None:
+        """
+        Detach from the live store and layout cache before streaming off the calling
+        thread: the grouped edges, positions, levels and routes become private copies,
+        so transitions added or draws made meanwhile do not change what is written.
+        """
+        self._grouped_transitions = {edge: list(symbols) for edge, symbols in self._grouped_transitions.items()}
+        self._positions = dict(self._positions)
+        self._levels = dict(self._levels)
+        if self._routes is not None:
+            self._routes = dict(self._routes)
+
+    def _write_documents(
+        self, svg_path: Optional[str], html_path: Optional[str], title: str, temporary_svg: bool
+    ) -> str:
+        try:
+            with self.cache.lock:
+                self._stream_documents(svg_path, html_path, title)
+        except BaseException:
+            if temporary_svg:
+                os.remove(svg_path)
+            raise
+        return svg_path
+
+    def _png_finished(self, started: float, done: "Future[str]") -> None:
+        written = 0
+        if not done.cancelled() and done.exception() is None:
+            written = os.path.getsize(done.result())
+        self._probe.finish("png", started, written, elements=1 if written else 0, memory=False)
+
+    def write_svg(self, stream: TextIO) -> None:
+        """Write the SVG document to a writable text stream, element by element."""
+        write = stream.write
+        for chunk in self._iter_svg():
+            write(chunk)
+        write("\n")
+
+    def write_html(self, stream: TextIO, title: str = "automaton") -> None:
+        """
+        Write an HTML page to a writable text stream: the embedded SVG document, or with
+        config.html_viewer == "canvas" a canvas viewer fed by a JSON layout payload.
+        """
+        write = stream.write
+        if self._canvas_viewer():
+            self._write_canvas_html(write, title)
+            return
+        write(self._html_head(title))
+        for chunk in self._iter_svg():
+            write(chunk)
+        self._write_clusters(write)
+        write(_HTML_TAIL)
+
+    def _write_canvas_html(self, write: Callable[[str], object], title: str) -> None:
+        write(canvas_head(title, self.config.theme))
+        for chunk in self._iter_canvas_payload():
+            write(chunk)
+        write(CANVAS_TAIL)
+
+    def _stream_documents(
+        self,
+        svg_path: Optional[str],
+        html_path: Optional[str],
+        title: str,
+        check: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """
+        Write the SVG and/or HTML files from one pass over the SVG fragments, recording
+        the "svg" phase (and, when instrumented, the time spent writing as "write").
+        `check` is called before every write and may raise to abandon the render.
+        """
+        probe = self._probe
+        started = probe.start("svg")
+        timer = _WriteTimer() if probe.active else None
+        paths = [path for path in (svg_path, html_path) if path is not None]
+        with ExitStack() as stack:
+
+            def opened(path: str) -> Callable[[str], object]:
+                write = stack.enter_context(open(path, "w", encoding="utf-8")).write
+                if check is not None:
+                    write = _checked(write, check)
+                return write if timer is None else timer.wrap(write)
+
+            svg_write = opened(svg_path) if svg_path is not None else None
+            html_write = opened(html_path) if html_path is not None else None
+            if html_write is not None and self._canvas_viewer():
+                self._write_canvas_html(html_write, title)
+                html_write = None
+            elif html_write is not None:
+                html_write(self._html_head(title))
+            writers = [write for write in (svg_write, html_write) if write is not None]
+            if len(writers) == 1:
+                write = writers[0]
+                for chunk in self._iter_svg():
+                    write(chunk)
+            elif writers:
+                for chunk in self._iter_svg():
+                    for write in writers:
+                        write(chunk)
+            if svg_write is not None:
+                svg_write("\n")
+            if html_write is not None:
+                self._write_clusters(html_write)
+                html_write(_HTML_TAIL)
+            closing = time.perf_counter()
+        closed = time.perf_counter()
+
+        written = sum(os.path.getsize(path) for path in paths)
+        elements = len(self._positions) + len(self._grouped_transitions)
+        if timer is None:
+            probe.finish("svg", started, written, elements)
+            return
+        probe.finish("svg", started, elements=elements, seconds=closing - started - timer.seconds)
+        write_started = probe.start("write", memory=False)
+        probe.finish("write", write_started, written, seconds=timer.seconds + closed - closing, memory=False)
+
+    def _write_clusters(self, write: Callable[[str], object]) -> None:
+        """
+        Append one collapsible <details> section per collapsed component, holding a
+        drawing of the component's own states and edges (opened from its summary node).
+        """
+        if not self.clusters:
+            return
+        config = replace(self.config, trim=False, collapse_threshold=None, hooks=(), profile=False)
+        write('\n<section class="clusters">')
+        for idx, cluster in enumerate(self.clusters):
+            label = html.escape(str(cluster.name))
+            write(
+                f'\n<details class="cluster" id="cluster-{idx}" data-name="{label}">'
+                f"<summary>{label} · {len(cluster.members)} states</summary>\n"
+            )
+            inner = AutomataRenderer(
+                cluster.members, cluster.entry, cluster.accepting, cluster.transitions, config=config
+            )
+            for chunk in inner._iter_svg():
+                write(chunk)
+            write("\n</details>")
+        write("\n</section>")
+        write(_CLUSTER_SCRIPT)
+
+    def _canvas_viewer(self) -> bool:
+        viewer = self.config.html_viewer
+        if viewer not in ("svg", "canvas"):
+            raise ValueError(f"Unsupported html_viewer '{viewer}'. Expected one of svg, canvas.")
+        return viewer == "canvas"
+
+    def _iter_canvas_payload(self) -> Iterator[str]:
+        """
+        Yield the canvas viewer's JSON payload: state names and flat coordinates, accepting
+        state indices, and one [curve, x0, y0, ..., x3, y3, label_x, label_y, label] array per
+        grouped edge, using the same geometry as the SVG output.
+        """
+        positions = self._positions
+        theme = self.config.theme
+        precision = self.config.precision
+
+        def number(value: float) -> str:
+            value = round(value, precision)
+            return str(int(value)) if value == int(value) else repr(value)
+
+        palette = {
+            "background": theme.background_color,
+            "stateFill": theme.state_fill,
+            "stateBorder": theme.state_border,
+            "acceptBorder": theme.accept_state_border,
+            "transition": theme.transition_color,
+            "transitionText": theme.transition_text_color,
+            "stateText": theme.state_text_color,
+            "start": theme.start_indicator_color,
+            "font": theme.font_family,
+        }
+        index = {state: idx for idx, state in enumerate(positions)}
+        start = index.get(self.start_state, -1) if self.start_state is not None else -1
+        palette_json = json.dumps(palette).replace("</", "<\\/")
+        yield f'{{"radius":{self.config.state_radius},"start":{start},"theme":{palette_json},"names":['
+        yield ",".join(json_string(state) for state in positions)
+        yield '],"xy":['
+        yield ",".join(f"{number(x)},{number(y)}" for x, y in positions.values())
+        yield '],"accept":['
+        yield ",".join(str(idx) for state, idx in index.items() if state in self.accept_states)
+        yield '],"edges":['
+        separator = ""
+        for (src, dst), symbols in self._grouped_transitions.items():
+            if src not in positions or dst not in positions:
+                continue
+            command, points, label_pos = self._edge_geometry(src, dst, positions[src], positions[dst])
+            coordinates = ",".join(number(value) for point in points for value in point)
+            yield (
+                f'{separator}[{int(command == "C")},{coordinates},'
+                f'{number(label_pos[0])},{number(label_pos[1])},{json_string(", ".join(symbols))}]'
+            )
+            separator = ","
+        yield "]}"
+
     # Layout -----------------------------------------------------------------
     def _compute_layout(self) -> None:
-        levels: Dict[str, int] = {}
-        adjacency: Dict[str, List[str]] = {}
-        for src, _, dst in self.transitions:
-            adjacency.setdefault(src, []).append(dst)
-
-        if self.start_state and self.start_state in self.states:
-            queue = [self.start_state]
-            levels[self.start_state] = 0
-            while queue:
-                current = queue.pop(0)
-                for nxt in adjacency.get(current, []):
-                    if nxt == current:
-                        continue
-                    tentative = levels[current] + 1
-                    if nxt not in levels or tentative < levels[nxt]:
-                        levels[nxt] = tentative
-                        queue.append(nxt)
-
-        remaining_states = [s for s in self.states if s not in levels]
-        if remaining_states:
-            max_level = max(levels.values(), default=-1)
-            for state in sorted(remaining_states):
-                max_level += 1
-                levels[state] = max_level
-
-        self._levels = levels
-
-        levels_to_states: Dict[int, List[str]] = {}
-        for state, level in levels.items():
-            levels_to_states.setdefault(level, []).append(state)
-
-        for level_states in levels_to_states.values():
-            level_states.sort()
-
-        positions: Dict[str, Tuple[float, float]] = {}
-        for level, level_states in sorted(levels_to_states.items()):
-            for idx, state in enumerate(level_states):
-                x = level * self.config.horizontal_gap
-                y = idx * self.config.vertical_gap
-                positions[state] = (x, y)
-
-        # center positions vertically
-        if positions:
-            ys = [pos[1] for pos in positions.values()]
-            min_y, max_y = min(ys), max(ys)
-            offset = (max_y - min_y) / 2
-            for state, (x, y) in positions.items():
-                positions[state] = (x, y - offset)
-
-        self._positions = positions
+        cache = self.cache
+        if self.config.layout not in ("classic", "layered"):
+            raise ValueError(
+                f"Unsupported layout '{self.config.layout}'. Expected one of classic, layered."
+            )
+        layout_key = (
+            self.config.layout,
+            self.config.horizontal_gap,
+            self.config.vertical_gap,
+            self.config.crossing_sweeps,
+        )
+        if (
+            cache.store is not self.transitions
+            or cache.layout_key != layout_key
+            or cache.start_state != self.start_state
+            # Anything but appends (removals, inserts, replacements) starts over.
+            or self.transitions.rewrites != cache.rewrites
+            or len(self.transitions) < cache.transition_count
+        ):
+            self._full_layout(layout_key)
+        elif (
+            self.version is not None
+            and self.version == cache.version
+            and len(self.states) == len(cache.levels)
+            and len(self.transitions) == cache.transition_count
+        ):
+            cache.record("layout_reused")
+        elif self.config.layout != "classic" or not self._update_layout():
+            # Crossing reduction is global, so the layered engine always starts over.
+            self._full_layout(layout_key)
+
+        cache.version = self.version
+        cache.transition_count = len(self.transitions)
+        cache.rewrites = self.transitions.rewrites
+        self._levels = cache.levels
+        self._positions = cache.positions
+
+    def _full_layout(self, layout_key: Tuple) -> None:
+        cache = self.cache
+        cache.reset_layout()
+        cache.store = self.transitions
+        cache.layout_key = layout_key
+        cache.start_state = self.start_state
+
+        if self.config.layout == "layered":
+            levels, rows, positions = layered_layout(
+                self.states,
+                self.start_state,
+                self.transitions.successors,
+                self.transitions.predecessors,
+                self.config.horizontal_gap,
+                self.config.vertical_gap,
+                sweeps=self.config.crossing_sweeps,
+            )
+            cache.levels = levels
+            cache.level_members = dict(enumerate(rows))
+            cache.positions = positions
+        else:
+            self._classic_layout()
+        for stale in set(cache.state_fragments).difference(cache.levels):
+            del cache.state_fragments[stale]
+        for stale in set(cache.edge_fragments).difference(self.transitions.grouped()):
+            del cache.edge_fragments[stale]
+        cache.record("layout")
+        cache.record("levels", len(cache.level_members))
+
+    def _classic_layout(self) -> None:
+        cache = self.cache
+        reachable: Dict[str, int] = {}
+        if self.start_state and self.start_state in set(self.states):
+            reachable[self.start_state] = 0
+            self._propagate_levels(reachable, deque([self.start_state]))
+        cache.reachable = reachable
+        cache.levels = self._assign_levels(reachable, self.states)
+
+        members: Dict[int, List[str]] = {}
+        for state, level in cache.levels.items():
+            members.setdefault(level, []).append(state)
+        cache.level_members = members
+        for level in members:
+            self._position_level(level)
+
+    def _update_layout(self) -> bool:
+        """
+        Fold states and transitions added since the cached layout into it, repositioning
+        only the levels whose membership changed. Returns False when the change is not
+        purely additive and a full layout is needed.
+        """
+        cache = self.cache
+        state_set = set(self.states)
+        new_states = state_set.difference(cache.levels)
+        if len(cache.levels) + len(new_states) != len(state_set):
+            return False
+
+        reachable = cache.reachable
+        queue: Deque[str] = deque()
+        for src, _, dst in self.transitions[cache.transition_count:]:
+            if src in reachable and dst != src:
+                level = reachable[src] + 1
+                if dst not in reachable or level < reachable[dst]:
+                    reachable[dst] = level
+                    queue.append(dst)
+        self._propagate_levels(reachable, queue)
+
+        old_levels = cache.levels
+        levels = self._assign_levels(reachable, self.states)
+        changed = {state for state, level in levels.items() if old_levels.get(state) != level}
+        affected: Set[int] = set()
+        for state in changed:
+            if state in old_levels:
+                affected.add(old_levels[state])
+            affected.add(levels[state])
+
+        members = cache.level_members
+        for level in affected:
+            kept = [s for s in members.get(level, ()) if s not in changed]
+            kept.extend(s for s in changed if levels[s] == level)
+            if kept:
+                members[level] = kept
+            else:
+                members.pop(level, None)
+        cache.levels = levels
+        for level in affected:
+            if level in members:
+                self._position_level(level)
+        cache.routes_key = None
+        cache.record("layout_incremental")
+        cache.record("levels", len(affected))
+        return True
+
+    def _propagate_levels(self, reachable: Dict[str, int], queue: Deque[str]) -> None:
+        """Breadth-first relaxation of BFS levels from the states in `queue`."""
+        successors = self.transitions.successors
+        while queue:
+            current = queue.popleft()
+            tentative = reachable[current] + 1
+            for nxt in successors(current):
+                if nxt == current:
+                    continue
+                if nxt not in reachable or tentative < reachable[nxt]:
+                    reachable[nxt] = tentative
+                    queue.append(nxt)
+
+    @staticmethod
+    def _assign_levels(reachable: Dict[str, int], states: Iterable[str]) -> Dict[str, int]:
+        levels = dict(reachable)
+        max_level = max(reachable.values(), default=-1)
+        for state in ordered(s for s in states if s not in reachable):
+            max_level += 1
+            levels[state] = max_level
+        return levels
+
+    def _position_level(self, level: int) -> None:
+        cache = self.cache
+        level_states = ordered(cache.level_members[level])
+        cache.level_members[level] = level_states
+        x = level * self.config.horizontal_gap
+        for idx, state in enumerate(level_states):
+            cache.positions[state] = (x, idx * self.config.vertical_gap)
 
     def _group_transitions(self) -> None:
-        grouped: Dict[Tuple[str, str], List[str]] = {}
-        for src, symbol, dst in self.transitions:
-            key = (src, dst)
-            grouped.setdefault(key, []).append(symbol)
-        self._grouped_transitions = grouped
+        # The store maintains the grouping incrementally; no rescan needed.
+        self._grouped_transitions = self.transitions.grouped()
+
+    def _spatial_routing(self) -> bool:
+        routing = self.config.routing
+        if routing not in ("direct", "spatial"):
+            raise ValueError(f"Unsupported routing '{routing}'. Expected one of direct, spatial.")
+        return routing == "spatial"
+
+    def _route_edges(self) -> None:
+        """
+        Route every grouped edge against a spatial index of what is already drawn. Routes
+        belong to the layout: they are kept in the cache for one automaton version, and
+        any layout change (full or incremental) drops them.
+        """
+        cache = self.cache
+        key = (self.config.state_radius, self.version)
+        if self.version is None or cache.routes_key != key:
+            cache.routes = route_edges(
+                self._positions,
+                ((src, dst, ", ".join(symbols)) for (src, dst), symbols in self._grouped_transitions.items()),
+                self._transition_geometry,
+                self.config.state_radius,
+                self._levels,
+            )
+            cache.routes_key = key
+            cache.record("routes", len(cache.routes))
+        self._routes = cache.routes
+
+    def _edge_geometry(
+        self,
+        src: str,
+        dst: str,
+        src_pos: Tuple[float, float],
+        dst_pos: Tuple[float, float],
+    ) -> Tuple[str, Sequence[Tuple[float, float]], Tuple[float, float]]:
+        if self._routes is not None:
+            return self._routes[(src, dst)]
+        return self._transition_geometry(src, dst, src_pos, dst_pos)
 
     # Rendering ---------------------------------------------------------------
     def _render_svg(self, filename: str) -> str:
-        svg_content = self._build_svg()
-        path = f"{filename}.svg"
-        with open(path, "w", encoding="utf-8") as fh:
-            fh.write(svg_content)
-        return path
+        return self.render(filename, ("svg",))["svg"]
 
     def _render_html(self, filename: str) -> str:
-        svg_content = self._build_svg(inline=True)
-        html = f"""<!DOCTYPE html>
+        return self.render(filename, ("html",))["html"]
+
+    def _render_png(self, filename: str) -> str:
+        return self.render(filename, ("png",))["png"]
+
+    def _html_head(self, title: str) -> str:
+        return f"""<!DOCTYPE html>
 <html lang="en">
 <head>
   <meta charset="utf-8">
-  <title>{filename} · Finite Automata</title>
+  <title>{title} · Finite Automata</title>
   <style>
     :root {{
       color-scheme: light dark;
@@ -169,38 +878,25 @@ class AutomataRenderer:
   </style>
 </head>
 <body>
-{svg_content}
-</body>
-</html>
 """
-        path = f"{filename}.html"
-        with open(path, "w", encoding="utf-8") as fh:
-            fh.write(html)
-        return path
-
-    def _render_png(self, filename: str) -> str:
-        try:
-            import cairosvg  # type: ignore
-        except ImportError as exc:
-            raise RuntimeError(
-                "PNG output requires the optional dependency 'cairosvg'. "
-                "Install it via `pip install finiteautomata[cairo]`."
-            ) from exc
-
-        svg_content = self._build_svg(inline=True)
-        png_path = f"{filename}.png"
-        cairosvg.svg2png(bytestring=svg_content.encode("utf-8"), write_to=png_path)
-        return png_path
 
     # Helpers ----------------------------------------------------------------
     def _build_svg(self, inline: bool = False) -> str:
+        svg_output = "".join(self._iter_svg())
+        return svg_output if inline else svg_output + "\n"
+
+    def _iter_svg(self) -> Iterator[str]:
+        """Yield the SVG document piece by piece: header, one element per chunk, footer."""
         if not self._positions:
             canvas_width = canvas_height = 2 * self.config.canvas_padding + self.config.state_radius * 2
+            min_x = center_y = 0.0
         else:
-            xs = [pos[0] for pos in self._positions.values()]
-            ys = [pos[1] for pos in self._positions.values()]
-            min_x, max_x = min(xs), max(xs)
-            min_y, max_y = min(ys), max(ys)
+            positions = self._positions.values()
+            min_x = min(x for x, _ in positions)
+            max_x = max(x for x, _ in positions)
+            min_y = min(y for _, y in positions)
+            max_y = max(y for _, y in positions)
+            center_y = (min_y + max_y) / 2
             canvas_width = (
                 max_x - min_x + 2 * self.config.canvas_padding + self.config.state_radius * 2
             )
@@ -210,95 +906,191 @@ class AutomataRenderer:
 
         view_box = f"0 0 {canvas_width:.2f} {canvas_height:.2f}"
         theme = self.config.theme
+        self._prepare_fragments(theme)
 
-        svg_parts = [
+        yield (
             f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="{view_box}" '
             f'width="{canvas_width:.2f}" height="{canvas_height:.2f}" '
             f'style="background:{theme.background_color}; font-family:{theme.font_family};">'
-        ]
+        )
 
-        origin = (self.config.canvas_padding + self.config.state_radius, canvas_height / 2)
-        position_cache = {
-            state: (
-                origin[0] + (self._positions[state][0] if self._positions else 0),
-                origin[1] + (self._positions[state][1] if self._positions else 0),
-            )
-            for state in self.states
-        }
+        # Fragments use layout coordinates so they stay valid when the canvas grows;
+        # a single group transform places them on the canvas.
+        origin_x = self.config.canvas_padding + self.config.state_radius - min_x
+        origin_y = canvas_height / 2 - center_y
+        yield f'\n<g transform="translate({origin_x:.2f},{origin_y:.2f})">'
+        yield "\n" + (self._compact_defs(theme) if self.config.compact else self._defs(theme))
+        for fragment in self._render_transitions(self._positions, theme):
+            yield "\n" + fragment
+        for fragment in self._render_states(self._positions, theme):
+            yield "\n" + fragment
+        yield "\n</g>\n</svg>"
+
+    def _prepare_fragments(self, theme: RendererTheme) -> None:
+        cache = self.cache
+        config = self.config
+        fragment_key = (astuple(theme), config.state_radius, config.compact, config.precision)
+        limit = cache.max_fragments
+        self._keep_fragments = cache.keep_fragments and (
+            limit is None or len(self._positions) + len(self._grouped_transitions) <= limit
+        )
+        if cache.fragment_key != fragment_key or not self._keep_fragments:
+            cache.fragment_key = fragment_key
+            cache.state_fragments.clear()
+            cache.edge_fragments.clear()
 
-        svg_parts.append(self._render_transitions(position_cache, theme))
-        svg_parts.append(self._render_states(position_cache, theme))
+    def _defs(self, theme: RendererTheme) -> str:
+        return (
+            '<defs>'
+            '<marker id="arrowhead" markerWidth="12" markerHeight="12" refX="10" refY="6" orient="auto">'
+            f'<path d="M 0 0 L 12 6 L 0 12 z" fill="{theme.transition_color}" />'
+            "</marker>"
+            "</defs>"
+        )
 
-        svg_parts.append("</svg>")
-        svg_output = "\n".join(svg_parts)
-        return svg_output if inline else svg_output + "\n"
+    def _compact_defs(self, theme: RendererTheme) -> str:
+        """Theme styling as CSS classes plus the shared state shapes, emitted once per document."""
+        radius = self.config.state_radius
+        return (
+            "<style>"
+            f".s{{fill:{theme.state_fill};stroke:{theme.state_border};stroke-width:2}}"
+            f".r{{fill:none;stroke:{theme.accept_state_border};stroke-width:3}}"
+            f".state text{{fill:{theme.state_text_color};font-size:18px;font-weight:600;"
+            "text-anchor:middle;dominant-baseline:middle}"
+            f".t path{{fill:none;stroke:{theme.transition_color};stroke-width:2.4;"
+            "opacity:.82;marker-end:url(#arrowhead)}"
+            f".t text{{fill:{theme.transition_text_color};font-size:15px;"
+            "text-anchor:middle;dominant-baseline:central}"
+            "</style>"
+            "<defs>"
+            f'<circle id="s" class="s" r="{radius}"/>'
+            f'<g id="a"><use href="#s"/><circle class="r" r="{radius - 6}"/></g>'
+            '<marker id="arrowhead" markerWidth="12" markerHeight="12" refX="10" refY="6" orient="auto">'
+            f'<path d="m0 0 12 6-12 6z" fill="{theme.transition_color}"/>'
+            "</marker>"
+            "</defs>"
+        )
 
     def _render_states(
         self, position_cache: Dict[str, Tuple[float, float]], theme: RendererTheme
-    ) -> str:
-        parts: List[str] = []
-
+    ) -> Iterator[str]:
         if self.start_state and self.start_state in position_cache:
-            sx, sy = position_cache[self.start_state]
-            arrow_x = sx - self.config.state_radius - 48
-            parts.append(
-                f'<g class="start-indicator">'
-                f'<path d="M {arrow_x} {sy} L {arrow_x + 24} {sy - 18} L {arrow_x + 24} {sy + 18} Z" '
-                f'fill="{theme.start_indicator_color}" opacity="0.72"/>'
-                f'<line x1="{arrow_x + 24}" y1="{sy}" x2="{sx - self.config.state_radius}" y2="{sy}" '
-                f'stroke="{theme.start_indicator_color}" stroke-width="3" opacity="0.72"/>'
-                f"</g>"
-            )
+            yield self._start_indicator(position_cache[self.start_state], theme)
 
+        compact = self.config.compact
+        fragments = self.cache.state_fragments
+        keep = self._keep_fragments
+        rendered = 0
         for state, (x, y) in position_cache.items():
             is_accept = state in self.accept_states
-            circle = (
-                f'<g class="state" transform="translate({x},{y})">'
-                f'<circle r="{self.config.state_radius}" fill="{theme.state_fill}" '
-                f'stroke="{theme.state_border}" stroke-width="2" />'
+            key = (x, y, is_accept)
+            cached = fragments.get(state)
+            if cached is not None and cached[0] == key:
+                yield cached[1]
+                continue
+            if compact:
+                circle = self._compact_state(state, x, y, is_accept)
+            else:
+                circle = self._state(state, x, y, is_accept, theme)
+            if keep:
+                fragments[state] = (key, circle)
+            rendered += 1
+            yield circle
+        self.cache.record("states", rendered)
+
+    def _start_indicator(self, position: Tuple[float, float], theme: RendererTheme) -> str:
+        sx, sy = position
+        arrow_x = sx - self.config.state_radius - 48
+        if self.config.compact:
+            fmt = self._number
+            return (
+                f'<g class="start-indicator" fill="{theme.start_indicator_color}" '
+                f'stroke="{theme.start_indicator_color}" opacity="0.72">'
+                f'<path d="M{fmt(arrow_x)} {fmt(sy)}l24-18v36z" stroke="none"/>'
+                f'<path d="M{fmt(arrow_x + 24)} {fmt(sy)}h{fmt(sx - self.config.state_radius - arrow_x - 24)}" '
+                f'stroke-width="3"/>'
+                f"</g>"
             )
-            if is_accept:
-                circle += (
-                    f'<circle r="{self.config.state_radius - 6}" fill="none" '
-                    f'stroke="{theme.accept_state_border}" stroke-width="3" />'
-                )
+        return (
+            f'<g class="start-indicator">'
+            f'<path d="M {arrow_x} {sy} L {arrow_x + 24} {sy - 18} L {arrow_x + 24} {sy + 18} Z" '
+            f'fill="{theme.start_indicator_color}" opacity="0.72"/>'
+            f'<line x1="{arrow_x + 24}" y1="{sy}" x2="{sx - self.config.state_radius}" y2="{sy}" '
+            f'stroke="{theme.start_indicator_color}" stroke-width="3" opacity="0.72"/>'
+            f"</g>"
+        )
+
+    def _state(self, state: str, x: float, y: float, is_accept: bool, theme: RendererTheme) -> str:
+        circle = (
+            f'<g class="state" transform="translate({x},{y})">'
+            f'<circle r="{self.config.state_radius}" fill="{theme.state_fill}" '
+            f'stroke="{theme.state_border}" stroke-width="2" />'
+        )
+        if is_accept:
             circle += (
-                f'<text text-anchor="middle" dominant-baseline="middle" '
-                f'fill="{theme.state_text_color}" font-size="18" font-weight="600">{state}</text>'
-                f"</g>"
+                f'<circle r="{self.config.state_radius - 6}" fill="none" '
+                f'stroke="{theme.accept_state_border}" stroke-width="3" />'
             )
-            parts.append(circle)
-        return "\n".join(parts)
+        circle += (
+            f'<text text-anchor="middle" dominant-baseline="middle" '
+            f'fill="{theme.state_text_color}" font-size="18" font-weight="600">{state}</text>'
+            f"</g>"
+        )
+        return circle
+
+    def _compact_state(self, state: str, x: float, y: float, is_accept: bool) -> str:
+        fmt = self._number
+        shape = "#a" if is_accept else "#s"
+        return (
+            f'<g class="state" transform="translate({fmt(x)} {fmt(y)})">'
+            f'<use href="{shape}"/><text>{state}</text></g>'
+        )
 
     def _render_transitions(
         self, position_cache: Dict[str, Tuple[float, float]], theme: RendererTheme
-    ) -> str:
-        parts: List[str] = []
+    ) -> Iterator[str]:
+        compact = self.config.compact
+        fragments = self.cache.edge_fragments
+        keep = self._keep_fragments
+        rendered = 0
         for (src, dst), symbols in self._grouped_transitions.items():
             if src not in position_cache or dst not in position_cache:
                 continue
             src_pos = position_cache[src]
             dst_pos = position_cache[dst]
-            path_d, label_pos = self._transition_path(src, dst, src_pos, dst_pos)
+            level_diff = self._levels.get(dst, 0) - self._levels.get(src, 0)
+            # Symbol lists only ever grow, so their length identifies the label.
+            if self._routes is not None:
+                key = (self._routes[(src, dst)], len(symbols))
+            else:
+                key = (src_pos, dst_pos, level_diff, len(symbols))
+            cached = fragments.get((src, dst))
+            if cached is not None and cached[0] == key:
+                yield cached[1]
+                continue
+            command, points, label_pos = self._edge_geometry(src, dst, src_pos, dst_pos)
             label = ", ".join(symbols)
-            parts.append(
-                f'<g class="transition">'
-                f'<path d="{path_d}" fill="none" stroke="{theme.transition_color}" '
-                f'stroke-width="2.4" marker-end="url(#arrowhead)" opacity="0.82"/>'
-                f'<text x="{label_pos[0]:.2f}" y="{label_pos[1]:.2f}" '
-                f'fill="{theme.transition_text_color}" font-size="15" '
-                f'text-anchor="middle" dominant-baseline="central">{label}</text>'
-                f"</g>"
-            )
-
-        marker = (
-            '<defs>'
-            '<marker id="arrowhead" markerWidth="12" markerHeight="12" refX="10" refY="6" orient="auto">'
-            f'<path d="M 0 0 L 12 6 L 0 12 z" fill="{theme.transition_color}" />'
-            "</marker>"
-            "</defs>"
-        )
-        return marker + "\n" + "\n".join(parts)
+            if compact:
+                fmt = self._number
+                fragment = (
+                    f'<g class="t"><path d="{self._relative_path(command, points)}"/>'
+                    f'<text x="{fmt(label_pos[0])}" y="{fmt(label_pos[1])}">{label}</text></g>'
+                )
+            else:
+                fragment = (
+                    f'<g class="transition">'
+                    f'<path d="{_absolute_path(command, points)}" fill="none" stroke="{theme.transition_color}" '
+                    f'stroke-width="2.4" marker-end="url(#arrowhead)" opacity="0.82"/>'
+                    f'<text x="{label_pos[0]:.2f}" y="{label_pos[1]:.2f}" '
+                    f'fill="{theme.transition_text_color}" font-size="15" '
+                    f'text-anchor="middle" dominant-baseline="central">{label}</text>'
+                    f"</g>"
+                )
+            if keep:
+                fragments[(src, dst)] = (key, fragment)
+            rendered += 1
+            yield fragment
+        self.cache.record("edges", rendered)
 
     def _transition_path(
         self,
@@ -307,19 +1099,33 @@ class AutomataRenderer:
         src_pos: Tuple[float, float],
         dst_pos: Tuple[float, float],
     ) -> Tuple[str, Tuple[float, float]]:
+        command, points, label_pos = self._edge_geometry(src, dst, src_pos, dst_pos)
+        return _absolute_path(command, points), label_pos
+
+    def _transition_geometry(
+        self,
+        src: str,
+        dst: str,
+        src_pos: Tuple[float, float],
+        dst_pos: Tuple[float, float],
+    ) -> Tuple[str, List[Tuple[float, float]], Tuple[float, float]]:
+        """
+        Return (command, points, label_pos) for an edge: "C" with the start point and
+        three cubic Bezier points for self-loops, "L" with four polyline points otherwise.
+        """
         radius = self.config.state_radius
         if src == dst:
             start_x, start_y = src_pos
             loop_radius = radius * 1.2
             top_y = start_y - radius * 2.1
-            path = (
-                f"M {start_x + radius * 0.3:.2f} {start_y - radius:.2f} "
-                f"C {start_x + loop_radius:.2f} {top_y:.2f} "
-                f"{start_x - loop_radius:.2f} {top_y:.2f} "
-                f"{start_x - radius * 0.3:.2f} {start_y - radius:.2f}"
-            )
+            points = [
+                (start_x + radius * 0.3, start_y - radius),
+                (start_x + loop_radius, top_y),
+                (start_x - loop_radius, top_y),
+                (start_x - radius * 0.3, start_y - radius),
+            ]
             label_pos = (start_x, top_y - 14)
-            return path, label_pos
+            return "C", points, label_pos
 
         sx, sy = src_pos
         dx, dy = dst_pos
@@ -337,14 +1143,48 @@ class AutomataRenderer:
         mid_x = (start_point[0] + end_point[0]) / 2 + direction * radius * 0.6
         bend_y = dy + vertical_offset
 
-        path = (
-            f"M {start_point[0]:.2f} {start_point[1]:.2f} "
-            f"L {mid_x:.2f} {start_point[1]:.2f} "
-            f"L {mid_x:.2f} {bend_y:.2f} "
-            f"L {end_point[0]:.2f} {end_point[1]:.2f}"
-        )
+        points = [start_point, (mid_x, start_point[1]), (mid_x, bend_y), end_point]
         label_pos = ((start_point[0] + end_point[0]) / 2, (start_point[1] + bend_y) / 2 - 12)
-        return path, label_pos
+        return "L", points, label_pos
+
+    def _number(self, value: float) -> str:
+        return _format_number(value, self.config.precision)
+
+    def _relative_path(self, command: str, points: List[Tuple[float, float]]) -> str:
+        """Shortest relative path data for the points, using h/v for axis-aligned segments."""
+        fmt = self._number
+        precision = self.config.precision
+        # Deltas between rounded points, so rounding errors do not accumulate along the path.
+        points = [(round(px, precision), round(py, precision)) for px, py in points]
+        (x, y), rest = points[0], points[1:]
+        parts = ["M", _join_numbers([fmt(x), fmt(y)])]
+        if command == "C":
+            parts.append("c")
+            parts.append(_join_numbers([fmt(value) for px, py in rest for value in (px - x, py - y)]))
+            return "".join(parts)
+        for px, py in rest:
+            ddx, ddy = fmt(px - x), fmt(py - y)
+            if ddx == ddy == "0":
+                continue
+            if ddy == "0":
+                parts.append("h" + ddx)
+            elif ddx == "0":
+                parts.append("v" + ddy)
+            else:
+                parts.append("l" + _join_numbers([ddx, ddy]))
+            x, y = px, py
+        return "".join(parts)
+
+    def _open_when_done(self, futures: Dict[str, "Future[str]"], filename: str) -> None:
+        preference = next((fmt for fmt in ("html", "svg", "png") if fmt in futures), None)
+        if preference is None:
+            return
+
+        def open_target(done: "Future[str]") -> None:
+            if done.exception() is None:
+                self._open({preference: done.result()}, filename)
+
+        futures[preference].add_done_callback(open_target)
 
     def _open(self, outputs: Dict[str, str], filename: str) -> None:
         open_target = None
@@ -0,0 +1,195 @@
+"""
+Edge routing against a spatial index.
+
+The default renderer draws every grouped edge on its own, with fixed bend offsets and
+a fixed label position, so dense machines pile edges and labels on top of each other.
+`route_edges` places edges one at a time into uniform grids holding what is drawn so
+far (state circles, bends and self-loops, label boxes) and uses them to pick a free
+bend lane for each edge and to nudge its label into a free spot.
+
+Every placement tries a fixed number of candidates and each candidate probes a
+bounded number of grid cells, so routing is linear in the number of edges for a
+fixed local density. Long vertical runs are only indexed and probed near their two
+corners, where edges fan in and out; overlaps along the middle of a long run are
+tolerated rather than paid for.
+"""
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+Point = Tuple[float, float]
+Box = Tuple[float, float, float, float]  # (x0, y0, x1, y1)
+Geometry = Tuple[str, Tuple[Point, ...], Point]  # (command, points, label position)
+
+# Cells indexed or probed at each end of a long box, along its long axis.
+MAX_END_CELLS = 4
+# Candidate lane offsets, in lane steps, tried in order.
+LANES = (0, 1, -1, 2, -2, 3, -3)
+LABEL_SHIFTS = ((0, 0), (0, -1), (0, 1), (0, -2), (0, 2), (1, 0), (-1, 0), (1, -1), (-1, -1))
+STROKE = 2.0
+LABEL_CHAR_WIDTH = 8.5  # average advance of the 15px label font
+LABEL_HEIGHT = 18.0
+
+
+class SpatialGrid:
+    """
+    A uniform-grid spatial hash of axis-aligned boxes. Each box carries an owner, so a
+    query can ignore, e.g., the circles an edge starts and ends at.
+    """
+
+    __slots__ = ("cell", "_cells", "_boxes")
+
+    def __init__(self, cell_size: float):
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive.")
+        self.cell = float(cell_size)
+        self._cells: Dict[Tuple[int, int], List[int]] = {}
+        self._boxes: List[Tuple[Box, Hashable]] = []
+
+    def __len__(self) -> int:
+        return len(self._boxes)
+
+    def _keys(self, box: Box) -> Iterable[Tuple[int, int]]:
+        cell = self.cell
+        x0, x1 = int(box[0] // cell), int(box[2] // cell)
+        y0, y1 = int(box[1] // cell), int(box[3] // cell)
+        if x0 == x1 and y0 == y1:
+            return ((x0, y0),)
+        xs = range(x0, x1 + 1) if x1 - x0 < 2 * MAX_END_CELLS else _ends(x0, x1)
+        ys = range(y0, y1 + 1) if y1 - y0 < 2 * MAX_END_CELLS else _ends(y0, y1)
+        return [(cx, cy) for cx in xs for cy in ys]
+
+    def insert(self, box: Box, owner: Hashable = None) -> None:
+        idx = len(self._boxes)
+        self._boxes.append((box, owner))
+        cells = self._cells
+        for key in self._keys(box):
+            bucket = cells.get(key)
+            if bucket is None:
+                cells[key] = [idx]
+            else:
+                bucket.append(idx)
+
+    def hits(self, box: Box, ignore: Sequence[Hashable] = ()) -> bool:
+        """True when `box` overlaps a stored box whose owner is not in `ignore`."""
+        cells = self._cells
+        boxes = self._boxes
+        x0, y0, x1, y1 = box
+        for key in self._keys(box):
+            # A box spanning several cells may be tested more than once; that is cheaper
+            # than tracking which boxes were already seen.
+            for idx in cells.get(key, ()):
+                (bx0, by0, bx1, by1), owner = boxes[idx]
+                if bx0 < x1 and x0 < bx1 and by0 < y1 and y0 < by1 and owner not in ignore:
+                    return True
+        return False
+
+
+def _ends(low: int, high: int) -> List[int]:
+    return [*range(low, low + MAX_END_CELLS), *range(high - MAX_END_CELLS + 1, high + 1)]
+
+
+def _segment_box(a: Point, b: Point) -> Box:
+    return (
+        min(a[0], b[0]) - STROKE,
+        min(a[1], b[1]) - STROKE,
+        max(a[0], b[0]) + STROKE,
+        max(a[1], b[1]) + STROKE,
+    )
+
+
+def _label_box(position: Point, label: str) -> Box:
+    half_width = (len(label) * LABEL_CHAR_WIDTH + 6) / 2
+    half_height = LABEL_HEIGHT / 2
+    return (position[0] - half_width, position[1] - half_height, position[0] + half_width, position[1] + half_height)
+
+
+def _shifted(command: str, points: Tuple[Point, ...], lane_x: float, lane_y: float) -> Tuple[Point, ...]:
+    if command != "L" or (lane_x == 0 and lane_y == 0):
+        return points
+    start, bend_in, bend_out, end = points
+    return (
+        start,
+        (bend_in[0] + lane_x, bend_in[1]),
+        (bend_out[0] + lane_x, bend_out[1] + lane_y),
+        end,
+    )
+
+
+def _hull(points: Sequence[Point]) -> Box:
+    # A self-loop stays within the hull of its control points.
+    xs = [x for x, _ in points]
+    ys = [y for _, y in points]
+    return (min(xs), min(ys), max(xs), max(ys))
+
+
+def route_edges(
+    positions: Dict[Hashable, Point],
+    edges: Iterable[Tuple[Hashable, Hashable, str]],
+    geometry: Callable[[Hashable, Hashable, Point, Point], Tuple[str, List[Point], Point]],
+    radius: float,
+    levels: Optional[Dict[Hashable, int]] = None,
+) -> Dict[Tuple[Hashable, Hashable], Geometry]:
+    """
+    Route `edges` (src, dst, label) between the states at `positions`.
+
+    `geometry(src, dst, src_pos, dst_pos)` gives each edge's default route: a cubic
+    self-loop ("C") or a four-point orthogonal polyline ("L") whose two middle points
+    form the bend. Polylines are moved sideways by whole lanes (and same-level ones
+    also vertically) until the bend clears the states, bends and self-loops already
+    placed. The horizontal runs in and out of a bend are not indexed: every edge
+    leaving a state shares them near the circle, so they would block every lane.
+    Labels then move to the first candidate spot clear of states and other labels.
+    When every candidate is taken, the default placement is kept.
+    """
+    levels = levels or {}
+    lane = radius * 0.4
+    # One grid per kind, so label probes never scan the (far more numerous) bends.
+    states, bends, labels = (SpatialGrid(radius * 2) for _ in range(3))
+    for state, (x, y) in positions.items():
+        states.insert((x - radius, y - radius, x + radius, y + radius), state)
+
+    routes: Dict[Tuple[Hashable, Hashable], Geometry] = {}
+    for src, dst, label in edges:
+        if src not in positions or dst not in positions:
+            continue
+        key = (src, dst)
+        command, base, label_pos = geometry(src, dst, positions[src], positions[dst])
+        base = tuple(base)
+        points = base
+        shift_y = 0.0
+        if command == "L":
+            same_level = levels.get(src, 0) == levels.get(dst, 0)
+            away = -1 if base[2][1] < base[0][1] else 1
+            for step in LANES:
+                lane_y = away * abs(step) * lane if same_level else 0.0
+                candidate = _shifted(command, base, step * lane, lane_y)
+                bend = _segment_box(candidate[1], candidate[2])
+                if not bends.hits(bend) and not states.hits(bend, (src, dst)):
+                    points, shift_y = candidate, lane_y
+                    break
+            bends.insert(_segment_box(points[1], points[2]), key)
+        else:
+            bends.insert(_hull(points), key)
+
+        label_x, label_y = label_pos[0], label_pos[1] + shift_y
+        width = len(label) * LABEL_CHAR_WIDTH + 6
+        placed = (label_x, label_y)
+        for step_x, step_y in LABEL_SHIFTS:
+            candidate_pos = (label_x + step_x * width, label_y + step_y * LABEL_HEIGHT)
+            box = _label_box(candidate_pos, label)
+            if not labels.hits(box) and not states.hits(box):
+                placed = candidate_pos
+                break
+        labels.insert(_label_box(placed, label), key)
+        routes[key] = (command, points, placed)
+    return routes
+
+
+def label_overlaps(labels: Iterable[Tuple[Point, str]], cell_size: float) -> int:
+    """Count the (position, text) labels overlapping an earlier one; O(n) for bounded density."""
+    grid = SpatialGrid(cell_size)
+    overlaps = 0
+    for position, label in labels:
+        box = _label_box(position, label)
+        overlaps += grid.hits(box)
+        grid.insert(box)
+    return overlaps
@@ -0,0 +1,479 @@
+"""
+Saving and loading automata.
+
+Two formats are supported:
+
+- JSON: a stable, human-readable interchange format
+  ({"format": "finiteautomata", "version": 1, "states", "start", "accept", "transitions"}).
+  Names are JSON scalars; tuple and frozenset names (e.g. product states) are written as
+  {"tuple": [...]} and {"frozenset": [...]} so they load back as the same values.
+- Binary: interned string tables plus fixed-width little-endian integer arrays, laid out
+  so AutomatonImage can memory-map the file and answer queries without parsing records.
+
+Binary layout (every section starts on an 8-byte boundary):
+
+    header    "<4sHHIIQi4x": magic b"FAUT", version, flags, states, symbols,
+              transitions, start id (-1 when unset)
+    sections  8 x (offset, length) as "<QQ", in this order:
+              state offsets (Q, states + 1), state names (UTF-8),
+              symbol offsets (Q, symbols + 1), symbol names (UTF-8),
+              accept flags (B, one per state), row starts (Q, states + 1),
+              transition symbols (I), transition targets (I)
+
+Transitions are sorted by (source, symbol, target) and grouped per source state through
+the row-start array, CSR style. State 0 is the start state when there is one.
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    FrozenSet,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+from .engine import EPSILON, CompiledDFA, intern_states, ordered
+from .transitions import Transition, TransitionStore
+
+if TYPE_CHECKING:
+    from .core import FiniteAutomata
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+MAGIC = b"FAUT"
+BINARY_VERSION = 1
+JSON_VERSION = 1
+
+_HEADER = struct.Struct("<4sHHIIQi4x")
+_SECTION = struct.Struct("<QQ")
+_SECTIONS = 8
+_DATA_START = _HEADER.size + _SECTIONS * _SECTION.size
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+# JSON -------------------------------------------------------------------------
+def _encode_name(name: Hashable) -> object:
+    if name is None or isinstance(name, (str, int, float)):
+        return name
+    if isinstance(name, tuple):
+        return {"tuple": [_encode_name(item) for item in name]}
+    if isinstance(name, frozenset):
+        return {"frozenset": [_encode_name(item) for item in ordered(name)]}
+    raise TypeError(
+        f"The JSON format stores names as strings, numbers, tuples or frozensets; got {name!r}."
+    )
+
+
+def _decode_name(value: object) -> Hashable:
+    if isinstance(value, dict):
+        if len(value) == 1:
+            kind, items = next(iter(value.items()))
+            if kind == "tuple":
+                return tuple(_decode_name(item) for item in items)
+            if kind == "frozenset":
+                return frozenset(_decode_name(item) for item in items)
+        raise ValueError(f"Unsupported name encoding {value!r}.")
+    if isinstance(value, list):
+        raise ValueError(f"Unsupported name encoding {value!r}.")
+    return value
+
+
+def save_json(fsm: "FiniteAutomata", path: PathLike) -> None:
+    states, _ = intern_states(fsm.states, fsm.start_state)
+    document = {
+        "format": "finiteautomata",
+        "version": JSON_VERSION,
+        "states": [_encode_name(state) for state in states],
+        "start": _encode_name(fsm.start_state),
+        "accept": [_encode_name(state) for state in ordered(fsm.accept_states)],
+        "transitions": [[_encode_name(item) for item in transition] for transition in fsm.transitions],
+    }
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(document, fh, ensure_ascii=False, separators=(",", ":"))
+        fh.write("\n")
+
+
+def load_json(path: PathLike, cls: Optional[type] = None) -> "FiniteAutomata":
+    with open(path, encoding="utf-8") as fh:
+        document = json.load(fh)
+    if document.get("format") != "finiteautomata":
+        raise ValueError(f"{path} is not a finiteautomata JSON document.")
+    if document.get("version") != JSON_VERSION:
+        raise ValueError(f"Unsupported finiteautomata JSON version {document.get('version')!r}.")
+    transitions = TransitionStore(
+        tuple(_decode_name(item) for item in transition) for transition in document["transitions"]
+    )
+    return _assemble(
+        cls,
+        [_decode_name(state) for state in document["states"]],
+        _decode_name(document["start"]),
+        [_decode_name(state) for state in document["accept"]],
+        transitions,
+    )
+
+
+# Binary -----------------------------------------------------------------------
+def _string_table(names: Sequence[str], kind: str) -> Tuple[array, bytes]:
+    offsets = array("Q", [0])
+    blob = bytearray()
+    for name in names:
+        if not isinstance(name, str):
+            raise TypeError(
+                f"The binary format stores {kind} names as strings; got {name!r}. "
+                "Use the JSON format for other name types."
+            )
+        blob += name.encode("utf-8")
+        offsets.append(len(blob))
+    return offsets, bytes(blob)
+
+
+def _little_endian(values: array) -> bytes:
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def save_binary(fsm: "FiniteAutomata", path: PathLike) -> None:
+    states, state_index = intern_states(fsm.states, fsm.start_state)
+    symbols = tuple(ordered({symbol for _, symbol, _ in fsm.transitions}))
+    symbol_index = {symbol: idx for idx, symbol in enumerate(symbols)}
+
+    edges = sorted(
+        (state_index[src], symbol_index[symbol], state_index[dst])
+        for src, symbol, dst in fsm.transitions
+    )
+    row_start = array("Q", [0] * (len(states) + 1))
+    for src, _, _ in edges:
+        row_start[src + 1] += 1
+    for idx in range(len(states)):
+        row_start[idx + 1] += row_start[idx]
+    labels = array("I", (symbol for _, symbol, _ in edges))
+    targets = array("I", (dst for _, _, dst in edges))
+
+    state_offsets, state_blob = _string_table(states, "state")
+    symbol_offsets, symbol_blob = _string_table(symbols, "symbol")
+    accepting = bytes(name in fsm.accept_states for name in states)
+    sections = [
+        _little_endian(state_offsets),
+        state_blob,
+        _little_endian(symbol_offsets),
+        symbol_blob,
+        accepting,
+        _little_endian(row_start),
+        _little_endian(labels),
+        _little_endian(targets),
+    ]
+
+    start = 0 if fsm.start_state is not None else -1
+    header = _HEADER.pack(MAGIC, BINARY_VERSION, 0, len(states), len(symbols), len(edges), start)
+    table = []
+    offset = _DATA_START
+    for data in sections:
+        offset = _align(offset)
+        table.append(_SECTION.pack(offset, len(data)))
+        offset += len(data)
+
+    with open(path, "wb") as fh:
+        fh.write(header)
+        fh.write(b"".join(table))
+        position = _DATA_START
+        for data in sections:
+            padding = _align(position) - position
+            fh.write(b"\0" * padding)
+            fh.write(data)
+            position += padding + len(data)
+
+
+class StringTable(Sequence[str]):
+    """Names stored in an AutomatonImage, decoded on access."""
+
+    def __init__(self, offsets: Sequence[int], blob: memoryview):
+        self._offsets = offsets
+        self._blob = blob
+        self._index: Optional[Dict[str, int]] = None
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError("string table index out of range")
+        return str(self._blob[self._offsets[idx]:self._offsets[idx + 1]], "utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        offsets, blob = self._offsets, self._blob
+        for idx in range(len(self)):
+            yield str(blob[offsets[idx]:offsets[idx + 1]], "utf-8")
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._lookup()
+
+    def index(self, name, start: int = 0, stop: Optional[int] = None) -> int:
+        """Id of `name`; the first call builds a name -> id dictionary."""
+        idx = self._lookup().get(name)
+        if idx is None or idx < start or (stop is not None and idx >= stop):
+            raise ValueError(f"{name!r} is not in the table")
+        return idx
+
+    def _lookup(self) -> Dict[str, int]:
+        if self._index is None:
+            self._index = {name: idx for idx, name in enumerate(self.decode_all())}
+        return self._index
+
+    def decode_all(self) -> List[str]:
+        """Every name at once; ASCII tables are decoded in one call and sliced."""
+        offsets = self._offsets
+        text = str(self._blob, "utf-8")
+        if len(text) != len(self._blob):
+            return list(self)
+        return [text[offsets[idx]:offsets[idx + 1]] for idx in range(len(self))]
+
+    def release(self) -> None:
+        self._blob = memoryview(b"")
+        self._offsets = (0,)
+
+
+class AutomatonImage:
+    """
+    Read-only, memory-mapped view of an automaton saved in the binary format.
+
+    Opening only reads the header; names are decoded on access and transitions are read
+    straight from the mapped arrays, so queries work immediately whatever the size.
+    accepts() / run() simulate the automaton (nondeterminism and EPSILON included) from the
+    mapped data; to_automaton() and compile() materialize it when needed.
+    """
+
+    def __init__(self, path: PathLike):
+        with open(path, "rb") as fh:
+            self._mmap = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        self._views: List[memoryview] = []
+        try:
+            self._parse()
+        except Exception:
+            self.close()
+            raise
+
+    @classmethod
+    def open(cls, path: PathLike) -> "AutomatonImage":
+        return cls(path)
+
+    def _parse(self) -> None:
+        buffer = self._mmap
+        if len(buffer) < _DATA_START:
+            raise ValueError("File is too short to be a finiteautomata binary image.")
+        magic, version, _, states, symbols, transitions, start = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a finiteautomata binary image.")
+        if version != BINARY_VERSION:
+            raise ValueError(f"Unsupported finiteautomata binary version {version}.")
+        sections = [
+            _SECTION.unpack_from(buffer, _HEADER.size + idx * _SECTION.size) for idx in range(_SECTIONS)
+        ]
+        for offset, length in sections:
+            if offset + length > len(buffer):
+                raise ValueError("Truncated finiteautomata binary image.")
+        (state_offsets, state_blob, symbol_offsets, symbol_blob,
+         accepting, row_start, labels, targets) = sections
+
+        self.start = start
+        self.states = StringTable(self._array(state_offsets, "Q"), self._bytes(state_blob))
+        self.symbols = StringTable(self._array(symbol_offsets, "Q"), self._bytes(symbol_blob))
+        self.accepting = self._bytes(accepting)
+        self.row_start = self._array(row_start, "Q")
+        self.labels = self._array(labels, "I")
+        self.targets = self._array(targets, "I")
+        if (
+            len(self.states) != states
+            or len(self.symbols) != symbols
+            or len(self.accepting) != states
+            or len(self.row_start) != states + 1
+            or len(self.labels) != transitions
+            or len(self.targets) != transitions
+        ):
+            raise ValueError("Corrupt finiteautomata binary image: section sizes disagree.")
+        self._symbol_index = {name: idx for idx, name in enumerate(self.symbols)}
+        self._epsilon = self._symbol_index.get(EPSILON)
+
+    def _bytes(self, section: Tuple[int, int]) -> memoryview:
+        offset, length = section
+        view = memoryview(self._mmap)[offset:offset + length]
+        self._views.append(view)
+        return view
+
+    def _array(self, section: Tuple[int, int], typecode: str):
+        view = self._bytes(section)
+        if sys.byteorder == "little":
+            cast = view.cast(typecode)
+            self._views.append(cast)
+            return cast
+        values = array(typecode, view.tobytes())
+        values.byteswap()
+        return values
+
+    # Lifetime -----------------------------------------------------------------
+    def close(self) -> None:
+        for table in ("states", "symbols"):
+            if hasattr(self, table):
+                getattr(self, table).release()
+        for view in reversed(self._views):
+            view.release()
+        self._views.clear()
+        self._mmap.close()
+
+    def __enter__(self) -> "AutomatonImage":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def __repr__(self) -> str:
+        return f"<AutomatonImage states={len(self.states)} symbols={len(self.symbols)} transitions={len(self)}>"
+
+    # Queries ------------------------------------------------------------------
+    @property
+    def start_state(self) -> Optional[str]:
+        return self.states[self.start] if self.start >= 0 else None
+
+    def targets_on(self, state: int, symbol: int) -> Iterator[int]:
+        """Target ids of the transitions from state id `state` on symbol id `symbol`."""
+        labels, targets = self.labels, self.targets
+        hi = self.row_start[state + 1]
+        idx = bisect_left(labels, symbol, self.row_start[state], hi)
+        while idx < hi and labels[idx] == symbol:
+            yield targets[idx]
+            idx += 1
+
+    def _closure(self, subset: Set[int]) -> Set[int]:
+        if self._epsilon is None:
+            return subset
+        stack = list(subset)
+        while stack:
+            for target in self.targets_on(stack.pop(), self._epsilon):
+                if target not in subset:
+                    subset.add(target)
+                    stack.append(target)
+        return subset
+
+    def run_ids(self, word: Iterable[str]) -> FrozenSet[int]:
+        """Ids of the states active after reading `word`."""
+        if self.start < 0:
+            return frozenset()
+        current = self._closure({self.start})
+        symbol_index = self._symbol_index
+        for symbol in word:
+            column = symbol_index.get(symbol)
+            if column is None or column == self._epsilon:
+                return frozenset()
+            current = self._closure({t for s in current for t in self.targets_on(s, column)})
+            if not current:
+                break
+        return frozenset(current)
+
+    def run(self, word: Iterable[str]) -> FrozenSet[str]:
+        return frozenset(self.states[idx] for idx in self.run_ids(word))
+
+    def accepts(self, word: Iterable[str]) -> bool:
+        accepting = self.accepting
+        return any(accepting[idx] for idx in self.run_ids(word))
+
+    def transitions(self) -> Iterator[Transition]:
+        states, symbols = self.states.decode_all(), self.symbols.decode_all()
+        row_start, labels, targets = self.row_start, self.labels, self.targets
+        for src in range(len(states)):
+            name = states[src]
+            for idx in range(row_start[src], row_start[src + 1]):
+                yield name, symbols[labels[idx]], states[targets[idx]]
+
+    # Materialization --------------------------------------------------------------
+    def to_automaton(self, cls: Optional[type] = None) -> "FiniteAutomata":
+        states = self.states.decode_all()
+        accept = [name for name, flag in zip(states, self.accepting) if flag]
+        return _assemble(cls, states, self.start_state, accept, TransitionStore.from_unique(self.transitions()))
+
+    def compile(self) -> CompiledDFA:
+        """Build a CompiledDFA straight from the integer arrays, without name lookups."""
+        if self.start < 0:
+            raise ValueError("Cannot compile an automaton without a start state.")
+        if self._epsilon is not None:
+            raise ValueError("Epsilon transitions make the automaton nondeterministic.")
+        states = self.states.decode_all()
+        dead = len(states)
+        width = len(self.symbols) + 1
+        row_start, labels, targets = self.row_start, self.labels, self.targets
+        rows = []
+        for src in range(dead):
+            row = [dead] * width
+            for idx in range(row_start[src], row_start[src + 1]):
+                column = labels[idx]
+                if row[column] != dead:
+                    raise ValueError(
+                        f"State '{states[src]}' has several transitions on '{self.symbols[column]}'; "
+                        "the automaton is not deterministic."
+                    )
+                row[column] = targets[idx]
+            rows.append(row)
+        rows.append([dead] * width)
+        return CompiledDFA(states, list(self.symbols), rows, list(map(bool, self.accepting)))
+
+
+def load_binary(path: PathLike, cls: Optional[type] = None) -> "FiniteAutomata":
+    with AutomatonImage(path) as image:
+        return image.to_automaton(cls)
+
+
+# Dispatch ---------------------------------------------------------------------
+def _assemble(
+    cls: Optional[type],
+    states: Iterable[Hashable],
+    start: Optional[Hashable],
+    accept: Iterable[Hashable],
+    transitions: Iterable[Transition],
+) -> "FiniteAutomata":
+    if cls is None:
+        from .core import FiniteAutomata
+
+        cls = FiniteAutomata
+    fsm = cls()
+    fsm.states = set(states)
+    fsm.start_state = start
+    fsm.accept_states = set(accept)
+    fsm.transitions = transitions
+    return fsm
+
+
+def detect_format(path: PathLike) -> str:
+    with open(path, "rb") as fh:
+        return "binary" if fh.read(len(MAGIC)) == MAGIC else "json"
+
+
+def format_for(path: PathLike, format: Optional[str]) -> str:
+    if format is None:
+        return "json" if os.fspath(path).lower().endswith(".json") else "binary"
+    fmt = format.lower()
+    if fmt not in ("json", "binary"):
+        raise ValueError(f"Unsupported serialization format '{format}'. Expected one of json, binary.")
+    return fmt
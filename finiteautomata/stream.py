@@ -0,0 +1,163 @@
+import mmap
+import os
+import re
+from typing import Hashable, Iterator, List, NamedTuple, Optional, Pattern, Union
+
+from .lazy import LazyDFA
+from .nfa import iter_bits
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+BytesLike = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+
+class Match(NamedTuple):
+    """An accepting state reached after consuming the byte just before `offset`."""
+
+    offset: int
+    state: Hashable
+
+
+def byte_columns(automaton: LazyDFA) -> List[int]:
+    """
+    Map every byte value to a symbol column.
+    Single-character str symbols are matched by code point (latin-1) and single-byte
+    bytes symbols by value; every other byte maps to the unknown column.
+    """
+    alphabet = automaton.nfa.alphabet
+    columns = [alphabet.unknown] * 256
+    for column, symbol in enumerate(alphabet.symbols):
+        if isinstance(symbol, str) and len(symbol) == 1 and ord(symbol) < 256:
+            columns[ord(symbol)] = column
+        elif isinstance(symbol, bytes) and len(symbol) == 1:
+            columns[symbol[0]] = column
+    return columns
+
+
+def _wake_pattern(automaton: LazyDFA, columns: List[int]) -> Optional[Pattern]:
+    """
+    For unanchored search, compile a byte class matching every byte that can move the
+    automaton out of its idle (start) state, so idle stretches are skipped at C speed.
+    """
+    idle = automaton.initial
+    if not automaton.unanchored or idle & automaton.nfa.accept_mask:
+        return None
+    leaving = {column for column in set(columns) if automaton.next(idle, column) != idle}
+    wake = bytes(byte for byte in range(256) if columns[byte] in leaving)
+    if len(wake) == 256:
+        return None
+    if not wake:
+        return re.compile(b"(?!)")
+    return re.compile(b"[" + b"".join(re.escape(bytes((byte,))) for byte in wake) + b"]")
+
+
+class StreamMatcher:
+    """
+    Incremental byte scanner that carries automaton state across chunk boundaries.
+
+    feed() accepts any bytes-like object (bytes, bytearray, memoryview, mmap) and
+    yields a Match every time an accepting state is active after a byte; offsets are
+    absolute positions in the overall stream. With an unanchored LazyDFA, matches may
+    start anywhere; otherwise the whole stream is one anchored run and scanning stops
+    once no run is alive.
+    """
+
+    def __init__(self, automaton: LazyDFA):
+        self.automaton = automaton
+        self._columns = byte_columns(automaton)
+        self._wake = _wake_pattern(automaton, self._columns)
+        self.reset()
+
+    def reset(self) -> None:
+        self.offset = 0
+        self.subset = self.automaton.initial
+
+    @property
+    def alive(self) -> bool:
+        return bool(self.subset)
+
+    def feed(self, chunk: BytesLike) -> Iterator[Match]:
+        """Scan `chunk` (without copying it) and yield the matches it completes."""
+        view = memoryview(chunk)
+        if view.format != "B" or view.ndim != 1:
+            view = view.cast("B")
+        automaton = self.automaton
+        step = automaton.next
+        columns = self._columns
+        accept_mask = automaton.nfa.accept_mask
+        states = automaton.nfa.states
+        wake = self._wake
+        idle = automaton.initial
+        subset = self.subset
+        start = self.offset
+        position, size = 0, len(view)
+        try:
+            while position < size and subset:
+                if wake is not None and subset == idle:
+                    found = wake.search(view, position)
+                    if found is None:
+                        position = size
+                        break
+                    position = found.start()
+                subset = step(subset, columns[view[position]])
+                position += 1
+                accepted = subset & accept_mask
+                if accepted:
+                    for idx in iter_bits(accepted):
+                        yield Match(start + position, states[idx])
+        finally:
+            self.subset = subset
+            # A dead anchored run consumes the rest of the chunk without looking at it.
+            self.offset = start + (position if subset else size)
+            view.release()
+
+    def scan(self, source, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Match]:
+        """
+        Scan a whole source: a file path, a binary file object, or a bytes-like buffer.
+        Files are memory-mapped when possible and otherwise read in `chunk_size` blocks
+        into one reused buffer.
+        """
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, "rb") as fh:
+                yield from self._scan_file(fh, chunk_size)
+        elif hasattr(source, "readinto") or hasattr(source, "read"):
+            yield from self._scan_file(source, chunk_size)
+        else:
+            yield from self.feed(source)
+
+    def _scan_file(self, fh, chunk_size: int) -> Iterator[Match]:
+        mapped = _try_mmap(fh)
+        if mapped is not None:
+            with mapped:
+                view = memoryview(mapped)
+                try:
+                    yield from self.feed(view)
+                finally:
+                    view.release()
+            return
+
+        if not hasattr(fh, "readinto"):
+            while True:
+                data = fh.read(chunk_size)
+                if not data:
+                    return
+                yield from self.feed(data)
+
+        buffer = bytearray(chunk_size)
+        view = memoryview(buffer)
+        while True:
+            size = fh.readinto(buffer)
+            if not size:
+                return
+            yield from self.feed(view[:size])
+
+
+def _try_mmap(fh):
+    try:
+        fileno = fh.fileno()
+        position = fh.tell()
+        if position or os.fstat(fileno).st_size == 0:
+            return None
+        return mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+    except (AttributeError, OSError, ValueError):
+        return None
@@ -0,0 +1,605 @@
+from array import array
+from bisect import bisect_left
+from typing import (
+    AbstractSet,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+Transition = Tuple[Hashable, str, Hashable]
+
+_NONE: AbstractSet[Hashable] = frozenset()
+
+
+class _ListEdits:
+    """
+    The in-place list methods (insert, remove, pop, clear, item assignment and
+    deletion) for the transition stores, written against three primitives each store
+    provides: _insert_at(index, transition) -> bool, _delete_at(index) and
+    _reset(transitions).
+
+    Stores count their changes: `mutations` grows on every change and `rewrites` on
+    every change other than adding a transition at the end. FiniteAutomata folds
+    `mutations` into its version, and the renderer only folds appended transitions
+    into a cached layout, starting over once `rewrites` moves.
+    """
+
+    __slots__ = ()
+
+    def insert(self, index: int, transition: Transition) -> None:
+        """Insert before `index`; a transition that is already present is left where it is."""
+        self._insert_at(_clamped(index, len(self)), transition)
+
+    def remove(self, transition: Transition) -> None:
+        self._delete_at(self.index(transition))
+
+    def discard(self, from_state: Hashable, symbol: str, to_state: Hashable) -> bool:
+        """Remove a transition; returns False when it was not present."""
+        if (from_state, symbol, to_state) not in self:
+            return False
+        self.remove((from_state, symbol, to_state))
+        return True
+
+    def pop(self, index: int = -1) -> Transition:
+        transition = self[index]
+        self._delete_at(_position(index, len(self)))
+        return transition
+
+    def clear(self) -> None:
+        self._reset(())
+
+    def index(self, transition: Transition) -> int:
+        if transition in self:
+            target = tuple(transition)
+            for position, item in enumerate(self):
+                if item == target:
+                    return position
+        raise ValueError(f"{transition!r} is not in the transitions.")
+
+    def __setitem__(self, index: Union[int, slice], value) -> None:
+        if isinstance(index, slice):
+            items = list(self)
+            items[index] = value
+            self._reset(items)
+            return
+        position = _position(index, len(self))
+        if self[position] != tuple(value):
+            self._delete_at(position)
+            self._insert_at(position, value)
+
+    def __delitem__(self, index: Union[int, slice]) -> None:
+        if isinstance(index, slice):
+            for position in sorted(range(*index.indices(len(self))), reverse=True):
+                self._delete_at(position)
+            return
+        self._delete_at(_position(index, len(self)))
+
+
+def _position(index: int, size: int) -> int:
+    position = index + size if index < 0 else index
+    if not 0 <= position < size:
+        raise IndexError("transition index out of range")
+    return position
+
+
+def _clamped(index: int, size: int) -> int:
+    return max(0, min(size, index + size if index < 0 else index))
+
+
+class TransitionStore(_ListEdits):
+    """
+    Deduplicated, indexed collection of (from_state, symbol, to_state) transitions.
+
+    Behaves like the plain list it replaces (len, iteration, indexing, `in`, equality
+    with lists, append, extend and the in-place edits of _ListEdits) while maintaining,
+    on every change:
+
+    - forward and reverse adjacency keyed by state and by (state, symbol), so
+      successors() / predecessors() are O(1) lookups returning read-only set views;
+    - the grouped (src, dst) -> [symbols] view used by the renderer.
+
+    Adding a transition that is already present is a no-op.
+    """
+
+    __slots__ = ("_items", "_forward", "_reverse", "_out", "_in", "_grouped", "mutations", "rewrites")
+
+    def __init__(self, transitions: Iterable[Transition] = ()):
+        self.mutations = self.rewrites = 0
+        self._clear_indexes()
+        self.extend(transitions)
+
+    def _clear_indexes(self) -> None:
+        self._items: List[Transition] = []
+        self._forward: Dict[Tuple[Hashable, str], Dict[Hashable, None]] = {}
+        self._reverse: Dict[Tuple[Hashable, str], Dict[Hashable, None]] = {}
+        self._out: Dict[Hashable, Dict[Hashable, List[str]]] = {}
+        self._in: Dict[Hashable, Dict[Hashable, List[str]]] = {}
+        self._grouped: Dict[Tuple[Hashable, Hashable], List[str]] = {}
+
+    # Mutation -----------------------------------------------------------------
+    def add(self, from_state: Hashable, symbol: str, to_state: Hashable) -> bool:
+        """Insert a transition; returns False when it was already present."""
+        if not self._link(from_state, symbol, to_state):
+            return False
+        self._items.append((from_state, symbol, to_state))
+        self.mutations += 1
+        return True
+
+    def _link(self, from_state: Hashable, symbol: str, to_state: Hashable) -> bool:
+        targets = self._forward.get((from_state, symbol))
+        if targets is None:
+            targets = self._forward[(from_state, symbol)] = {}
+        elif to_state in targets:
+            return False
+        targets[to_state] = None
+        self._reverse.setdefault((to_state, symbol), {})[from_state] = None
+
+        symbols = self._grouped.get((from_state, to_state))
+        if symbols is None:
+            symbols = self._grouped[(from_state, to_state)] = []
+            self._out.setdefault(from_state, {})[to_state] = symbols
+            self._in.setdefault(to_state, {})[from_state] = symbols
+        symbols.append(symbol)
+        return True
+
+    def _unlink(self, from_state: Hashable, symbol: str, to_state: Hashable) -> None:
+        for index, key, member in (
+            (self._forward, (from_state, symbol), to_state),
+            (self._reverse, (to_state, symbol), from_state),
+        ):
+            entries = index[key]
+            del entries[member]
+            if not entries:
+                del index[key]
+        symbols = self._grouped[(from_state, to_state)]
+        symbols.remove(symbol)
+        if not symbols:
+            del self._grouped[(from_state, to_state)]
+            for index, key, member in ((self._out, from_state, to_state), (self._in, to_state, from_state)):
+                row = index[key]
+                del row[member]
+                if not row:
+                    del index[key]
+
+    def _insert_at(self, index: int, transition: Transition) -> bool:
+        from_state, symbol, to_state = transition
+        if not self._link(from_state, symbol, to_state):
+            return False
+        self._items.insert(index, (from_state, symbol, to_state))
+        self.mutations += 1
+        self.rewrites += 1
+        return True
+
+    def _delete_at(self, index: int) -> None:
+        self._unlink(*self._items.pop(index))
+        self.mutations += 1
+        self.rewrites += 1
+
+    def _reset(self, transitions: Iterable[Transition]) -> None:
+        transitions = list(transitions)
+        self._clear_indexes()
+        self.extend(transitions)
+        self.mutations += 1
+        self.rewrites += 1
+
+    def index(self, transition: Transition) -> int:
+        if transition in self:
+            return self._items.index(tuple(transition))
+        raise ValueError(f"{transition!r} is not in the transitions.")
+
+    def append(self, transition: Transition) -> None:
+        from_state, symbol, to_state = transition
+        self.add(from_state, symbol, to_state)
+
+    def extend(self, transitions: Iterable[Transition]) -> None:
+        add = self.add
+        for from_state, symbol, to_state in transitions:
+            add(from_state, symbol, to_state)
+
+    @classmethod
+    def from_unique(cls, transitions: Iterable[Transition]) -> "TransitionStore":
+        """
+        Bulk-build a store from transitions known to be distinct (e.g. read back from a
+        saved automaton), skipping the duplicate checks and per-call overhead of add().
+        For millions of transitions, cyclic garbage collections triggered by the new
+        containers can dominate the build; callers that can afford it may pause the
+        collector (gc.disable()) around the call.
+        """
+        store = cls()
+        items = store._items
+        forward, reverse = store._forward, store._reverse
+        out, into, grouped = store._out, store._in, store._grouped
+        for transition in transitions:
+            from_state, symbol, to_state = transition
+            items.append(transition)
+            targets = forward.get((from_state, symbol))
+            if targets is None:
+                forward[(from_state, symbol)] = {to_state: None}
+            else:
+                targets[to_state] = None
+            sources = reverse.get((to_state, symbol))
+            if sources is None:
+                reverse[(to_state, symbol)] = {from_state: None}
+            else:
+                sources[from_state] = None
+            symbols = grouped.get((from_state, to_state))
+            if symbols is None:
+                grouped[(from_state, to_state)] = symbols = [symbol]
+                row = out.get(from_state)
+                if row is None:
+                    out[from_state] = {to_state: symbols}
+                else:
+                    row[to_state] = symbols
+                column = into.get(to_state)
+                if column is None:
+                    into[to_state] = {from_state: symbols}
+                else:
+                    column[from_state] = symbols
+            else:
+                symbols.append(symbol)
+        store.mutations = len(items)
+        return store
+
+    # Queries ------------------------------------------------------------------
+    def successors(self, state: Hashable, symbol: Optional[str] = None) -> AbstractSet[Hashable]:
+        """States reachable from `state` in one step (on `symbol`, when given)."""
+        if symbol is None:
+            targets = self._out.get(state)
+        else:
+            targets = self._forward.get((state, symbol))
+        return targets.keys() if targets else _NONE
+
+    def predecessors(self, state: Hashable, symbol: Optional[str] = None) -> AbstractSet[Hashable]:
+        """States with a transition into `state` (on `symbol`, when given)."""
+        if symbol is None:
+            sources = self._in.get(state)
+        else:
+            sources = self._reverse.get((state, symbol))
+        return sources.keys() if sources else _NONE
+
+    def symbols_between(self, from_state: Hashable, to_state: Hashable) -> Tuple[str, ...]:
+        return tuple(self._grouped.get((from_state, to_state), ()))
+
+    def grouped(self) -> Mapping[Tuple[Hashable, Hashable], List[str]]:
+        """The live (src, dst) -> [symbols] grouping, in first-insertion order. Do not mutate."""
+        return self._grouped
+
+    # List compatibility -----------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[Transition]:
+        return iter(self._items)
+
+    def __reversed__(self) -> Iterator[Transition]:
+        return reversed(self._items)
+
+    def __getitem__(self, index: Union[int, slice]):
+        return self._items[index]
+
+    def __contains__(self, transition: object) -> bool:
+        try:
+            from_state, symbol, to_state = transition  # type: ignore[misc]
+            targets = self._forward.get((from_state, symbol))
+        except (TypeError, ValueError):
+            return False
+        return targets is not None and to_state in targets
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, TransitionStore):
+            return self._items == other._items
+        if isinstance(other, (list, tuple)):
+            return self._items == list(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"TransitionStore({self._items!r})"
+
+
+class NameTable:
+    """Interns hashable names into dense integer ids (first seen, first numbered)."""
+
+    __slots__ = ("names", "_ids")
+
+    def __init__(self):
+        self.names: List[Hashable] = []
+        self._ids: Dict[Hashable, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def intern(self, name: Hashable) -> int:
+        ident = self._ids.get(name)
+        if ident is None:
+            ident = self._ids[name] = len(self.names)
+            self.names.append(name)
+        return ident
+
+    def get(self, name: Hashable) -> Optional[int]:
+        return self._ids.get(name)
+
+
+class _CompactIndex:
+    """CSR adjacency over a CompactTransitionStore, rebuilt after mutations."""
+
+    __slots__ = ("out_starts", "out_rows", "in_starts", "in_rows", "grouped")
+
+    def __init__(self, src: array, dst: array, states: int):
+        self.out_starts, self.out_rows = _csr(src, states)
+        self.in_starts, self.in_rows = _csr(dst, states)
+        self.grouped: Optional[Dict[Tuple[Hashable, Hashable], List[str]]] = None
+
+
+def _csr(keys: array, size: int) -> Tuple[array, array]:
+    """Group the row numbers of `keys` by key: rows[starts[k]:starts[k + 1]] have key k."""
+    starts = array("I", [0]) * (size + 1)
+    for key in keys:
+        starts[key + 1] += 1
+    for idx in range(size):
+        starts[idx + 1] += starts[idx]
+    fill = array("I", starts)
+    rows = array("I", [0]) * len(keys)
+    for row, key in enumerate(keys):
+        rows[fill[key]] = row
+        fill[key] += 1
+    return starts, rows
+
+
+class _KeyIndex:
+    """
+    The set of (src, sym, dst) id triples of a CompactTransitionStore, packed into one
+    integer each and kept sorted in an array('Q'): 8 bytes per transition.
+
+    Field widths follow the number of interned names (in 4-bit steps); when a new id
+    outgrows them the keys are rebuilt from the columns. New keys wait in a small set
+    until it holds a sixteenth of the sorted keys (at least MIN_PENDING) and are then
+    merged in one sort, which keeps inserts amortized O(log n). Keys wider than 64 bits
+    (only for millions of states and symbols at once) fall back to a sorted list.
+    """
+
+    __slots__ = ("_sorted", "_pending", "_sym_bits", "_dst_bits")
+
+    MIN_PENDING = 256
+
+    def __init__(self):
+        self._sorted: Union[array, List[int]] = array("Q")
+        self._pending: set = set()
+        self._sym_bits = self._dst_bits = 4
+
+    def __len__(self) -> int:
+        return len(self._sorted) + len(self._pending)
+
+    def fits(self, sym: int, dst: int) -> bool:
+        return not (sym >> self._sym_bits or dst >> self._dst_bits)
+
+    def pack(self, src: int, sym: int, dst: int) -> int:
+        return (((src << self._sym_bits) | sym) << self._dst_bits) | dst
+
+    def rebuild(self, src: array, sym: array, dst: array, symbols: int, states: int) -> None:
+        """Re-pack every row of the columns with widths covering the given name counts."""
+        self._sym_bits = max(4, -(-symbols.bit_length() // 4) * 4)
+        self._dst_bits = max(4, -(-states.bit_length() // 4) * 4)
+        pack = self.pack
+        self._pending = set()
+        self._sorted = self._packed(sorted(map(pack, src, sym, dst)))
+
+    def _packed(self, keys: List[int]) -> Union[array, List[int]]:
+        if 2 * self._dst_bits + self._sym_bits <= 64:
+            return array("Q", keys)
+        return keys
+
+    def __contains__(self, key: int) -> bool:
+        if key in self._pending:
+            return True
+        keys = self._sorted
+        idx = bisect_left(keys, key)
+        return idx < len(keys) and keys[idx] == key
+
+    def add(self, key: int) -> bool:
+        """Insert `key`; returns False when it was already present."""
+        if key in self:
+            return False
+        pending = self._pending
+        pending.add(key)
+        if len(pending) > max(self.MIN_PENDING, len(self._sorted) >> 4):
+            # The sorted keys form one run, so the sort is close to a linear merge.
+            merged = list(self._sorted)
+            merged.extend(sorted(pending))
+            merged.sort()
+            self._sorted = self._packed(merged)
+            self._pending = set()
+        return True
+
+    def discard(self, key: int) -> None:
+        if key in self._pending:
+            self._pending.remove(key)
+        else:
+            del self._sorted[bisect_left(self._sorted, key)]
+
+
+class CompactTransitionStore(_ListEdits):
+    """
+    Memory-lean drop-in for TransitionStore.
+
+    State and symbol names are interned once into integer ids, and transitions live in
+    three parallel array('I') columns (4 bytes per field instead of a tuple and several
+    dict entries per transition). Duplicates are rejected through a _KeyIndex of packed
+    integer keys (8 more bytes per transition). The adjacency indexes and the grouped view the renderer needs are
+    built on first query and dropped on the next change, so queries cost O(degree)
+    after an O(n) rebuild rather than O(1) as in TransitionStore. Inserting or
+    removing anywhere but the end shifts the columns and costs O(n).
+    """
+
+    __slots__ = ("states", "symbols", "_src", "_sym", "_dst", "_keys", "_index", "mutations", "rewrites")
+
+    def __init__(self, transitions: Iterable[Transition] = ()):
+        self.states = NameTable()
+        self.symbols = NameTable()
+        self.mutations = self.rewrites = 0
+        self._clear_columns()
+        self.extend(transitions)
+
+    def _clear_columns(self) -> None:
+        self._src = array("I")
+        self._sym = array("I")
+        self._dst = array("I")
+        self._keys = _KeyIndex()
+        self._index: Optional[_CompactIndex] = None
+
+    # Mutation -----------------------------------------------------------------
+    def add(self, from_state: Hashable, symbol: str, to_state: Hashable) -> bool:
+        """Insert a transition; returns False when it was already present."""
+        src = self.states.intern(from_state)
+        dst = self.states.intern(to_state)
+        sym = self.symbols.intern(symbol)
+        keys = self._keys
+        if not keys.fits(sym, dst):
+            keys.rebuild(self._src, self._sym, self._dst, len(self.symbols), len(self.states))
+        if not keys.add(keys.pack(src, sym, dst)):
+            return False
+        self._src.append(src)
+        self._sym.append(sym)
+        self._dst.append(dst)
+        self._index = None
+        self.mutations += 1
+        return True
+
+    def _insert_at(self, index: int, transition: Transition) -> bool:
+        size = len(self._src)
+        if not self.add(*transition):
+            return False
+        if index < size:
+            for column in (self._src, self._sym, self._dst):
+                column.insert(index, column.pop())
+        self.rewrites += 1
+        return True
+
+    def _delete_at(self, index: int) -> None:
+        keys = self._keys
+        keys.discard(keys.pack(self._src[index], self._sym[index], self._dst[index]))
+        for column in (self._src, self._sym, self._dst):
+            del column[index]
+        self._index = None
+        self.mutations += 1
+        self.rewrites += 1
+
+    def _reset(self, transitions: Iterable[Transition]) -> None:
+        transitions = list(transitions)
+        self._clear_columns()
+        self.extend(transitions)
+        self.mutations += 1
+        self.rewrites += 1
+
+    def append(self, transition: Transition) -> None:
+        from_state, symbol, to_state = transition
+        self.add(from_state, symbol, to_state)
+
+    def extend(self, transitions: Iterable[Transition]) -> None:
+        add = self.add
+        for from_state, symbol, to_state in transitions:
+            add(from_state, symbol, to_state)
+
+    # Queries ------------------------------------------------------------------
+    def _built(self) -> _CompactIndex:
+        index = self._index
+        if index is None:
+            index = self._index = _CompactIndex(self._src, self._dst, len(self.states))
+        return index
+
+    def _neighbours(self, state: Hashable, symbol: Optional[str], outgoing: bool) -> AbstractSet[Hashable]:
+        ident = self.states.get(state)
+        if ident is None:
+            return _NONE
+        sym = None
+        if symbol is not None:
+            sym = self.symbols.get(symbol)
+            if sym is None:
+                return _NONE
+        index = self._built()
+        starts, rows = (index.out_starts, index.out_rows) if outgoing else (index.in_starts, index.in_rows)
+        other = self._dst if outgoing else self._src
+        names = self.states.names
+        symbols = self._sym
+        return frozenset(
+            names[other[row]]
+            for row in rows[starts[ident]:starts[ident + 1]]
+            if sym is None or symbols[row] == sym
+        )
+
+    def successors(self, state: Hashable, symbol: Optional[str] = None) -> AbstractSet[Hashable]:
+        """States reachable from `state` in one step (on `symbol`, when given)."""
+        return self._neighbours(state, symbol, True)
+
+    def predecessors(self, state: Hashable, symbol: Optional[str] = None) -> AbstractSet[Hashable]:
+        """States with a transition into `state` (on `symbol`, when given)."""
+        return self._neighbours(state, symbol, False)
+
+    def symbols_between(self, from_state: Hashable, to_state: Hashable) -> Tuple[str, ...]:
+        return tuple(self.grouped().get((from_state, to_state), ()))
+
+    def grouped(self) -> Mapping[Tuple[Hashable, Hashable], List[str]]:
+        """The (src, dst) -> [symbols] grouping, in first-insertion order. Do not mutate."""
+        index = self._built()
+        if index.grouped is None:
+            grouped: Dict[Tuple[Hashable, Hashable], List[str]] = {}
+            for src, symbol, dst in self:
+                symbols = grouped.get((src, dst))
+                if symbols is None:
+                    grouped[(src, dst)] = [symbol]
+                else:
+                    symbols.append(symbol)
+            index.grouped = grouped
+        return index.grouped
+
+    # List compatibility -----------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self._src)
+
+    def __iter__(self) -> Iterator[Transition]:
+        states, symbols = self.states.names, self.symbols.names
+        for src, sym, dst in zip(self._src, self._sym, self._dst):
+            yield (states[src], symbols[sym], states[dst])
+
+    def __reversed__(self) -> Iterator[Transition]:
+        for row in range(len(self._src) - 1, -1, -1):
+            yield self[row]
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return [self[row] for row in range(*index.indices(len(self._src)))]
+        states = self.states.names
+        return (states[self._src[index]], self.symbols.names[self._sym[index]], states[self._dst[index]])
+
+    def __contains__(self, transition: object) -> bool:
+        try:
+            from_state, symbol, to_state = transition  # type: ignore[misc]
+            src, sym, dst = self.states.get(from_state), self.symbols.get(symbol), self.states.get(to_state)
+        except (TypeError, ValueError):
+            return False
+        if src is None or sym is None or dst is None:
+            return False
+        keys = self._keys
+        return keys.fits(sym, dst) and keys.pack(src, sym, dst) in keys
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (TransitionStore, CompactTransitionStore, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"CompactTransitionStore({list(self)!r})"
+
+
+# Every store type accepted by FiniteAutomata and the renderer.
+STORE_TYPES = (TransitionStore, CompactTransitionStore)
@@ -0,0 +1,339 @@
+"""
+Canvas-based HTML viewer for automata too large to embed as a static SVG.
+
+The page receives the layout as a JSON payload (see AutomataRenderer._iter_canvas_payload)
+and draws it onto a <canvas> with pan and zoom. States and edges are bucketed in a
+uniform grid so each frame only visits what intersects the viewport, and names, labels
+and arrowheads are dropped by level of detail when zoomed out.
+"""
+import json
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .renderer import RendererTheme
+
+
+def json_string(value: object) -> str:
+    """JSON-encode a name or label so it is safe inside a <script> element."""
+    return json.dumps(str(value)).replace("</", "<\\/")
+
+
+def canvas_head(title: str, theme: "RendererTheme") -> str:
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="utf-8">
+  <title>{title} · Finite Automata</title>
+  <style>
+    html, body {{
+      margin: 0;
+      height: 100%;
+      overflow: hidden;
+      background: {theme.background_color};
+      font-family: {theme.font_family};
+    }}
+    canvas {{
+      display: block;
+      width: 100vw;
+      height: 100vh;
+      cursor: grab;
+      touch-action: none;
+    }}
+    canvas.dragging {{
+      cursor: grabbing;
+    }}
+    #hud {{
+      position: fixed;
+      left: 16px;
+      bottom: 12px;
+      font-size: 12px;
+      color: {theme.state_text_color};
+      opacity: 0.6;
+      pointer-events: none;
+    }}
+  </style>
+</head>
+<body>
+<canvas id="viewport"></canvas>
+<div id="hud"></div>
+<script type="application/json" id="automaton">"""
+
+
+CANVAS_TAIL = """</script>
+<script>
+(function () {
+  "use strict";
+  const data = JSON.parse(document.getElementById("automaton").textContent);
+  const canvas = document.getElementById("viewport");
+  const hud = document.getElementById("hud");
+  const ctx = canvas.getContext("2d");
+  const theme = data.theme;
+  const radius = data.radius;
+  const names = data.names;
+  const xy = data.xy;
+  const edges = data.edges;
+  const count = names.length;
+  const accept = new Uint8Array(count);
+  data.accept.forEach(function (idx) { accept[idx] = 1; });
+
+  // Bounds and a uniform grid over states and edge bounding boxes.
+  let minX = Infinity, minY = Infinity, maxX = -Infinity, maxY = -Infinity;
+  function extend(x, y) {
+    if (x < minX) minX = x;
+    if (y < minY) minY = y;
+    if (x > maxX) maxX = x;
+    if (y > maxY) maxY = y;
+  }
+  for (let i = 0; i < count; i++) extend(xy[2 * i], xy[2 * i + 1]);
+  if (!count) extend(0, 0);
+  const edgeBoxes = new Float64Array(edges.length * 4);
+  edges.forEach(function (edge, id) {
+    let x0 = edge[9], y0 = edge[10], x1 = x0, y1 = y0;
+    for (let k = 1; k < 9; k += 2) {
+      x0 = Math.min(x0, edge[k]); x1 = Math.max(x1, edge[k]);
+      y0 = Math.min(y0, edge[k + 1]); y1 = Math.max(y1, edge[k + 1]);
+    }
+    edgeBoxes.set([x0, y0, x1, y1], id * 4);
+    extend(x0, y0);
+    extend(x1, y1);
+  });
+  minX -= radius * 2; minY -= radius * 2; maxX += radius * 2; maxY += radius * 2;
+
+  const cell = Math.max(radius * 8, 256);
+  const columns = Math.max(1, Math.ceil((maxX - minX) / cell));
+  const rows = Math.max(1, Math.ceil((maxY - minY) / cell));
+  const stateCells = new Map();
+  const edgeCells = new Map();
+  const wideEdges = [];
+  function cellRange(x0, y0, x1, y1) {
+    return [
+      Math.max(0, Math.floor((x0 - minX) / cell)), Math.max(0, Math.floor((y0 - minY) / cell)),
+      Math.min(columns - 1, Math.floor((x1 - minX) / cell)), Math.min(rows - 1, Math.floor((y1 - minY) / cell)),
+    ];
+  }
+  function bucket(map, range, id) {
+    for (let cy = range[1]; cy <= range[3]; cy++) {
+      for (let cx = range[0]; cx <= range[2]; cx++) {
+        const key = cy * columns + cx;
+        let items = map.get(key);
+        if (!items) map.set(key, items = []);
+        items.push(id);
+      }
+    }
+  }
+  for (let i = 0; i < count; i++) {
+    const x = xy[2 * i], y = xy[2 * i + 1];
+    bucket(stateCells, cellRange(x - radius, y - radius, x + radius, y + radius), i);
+  }
+  for (let id = 0; id < edges.length; id++) {
+    const box = edgeBoxes.subarray(id * 4, id * 4 + 4);
+    const range = cellRange(box[0], box[1], box[2], box[3]);
+    if ((range[2] - range[0] + 1) * (range[3] - range[1] + 1) > 64) wideEdges.push(id);
+    else bucket(edgeCells, range, id);
+  }
+
+  // View: world point (view.x, view.y) sits at the top-left corner of the canvas.
+  const view = { x: minX, y: minY, scale: 1 };
+  let dpr = window.devicePixelRatio || 1;
+  let frame = 0;
+  const edgeSeen = new Uint32Array(edges.length);
+  const stateSeen = new Uint32Array(count);
+  let pending = false;
+
+  function fit() {
+    const width = canvas.clientWidth, height = canvas.clientHeight;
+    view.scale = Math.min(width / (maxX - minX), height / (maxY - minY), 2);
+    view.x = (minX + maxX) / 2 - width / 2 / view.scale;
+    view.y = (minY + maxY) / 2 - height / 2 / view.scale;
+  }
+
+  function requestDraw() {
+    if (!pending) {
+      pending = true;
+      window.requestAnimationFrame(draw);
+    }
+  }
+
+  function visible(map, extra, seen, range, out) {
+    for (let cy = range[1]; cy <= range[3]; cy++) {
+      for (let cx = range[0]; cx <= range[2]; cx++) {
+        const items = map.get(cy * columns + cx);
+        if (!items) continue;
+        for (let k = 0; k < items.length; k++) {
+          const id = items[k];
+          if (seen[id] !== frame) { seen[id] = frame; out.push(id); }
+        }
+      }
+    }
+    for (let k = 0; k < extra.length; k++) out.push(extra[k]);
+    return out;
+  }
+
+  function arrowhead(edge, size) {
+    const x = edge[7], y = edge[8];
+    const angle = Math.atan2(y - edge[6], x - edge[5]);
+    ctx.beginPath();
+    ctx.moveTo(x, y);
+    ctx.lineTo(x - size * Math.cos(angle - 0.45), y - size * Math.sin(angle - 0.45));
+    ctx.lineTo(x - size * Math.cos(angle + 0.45), y - size * Math.sin(angle + 0.45));
+    ctx.closePath();
+    ctx.fill();
+  }
+
+  function draw() {
+    pending = false;
+    frame++;
+    const width = canvas.clientWidth, height = canvas.clientHeight;
+    if (canvas.width !== Math.round(width * dpr) || canvas.height !== Math.round(height * dpr)) {
+      canvas.width = Math.round(width * dpr);
+      canvas.height = Math.round(height * dpr);
+    }
+    ctx.setTransform(1, 0, 0, 1, 0, 0);
+    ctx.fillStyle = theme.background;
+    ctx.fillRect(0, 0, canvas.width, canvas.height);
+    const scale = view.scale;
+    ctx.setTransform(dpr * scale, 0, 0, dpr * scale, -view.x * scale * dpr, -view.y * scale * dpr);
+
+    const x0 = view.x, y0 = view.y, x1 = view.x + width / scale, y1 = view.y + height / scale;
+    const range = cellRange(x0, y0, x1, y1);
+    const edgeIds = visible(edgeCells, wideEdges, edgeSeen, range, []).filter(function (id) {
+      const b = id * 4;
+      return edgeBoxes[b] <= x1 && edgeBoxes[b + 2] >= x0 && edgeBoxes[b + 1] <= y1 && edgeBoxes[b + 3] >= y0;
+    });
+    const stateIds = visible(stateCells, [], stateSeen, range, []);
+
+    const pixelRadius = radius * scale;
+    const showArrows = scale > 0.3;
+    const showLabels = scale > 0.55;
+    const showNames = pixelRadius > 9;
+
+    ctx.strokeStyle = theme.transition;
+    ctx.fillStyle = theme.transition;
+    ctx.globalAlpha = 0.82;
+    ctx.lineWidth = Math.max(2.4, 1 / scale);
+    ctx.beginPath();
+    for (let k = 0; k < edgeIds.length; k++) {
+      const edge = edges[edgeIds[k]];
+      ctx.moveTo(edge[1], edge[2]);
+      if (edge[0]) ctx.bezierCurveTo(edge[3], edge[4], edge[5], edge[6], edge[7], edge[8]);
+      else { ctx.lineTo(edge[3], edge[4]); ctx.lineTo(edge[5], edge[6]); ctx.lineTo(edge[7], edge[8]); }
+    }
+    ctx.stroke();
+    if (showArrows) {
+      for (let k = 0; k < edgeIds.length; k++) arrowhead(edges[edgeIds[k]], 12);
+    }
+    ctx.globalAlpha = 1;
+    if (showLabels) {
+      ctx.fillStyle = theme.transitionText;
+      ctx.font = "15px " + theme.font;
+      ctx.textAlign = "center";
+      ctx.textBaseline = "middle";
+      for (let k = 0; k < edgeIds.length; k++) {
+        const edge = edges[edgeIds[k]];
+        ctx.fillText(edge[11], edge[9], edge[10]);
+      }
+    }
+
+    if (pixelRadius < 2) {
+      ctx.fillStyle = theme.stateBorder;
+      for (let k = 0; k < stateIds.length; k++) {
+        const i = stateIds[k];
+        ctx.fillRect(xy[2 * i] - radius, xy[2 * i + 1] - radius, radius * 2, radius * 2);
+      }
+    } else {
+      ctx.fillStyle = theme.stateFill;
+      ctx.strokeStyle = theme.stateBorder;
+      ctx.lineWidth = 2;
+      ctx.beginPath();
+      for (let k = 0; k < stateIds.length; k++) {
+        const i = stateIds[k];
+        ctx.moveTo(xy[2 * i] + radius, xy[2 * i + 1]);
+        ctx.arc(xy[2 * i], xy[2 * i + 1], radius, 0, 2 * Math.PI);
+      }
+      ctx.fill();
+      ctx.stroke();
+      ctx.strokeStyle = theme.acceptBorder;
+      ctx.lineWidth = 3;
+      ctx.beginPath();
+      for (let k = 0; k < stateIds.length; k++) {
+        const i = stateIds[k];
+        if (!accept[i]) continue;
+        ctx.moveTo(xy[2 * i] + radius - 6, xy[2 * i + 1]);
+        ctx.arc(xy[2 * i], xy[2 * i + 1], radius - 6, 0, 2 * Math.PI);
+      }
+      ctx.stroke();
+      if (showNames) {
+        ctx.fillStyle = theme.stateText;
+        ctx.font = "600 18px " + theme.font;
+        ctx.textAlign = "center";
+        ctx.textBaseline = "middle";
+        for (let k = 0; k < stateIds.length; k++) {
+          const i = stateIds[k];
+          ctx.fillText(names[i], xy[2 * i], xy[2 * i + 1], radius * 1.8);
+        }
+      }
+    }
+
+    if (data.start >= 0) {
+      const sx = xy[2 * data.start], sy = xy[2 * data.start + 1];
+      const arrowX = sx - radius - 48;
+      ctx.globalAlpha = 0.72;
+      ctx.fillStyle = theme.start;
+      ctx.strokeStyle = theme.start;
+      ctx.lineWidth = 3;
+      ctx.beginPath();
+      ctx.moveTo(arrowX, sy);
+      ctx.lineTo(arrowX + 24, sy - 18);
+      ctx.lineTo(arrowX + 24, sy + 18);
+      ctx.closePath();
+      ctx.fill();
+      ctx.beginPath();
+      ctx.moveTo(arrowX + 24, sy);
+      ctx.lineTo(sx - radius, sy);
+      ctx.stroke();
+      ctx.globalAlpha = 1;
+    }
+
+    hud.textContent = count + " states \\u00b7 " + edges.length + " edges \\u00b7 drawing " +
+      stateIds.length + " / " + edgeIds.length + " \\u00b7 " + Math.round(scale * 100) + "%";
+  }
+
+  let drag = null;
+  canvas.addEventListener("pointerdown", function (event) {
+    drag = { x: event.clientX, y: event.clientY };
+    canvas.setPointerCapture(event.pointerId);
+    canvas.classList.add("dragging");
+  });
+  canvas.addEventListener("pointermove", function (event) {
+    if (!drag) return;
+    view.x -= (event.clientX - drag.x) / view.scale;
+    view.y -= (event.clientY - drag.y) / view.scale;
+    drag = { x: event.clientX, y: event.clientY };
+    requestDraw();
+  });
+  function endDrag() {
+    drag = null;
+    canvas.classList.remove("dragging");
+  }
+  canvas.addEventListener("pointerup", endDrag);
+  canvas.addEventListener("pointercancel", endDrag);
+  canvas.addEventListener("wheel", function (event) {
+    event.preventDefault();
+    const rect = canvas.getBoundingClientRect();
+    const px = event.clientX - rect.left, py = event.clientY - rect.top;
+    const worldX = view.x + px / view.scale, worldY = view.y + py / view.scale;
+    view.scale = Math.min(8, Math.max(1e-4, view.scale * Math.exp(-event.deltaY * 0.0015)));
+    view.x = worldX - px / view.scale;
+    view.y = worldY - py / view.scale;
+    requestDraw();
+  }, { passive: false });
+  canvas.addEventListener("dblclick", function () { fit(); requestDraw(); });
+  window.addEventListener("resize", function () { dpr = window.devicePixelRatio || 1; requestDraw(); });
+
+  fit();
+  requestDraw();
+})();
+</script>
+</body>
+</html>
+"""
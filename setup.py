@@ -9,11 +9,12 @@ setup(
     url="https://github.com/vishruthb/finiteautomata",
     author='Vishruth Bharath',
     author_email='',
-    packages=find_packages(),
+    packages=find_packages(exclude=('tests', 'benchmarks', 'benchmarks.*')),
     install_requires=[],
     extras_require={
         'cairo': ['cairosvg>=2.7'],
-        'dev': ['pytest>=7.0', 'pytest-cov>=4.0', 'cairosvg>=2.7'],
+        'numpy': ['numpy>=1.17'],
+        'dev': ['pytest>=7.0', 'pytest-cov>=4.0', 'cairosvg>=2.7', 'numpy>=1.17'],
     },
     classifiers=[
         'Programming Language :: Python :: 3',
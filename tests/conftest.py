@@ -0,0 +1,15 @@
+import itertools
+
+import pytest
+
+
+def _all_words(alphabet, max_length):
+    for length in range(max_length + 1):
+        for letters in itertools.product(alphabet, repeat=length):
+            yield ''.join(letters)
+
+
+@pytest.fixture
+def all_words():
+    """Every word over `alphabet` up to `max_length` symbols, shortest first."""
+    return _all_words
@@ -0,0 +1,66 @@
+from finiteautomata import FiniteAutomata
+from finiteautomata.analysis import strongly_connected_components
+
+
+def sample():
+    fsm = FiniteAutomata()
+    fsm.start('s').accept('f').state('orphan')
+    fsm.transition('s', 'a', 'x').transition('x', 'b', 's')
+    fsm.transition('x', 'c', 'f').transition('s', 'd', 'trap')
+    fsm.transition('trap', 'a', 'trap').transition('orphan', 'a', 'f')
+    return fsm
+
+
+def test_structure_sets():
+    structure = sample().analyze()
+    assert structure.reachable == {'s', 'x', 'f', 'trap'}
+    assert structure.useful == {'s', 'x', 'f'}
+    assert structure.dead == {'trap'}
+    assert structure.unreachable == {'orphan'}
+    assert {'s', 'x'} in [set(component) for component in structure.components]
+
+
+def test_components_are_reverse_topological():
+    structure = sample().analyze()
+    position = {state: idx for idx, component in enumerate(structure.components) for state in component}
+    assert position['f'] < position['s']
+    assert position['trap'] < position['s']
+
+
+def test_deep_graph_does_not_recurse():
+    size = 20000
+    chain = strongly_connected_components(range(size), lambda node: [node + 1] if node + 1 < size else [])
+    assert len(chain) == size and chain[0] == (size - 1,)
+    cycle = strongly_connected_components(range(size), lambda node: [(node + 1) % size])
+    assert len(cycle) == 1 and len(cycle[0]) == size
+
+
+def test_trim_keeps_language():
+    fsm = sample()
+    trimmed = fsm.trim()
+    assert trimmed.states == {'s', 'x', 'f'}
+    assert trimmed.equivalent(fsm)
+
+
+def test_trimmed_drawing_omits_useless_states(tmp_path):
+    fsm = sample().configure_renderer(trim=True)
+    fsm.draw(str(tmp_path / 'trimmed'), formats=['svg'])
+    svg = (tmp_path / 'trimmed.svg').read_text(encoding='utf-8')
+    assert '>x<' in svg and '>orphan<' not in svg and '>trap<' not in svg
+
+
+def test_collapsed_component_opens_in_html(tmp_path):
+    fsm = FiniteAutomata()
+    fsm.start('in').accept('out')
+    ring = [f'r{idx}' for idx in range(6)]
+    fsm.transition('in', 'a', ring[0])
+    for src, dst in zip(ring, ring[1:] + ring[:1]):
+        fsm.transition(src, 'b', dst)
+    fsm.transition(ring[3], 'c', 'out')
+    fsm.configure_renderer(collapse_threshold=3)
+    fsm.draw(str(tmp_path / 'collapsed'), formats=['svg', 'html'])
+    svg = (tmp_path / 'collapsed.svg').read_text(encoding='utf-8')
+    page = (tmp_path / 'collapsed.html').read_text(encoding='utf-8')
+    assert '⟨r0 +5⟩' in svg and '>r3<' not in svg
+    assert page.count('<details class="cluster"') == 1
+    assert '6 states' in page and '>r3<' in page
@@ -0,0 +1,134 @@
+import asyncio
+import io
+import threading
+
+import pytest
+
+from finiteautomata import FiniteAutomata
+
+
+def build_chain(length):
+    fsm = FiniteAutomata()
+    fsm.start('q0').accept(f'q{length}')
+    for idx in range(length):
+        fsm.transition(f'q{idx}', 'a', f'q{idx + 1}')
+    return fsm
+
+
+def test_draw_async_writes_files(tmp_path):
+    fsm = build_chain(3)
+    base = str(tmp_path / 'chain')
+    outputs = asyncio.run(fsm.draw_async(base, formats=('svg', 'html')))
+    assert outputs == {'svg': base + '.svg', 'html': base + '.html'}
+    assert (tmp_path / 'chain.svg').read_text(encoding='utf-8').startswith('<svg')
+    assert 'layout' in outputs.stats and 'svg' in outputs.stats
+
+
+def test_draw_async_in_memory_matches_draw_to(tmp_path):
+    fsm = build_chain(3)
+    outputs = asyncio.run(fsm.draw_async('chain', formats=('svg',), in_memory=True))
+    assert not list(tmp_path.iterdir())
+    path = tmp_path / 'sync.svg'
+    with open(path, 'w', encoding='utf-8') as fh:
+        fsm.draw_to(fh)
+    assert outputs['svg'] == path.read_bytes()
+
+
+def test_draw_async_renders_the_automaton_as_it_was_submitted(monkeypatch):
+    from finiteautomata.renderer import AutomataRenderer
+
+    fsm = build_chain(200)
+    expected = io.StringIO()
+    fsm.draw_to(expected)
+    release = threading.Event()
+    original = AutomataRenderer.write_svg
+
+    def blocked(self, stream):
+        assert release.wait(10)
+        return original(self, stream)
+
+    monkeypatch.setattr(AutomataRenderer, 'write_svg', blocked)
+
+    async def main():
+        task = asyncio.ensure_future(fsm.draw_async('chain', formats=('svg',), in_memory=True))
+        await asyncio.sleep(0.01)
+        for idx in range(200):
+            fsm.transition(f'q{idx}', 'b', f'q{idx + 2}')
+        release.set()
+        return await task
+
+    assert asyncio.run(main())['svg'] == expected.getvalue().encode('utf-8')
+
+
+def test_draw_async_shares_a_semaphore():
+    machines = [build_chain(n) for n in range(2, 8)]
+    semaphore = None
+
+    async def main():
+        nonlocal semaphore
+        semaphore = asyncio.Semaphore(2)
+        tasks = [fsm.draw_async('m', in_memory=True, semaphore=semaphore) for fsm in machines]
+        return await asyncio.gather(*tasks)
+
+    results = asyncio.run(main())
+    assert all(result['svg'].startswith(b'<svg') for result in results)
+    assert not semaphore.locked()
+
+
+def test_draw_async_cancellation_removes_partial_files(tmp_path):
+    fsm = build_chain(3000)
+    base = str(tmp_path / 'big')
+
+    async def main():
+        task = asyncio.ensure_future(fsm.draw_async(base, formats=('svg',)))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await asyncio.sleep(0.2)
+
+    asyncio.run(main())
+    assert not (tmp_path / 'big.svg').exists()
+
+
+def test_draw_async_cancellation_keeps_the_slot_until_the_worker_stops(monkeypatch):
+    from finiteautomata.renderer import AutomataRenderer
+
+    started, release = threading.Event(), threading.Event()
+    running, peak = [0], [0]
+    original = AutomataRenderer.write_svg
+
+    def tracked(self, stream):
+        running[0] += 1
+        peak[0] = max(peak[0], running[0])
+        started.set()
+        try:
+            assert release.wait(10)
+            return original(self, stream)
+        finally:
+            running[0] -= 1
+
+    monkeypatch.setattr(AutomataRenderer, 'write_svg', tracked)
+    fsm = build_chain(50)
+    fsm.configure_renderer(async_limit=1)
+
+    async def main():
+        first = asyncio.ensure_future(fsm.draw_async('first', formats=('svg',), in_memory=True))
+        while not started.is_set():
+            await asyncio.sleep(0.005)
+        second = asyncio.ensure_future(fsm.draw_async('second', formats=('svg',), in_memory=True))
+        first.cancel()
+        await asyncio.sleep(0.05)
+        assert not first.done() and not second.done()
+        release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(main())['svg'].startswith(b'<svg')
+    assert peak[0] == 1
+
+
+def test_draw_async_rejects_unknown_formats():
+    with pytest.raises(ValueError):
+        asyncio.run(build_chain(1).draw_async(formats=('gif',)))
@@ -1,4 +1,6 @@
+import io
 import os
+import threading
 from pathlib import Path
 
 import pytest
@@ -87,3 +89,197 @@ def test_draw_uses_default_formats(tmp_path):
     for path in outputs.values():
         assert Path(path).is_file()
 
+
+
+def test_svg_built_once_for_multiple_formats(tmp_path, monkeypatch):
+    from finiteautomata.renderer import AutomataRenderer
+
+    calls = []
+    original = AutomataRenderer._iter_svg
+
+    def counting_iter(self):
+        calls.append(self)
+        return original(self)
+
+    monkeypatch.setattr(AutomataRenderer, '_iter_svg', counting_iter)
+    fsm = build_sample_machine()
+    outputs = fsm.draw(str(tmp_path / "once"), formats=('svg', 'html'))
+    assert len(calls) == 1
+    svg = Path(outputs['svg']).read_text(encoding='utf-8')
+    html = Path(outputs['html']).read_text(encoding='utf-8')
+    assert svg.strip() in html
+
+
+def test_draw_without_waiting_returns_futures(tmp_path):
+    fsm = build_sample_machine()
+    futures = fsm.draw(str(tmp_path / "async"), formats=('svg', 'html'), wait=False)
+    assert set(futures) == {'svg', 'html'}
+    for future in futures.values():
+        assert Path(future.result(timeout=10)).is_file()
+
+
+def test_overlapping_probes_share_one_tracemalloc_session():
+    import tracemalloc
+
+    from finiteautomata.profiling import Probe, RenderStats
+
+    assert not tracemalloc.is_tracing()
+    first, second = Probe(RenderStats(), trace_memory=True), Probe(RenderStats(), trace_memory=True)
+    first_started = first.start('svg')
+    blob = bytearray(1 << 20)
+    del blob
+    second_started = second.start('layout')
+    assert first.finish('svg', first_started).peak_bytes >= 1 << 20
+    assert tracemalloc.is_tracing()
+    second.finish('layout', second_started)
+    assert not tracemalloc.is_tracing()
+
+
+def test_draw_without_waiting_streams_in_background(tmp_path, monkeypatch):
+    from finiteautomata.renderer import AutomataRenderer
+
+    release = threading.Event()
+    original = AutomataRenderer._stream_documents
+
+    def blocked(self, *args, **kwargs):
+        assert release.wait(10)
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(AutomataRenderer, '_stream_documents', blocked)
+    fsm = build_sample_machine()
+    futures = fsm.draw(str(tmp_path / "background"), formats=('svg',), wait=False)
+    assert not futures['svg'].done()
+    release.set()
+    assert Path(futures['svg'].result(timeout=10)).is_file()
+
+
+def test_background_draw_ignores_later_edits(tmp_path, monkeypatch):
+    from finiteautomata.renderer import AutomataRenderer
+
+    fsm = FiniteAutomata()
+    fsm.start(0)
+    for idx in range(300):
+        fsm.transition(idx, 'a', idx + 1)
+    expected = Path(fsm.draw(str(tmp_path / "expected"), formats=('svg',))['svg']).read_text()
+
+    release = threading.Event()
+    original = AutomataRenderer._stream_documents
+
+    def blocked(self, *args, **kwargs):
+        assert release.wait(10)
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(AutomataRenderer, '_stream_documents', blocked)
+    futures = fsm.draw(str(tmp_path / "background"), formats=('svg', 'html'), wait=False)
+    for idx in range(300):
+        fsm.transition(idx, 'b', idx + 2)
+    fsm.accept(5)
+    release.set()
+    assert Path(futures['svg'].result(timeout=10)).read_text() == expected
+    assert Path(futures['html'].result(timeout=10)).is_file()
+
+
+@pytest.mark.parametrize('executor', ['inline', 'process'])
+def test_configurable_render_executor(tmp_path, executor):
+    fsm = build_sample_machine()
+    fsm.configure_renderer(executor=executor, max_workers=2)
+    outputs = fsm.draw(str(tmp_path / executor), formats=('svg', 'html'))
+    assert all(Path(path).is_file() for path in outputs.values())
+
+
+def test_draw_to_stream_matches_files(tmp_path):
+    fsm = build_sample_machine()
+    outputs = fsm.draw(str(tmp_path / "streamed"), formats=('svg', 'html'))
+
+    svg_stream, html_stream = io.StringIO(), io.StringIO()
+    fsm.draw_to(svg_stream)
+    fsm.draw_to(html_stream, format='html')
+    assert svg_stream.getvalue() == Path(outputs['svg']).read_text(encoding='utf-8')
+    assert svg_stream.getvalue().strip() in html_stream.getvalue()
+    with pytest.raises(ValueError):
+        fsm.draw_to(io.StringIO(), format='png')
+
+
+def test_compact_svg_output(tmp_path):
+    import xml.etree.ElementTree as ET
+
+    fsm = build_sample_machine()
+    for idx in range(2, 40):
+        fsm.transition(f'q{idx}', 'a' if idx % 2 else 'b', f'q{idx + 1}')
+    regular = Path(fsm.draw(str(tmp_path / "regular"))['svg']).read_text(encoding='utf-8')
+    fsm.configure_renderer(compact=True, precision=1)
+    compact = Path(fsm.draw(str(tmp_path / "compact"))['svg']).read_text(encoding='utf-8')
+
+    root = ET.fromstring(compact)
+    ns = '{http://www.w3.org/2000/svg}'
+    assert root.find(f'.//{ns}style') is not None
+    assert len(root.findall(f'.//{ns}use')) == len(fsm.states) + 1  # + the accept-ring symbol
+    assert 'stroke-width="2"' not in compact
+    assert len(compact) < len(regular) / 2
+
+
+def test_compact_number_formatting():
+    from finiteautomata.renderer import _format_number, _join_numbers
+
+    assert _format_number(12.0, 2) == '12'
+    assert _format_number(0.456, 2) == '.46'
+    assert _format_number(-0.456, 1) == '-.5'
+    assert _format_number(-0.0004, 2) == '0'
+    assert _join_numbers(['1', '-2', '.5']) == '1-2 .5'
+
+
+def test_canvas_html_viewer_embeds_layout(tmp_path):
+    import json
+
+    fsm = build_sample_machine()
+    fsm.configure_renderer(html_viewer='canvas')
+    outputs = fsm.draw(str(tmp_path / "canvas"), formats=('svg', 'html'))
+    html = Path(outputs['html']).read_text(encoding='utf-8')
+    assert '<svg' not in html and '<canvas' in html
+    start = html.index('id="automaton">') + len('id="automaton">')
+    payload = json.loads(html[start:html.index('</script>', start)])
+    assert sorted(payload['names']) == sorted(fsm.states)
+    assert [payload['names'][idx] for idx in payload['accept']] == ['q2']
+    assert payload['names'][payload['start']] == 'q0'
+    assert sorted(edge[-1] for edge in payload['edges']) == ['a', 'a', 'a, b']
+    assert Path(outputs['svg']).read_text(encoding='utf-8').startswith('<svg')
+
+    fsm.configure_renderer(html_viewer='webgl')
+    with pytest.raises(ValueError):
+        fsm.draw(str(tmp_path / "invalid"), formats=('html',))
+
+
+def test_draw_reports_phase_stats_and_calls_hooks(tmp_path):
+    from finiteautomata import RenderHook
+
+    events = []
+
+    class Recorder(RenderHook):
+        def phase_started(self, phase):
+            events.append(('start', phase))
+
+        def phase_finished(self, phase, stats):
+            events.append(('finish', phase, stats))
+
+    fsm = build_sample_machine()
+    outputs = fsm.draw(str(tmp_path / "plain"), formats=('svg', 'html'))
+    assert list(outputs.stats) == ['layout', 'group', 'svg']
+    assert outputs.stats['svg'].peak_bytes is None
+    assert outputs.stats['svg'].bytes_written == sum(Path(p).stat().st_size for p in outputs.values())
+
+    fsm.configure_renderer(profile=True, hooks=[Recorder()])
+    outputs = fsm.draw(str(tmp_path / "profiled"), formats=('svg', 'html'))
+    stats = outputs.stats
+    assert list(stats) == ['layout', 'group', 'svg', 'write']
+    assert stats['layout'].elements == 3
+    assert stats['group'].elements == 3
+    assert stats['svg'].elements == 6
+    assert stats['svg'].peak_bytes > 0
+    assert stats.bytes_written == sum(Path(p).stat().st_size for p in outputs.values())
+    assert [event[:2] for event in events] == [
+        ('start', 'layout'), ('finish', 'layout'),
+        ('start', 'group'), ('finish', 'group'),
+        ('start', 'svg'), ('finish', 'svg'),
+        ('start', 'write'), ('finish', 'write'),
+    ]
+    assert events[-1][2] is stats['write']
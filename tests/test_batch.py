@@ -0,0 +1,42 @@
+from pathlib import Path
+
+from finiteautomata import EPSILON, FiniteAutomata, draw_many
+from finiteautomata.batch import AutomatonSnapshot
+
+
+def build_chain(length):
+    fsm = FiniteAutomata()
+    fsm.start('q0').accept(f'q{length}')
+    for idx in range(length):
+        fsm.transition(f'q{idx}', 'a', f'q{idx + 1}')
+    return fsm
+
+
+def test_snapshot_round_trips_structure():
+    fsm = build_chain(3)
+    fsm.transition('q3', EPSILON, 'q0')
+    renderer = AutomatonSnapshot.from_automaton(fsm).renderer()
+    assert set(renderer.states) == fsm.states
+    assert renderer.start_state == 'q0'
+    assert renderer.accept_states == {'q3'}
+    assert set(renderer.transitions) == set(fsm.transitions)
+
+
+def test_draw_many_renders_every_item(tmp_path):
+    items = [(tmp_path / f'chain{n}', build_chain(n)) for n in range(1, 8)]
+    results = list(draw_many(items, formats=('svg', 'html'), workers=2, chunk_size=3))
+    assert sorted(result.index for result in results) == list(range(7))
+    for result in results:
+        assert result.ok
+        assert set(result.outputs) == {'svg', 'html'}
+        assert all(Path(path).is_file() for path in result.outputs.values())
+
+
+def test_draw_many_reports_errors_per_item(tmp_path):
+    items = [
+        (tmp_path / 'good', build_chain(2)),
+        (tmp_path / 'missing' / 'bad', build_chain(2)),
+    ]
+    results = {result.index: result for result in draw_many(items, workers=2, chunk_size=1)}
+    assert results[0].ok
+    assert isinstance(results[1].error, OSError)
@@ -0,0 +1,30 @@
+from benchmarks.generators import GENERATORS
+from benchmarks.suite import PHASES, Measurement, compare, load_results, run_suite, save_results
+
+
+def test_generators_are_seeded_and_sized():
+    for name, generator in GENERATORS.items():
+        spec = generator(50, seed=3)
+        assert spec == generator(50, seed=3), name
+        assert len(spec.states) == 50
+        assert spec.start in spec.states
+        fsm = spec.build()
+        assert fsm.states == set(spec.states)
+        assert len(fsm.transitions) == len(set(spec.transitions))
+
+
+def test_suite_round_trip_and_regression_gate(tmp_path):
+    results = run_suite(['chain'], [10], repeat=1)
+    assert set(results) == {f'chain/10/{phase}' for phase in PHASES}
+
+    path = tmp_path / 'baseline.json'
+    save_results(str(path), results)
+    assert load_results(str(path)) == results
+    assert compare(results, results) == []
+
+    baseline = {'grid/100/layout': Measurement(0.1, 1 << 20)}
+    slower = {'grid/100/layout': Measurement(0.2, 1 << 20)}
+    noisy = {'grid/100/layout': Measurement(0.102, (1 << 20) + 1024)}
+    assert [r.metric for r in compare(baseline, slower, threshold=0.25)] == ['seconds']
+    assert compare(baseline, slower, threshold=1.5) == []
+    assert compare(baseline, noisy, threshold=0.01) == []
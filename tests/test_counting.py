@@ -0,0 +1,64 @@
+import itertools
+
+import pytest
+
+from finiteautomata import FiniteAutomata
+
+
+def build_ends_with_ab():
+    fsm = FiniteAutomata()
+    fsm.start('q0').accept('q2')
+    fsm.transition('q0', 'a', 'q0').transition('q0', 'b', 'q0')
+    fsm.transition('q0', 'a', 'q1').transition('q1', 'b', 'q2')
+    return fsm
+
+
+def test_counts_match_brute_force(all_words):
+    fsm = build_ends_with_ab()
+    nfa = fsm.compile_nfa()
+    expected = [0] * 9
+    for word in all_words('ab', 8):
+        if nfa.accepts(word):
+            expected[len(word)] += 1
+    assert fsm.count_accepted_by_length(8) == expected
+    assert [fsm.count_accepted(n) for n in range(9)] == expected
+    assert [fsm.count_accepted(n, method='matrix') for n in range(9)] == expected
+
+
+def test_matrix_counting_handles_huge_lengths():
+    fsm = build_ends_with_ab()
+    assert fsm.count_accepted(500, method='matrix') == 2 ** 498
+    assert fsm.count_accepted(500) == 2 ** 498
+
+
+def test_numpy_backend():
+    pytest.importorskip('numpy')
+    assert build_ends_with_ab().count_accepted(40, method='matrix', backend='numpy') == 2 ** 38
+
+
+def test_words_are_shortlex_and_lazy():
+    fsm = build_ends_with_ab()
+    words = list(itertools.islice(fsm.accepted_words(), 7))
+    assert words == ['ab', 'aab', 'bab', 'aaab', 'abab', 'baab', 'bbab']
+    assert len(list(fsm.accepted_words(max_length=12))) == sum(fsm.count_accepted_by_length(12))
+
+
+def test_finite_language_ends_and_dead_branches_are_pruned():
+    fsm = FiniteAutomata()
+    fsm.start('s').accept('x')
+    fsm.transition('s', 'a', 'x').transition('s', 'b', 'trap')
+    fsm.transition('x', 'c', 'x2').transition('x2', 'c', 'x').accept('x2')
+    fsm.transition('trap', 'a', 'trap')
+    words = list(fsm.accepted_words(max_length=5))
+    assert words == ['a', 'ac', 'acc', 'accc', 'acccc']
+    finite = FiniteAutomata()
+    finite.start('p').accept('r')
+    finite.transition('p', 'a', 'q').transition('q', 'b', 'r').transition('p', 'b', 'r')
+    assert list(finite.accepted_words()) == ['b', 'ab']
+    assert list(FiniteAutomata().accepted_words()) == []
+    assert FiniteAutomata().count_accepted(3) == 0
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        build_ends_with_ab().count_accepted(3, method='brute')
@@ -0,0 +1,82 @@
+import threading
+
+import pytest
+
+from finiteautomata import EPSILON, FiniteAutomata
+
+
+def build_even_as():
+    fsm = FiniteAutomata()
+    fsm.start('even').accept('even')
+    fsm.transition('even', 'a', 'odd')
+    fsm.transition('odd', 'a', 'even')
+    fsm.transition('even', 'b', 'even')
+    fsm.transition('odd', 'b', 'odd')
+    return fsm
+
+
+def test_compiled_accepts_and_run():
+    dfa = build_even_as().compile()
+    assert dfa.accepts('')
+    assert dfa.accepts('abab')
+    assert not dfa.accepts('bab')
+    assert dfa.run('ab') == 'odd'
+    assert dfa.run(['a', 'a']) == 'even'
+
+
+def test_unknown_symbols_and_missing_transitions_reject():
+    fsm = FiniteAutomata()
+    fsm.start('q0').accept('q1')
+    fsm.transition('q0', 'a', 'q1')
+    dfa = fsm.compile()
+    assert dfa.accepts('a')
+    assert not dfa.accepts('aa')
+    assert not dfa.accepts('z')
+    assert dfa.run('aa') is None
+
+
+def test_compiled_dfa_is_immutable():
+    dfa = build_even_as().compile()
+    with pytest.raises(AttributeError):
+        dfa.start = 1
+
+
+def test_compile_rejects_nondeterminism():
+    fsm = FiniteAutomata()
+    fsm.start('q0').accept('q1')
+    fsm.transition('q0', 'a', 'q0')
+    fsm.transition('q0', 'a', 'q1')
+    with pytest.raises(ValueError):
+        fsm.compile()
+
+    fsm = FiniteAutomata()
+    fsm.start('q0').accept('q1')
+    fsm.transition('q0', EPSILON, 'q1')
+    with pytest.raises(ValueError):
+        fsm.compile()
+
+
+def test_compiled_dfa_shared_across_threads():
+    dfa = build_even_as().compile()
+    words = ['ab' * n + 'a' * (n % 2) for n in range(200)]
+    expected = [dfa.accepts(word) for word in words]
+    results = []
+
+    def worker():
+        results.append([dfa.accepts(word) for word in words])
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [expected] * 4
+
+
+def test_accepts_many_matches_accepts():
+    np = pytest.importorskip("numpy")
+    dfa = build_even_as().compile()
+    words = ['', 'a', 'aa', 'ab', 'ba', 'bab', 'abc', 'aabb', ['a', 'a'], 'bbbbbbbba']
+    result = dfa.accepts_many(words)
+    assert result.dtype == np.bool_
+    assert result.tolist() == [dfa.accepts(word) for word in words]
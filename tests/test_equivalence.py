@@ -0,0 +1,89 @@
+import random
+
+from finiteautomata import FiniteAutomata
+
+
+def random_nfa(rng, size, alphabet='ab', density=0.3):
+    fsm = FiniteAutomata()
+    fsm.start(0)
+    for state in range(size):
+        fsm.state(state)
+        if rng.random() < 0.3:
+            fsm.accept(state)
+        for symbol in alphabet:
+            for target in range(size):
+                if rng.random() < density:
+                    fsm.transition(state, symbol, target)
+    return fsm
+
+
+def shortest_difference(words, left, right, keep):
+    a, b = left.compile_nfa(), right.compile_nfa()
+    for word in words('ab', 7):
+        if keep(a.accepts(word), b.accepts(word)):
+            return word
+    return None
+
+
+def test_equivalent_to_minimized_form():
+    fsm = FiniteAutomata()
+    fsm.start('r0').accept('r0').accept('s0')
+    cycle = ['r0', 's1', 'r2', 's0', 'r1', 's2']
+    for src, dst in zip(cycle, cycle[1:] + cycle[:1]):
+        fsm.transition(src, 'a', dst)
+    result = fsm.equivalent(fsm.minimize())
+    assert result
+    assert result.counterexample is None
+
+
+def test_random_nfa_is_equivalent_to_its_determinization():
+    rng = random.Random(3)
+    for _ in range(40):
+        nfa = random_nfa(rng, 5)
+        dfa = ~~nfa
+        assert nfa.equivalent(dfa)
+        assert dfa.equivalent(dfa.minimize())
+        assert nfa.is_subset_of(dfa) and dfa.is_subset_of(nfa)
+        assert nfa.is_subset_of(nfa | random_nfa(rng, 3))
+
+
+def test_equivalence_counterexample_is_shortest(all_words):
+    rng = random.Random(7)
+    for _ in range(60):
+        left, right = random_nfa(rng, 4), random_nfa(rng, 4)
+        result = left.equivalent(right)
+        expected = shortest_difference(all_words, left, right, lambda x, y: x != y)
+        if expected is None:
+            continue
+        assert not result
+        assert len(result.counterexample) == len(expected)
+        word = result.counterexample
+        assert left.compile_nfa().accepts(word) != right.compile_nfa().accepts(word)
+
+
+def test_inclusion_counterexample_is_shortest(all_words):
+    rng = random.Random(11)
+    for _ in range(60):
+        left, right = random_nfa(rng, 4), random_nfa(rng, 5)
+        result = left.is_subset_of(right)
+        expected = shortest_difference(all_words, left, right, lambda x, y: x and not y)
+        if expected is None:
+            continue
+        assert not result
+        assert len(result.counterexample) == len(expected)
+        assert left.compile_nfa().accepts(result.counterexample)
+        assert not right.compile_nfa().accepts(result.counterexample)
+
+
+def test_subset_of_union():
+    small = FiniteAutomata()
+    small.start('p').accept('q')
+    small.transition('p', 'a', 'q')
+    big = FiniteAutomata()
+    big.start('x').accept('y')
+    big.transition('x', 'a', 'y').transition('x', 'b', 'y')
+    assert small.is_subset_of(big)
+    assert small.is_subset_of(small | big)
+    result = big.is_subset_of(small)
+    assert not result and result.counterexample == 'b'
+    assert small.equivalent(small & big)
@@ -0,0 +1,44 @@
+from pathlib import Path
+
+from finiteautomata import FiniteAutomata
+from finiteautomata.layout import layered_layout
+from finiteautomata.transitions import TransitionStore
+
+
+def test_layered_layout_levels_and_spacing():
+    store = TransitionStore([
+        ('s', 'a', 'x'), ('s', 'b', 'y'), ('x', 'a', 'z'), ('y', 'a', 'z'), ('z', 'a', 's'),
+    ])
+    states = ['s', 'x', 'y', 'z', 'island']
+    levels, rows, positions = layered_layout(
+        states, 's', store.successors, store.predecessors, 100, 50
+    )
+    assert levels == {'s': 0, 'x': 1, 'y': 1, 'z': 2, 'island': 3}
+    assert sorted(rows[1]) == ['x', 'y']
+    assert positions['z'][0] == 200
+    ys = sorted(positions[state][1] for state in rows[1])
+    assert ys[1] - ys[0] >= 50
+
+
+def test_layered_layout_removes_avoidable_crossing():
+    # a->d and b->c cross when each level is sorted alphabetically.
+    store = TransitionStore([
+        ('r', 'x', 'a'), ('r', 'y', 'b'), ('a', 'x', 'd'), ('b', 'x', 'c'),
+    ])
+    _, rows, _ = layered_layout(
+        ['r', 'a', 'b', 'c', 'd'], 'r', store.successors, store.predecessors, 100, 50
+    )
+    order = {state: idx for row in rows for idx, state in enumerate(row)}
+    assert (order['a'] < order['b']) == (order['d'] < order['c'])
+
+
+def test_draw_with_layered_layout(tmp_path):
+    fsm = FiniteAutomata()
+    fsm.start('q0').accept('q3')
+    for idx in range(3):
+        fsm.transition(f'q{idx}', 'a', f'q{idx + 1}')
+        fsm.transition(f'q{idx}', 'b', 'q0')
+    fsm.configure_renderer(layout='layered', crossing_sweeps=2)
+    outputs = fsm.draw(str(tmp_path / 'layered'))
+    svg = Path(outputs['svg']).read_text(encoding='utf-8')
+    assert svg.count('class="state"') == 4
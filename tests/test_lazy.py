@@ -0,0 +1,42 @@
+from finiteautomata import FiniteAutomata
+
+
+def build_nth_from_last(n):
+    """Accepts words over {a, b} whose n-th symbol from the end is 'a' (2**n DFA states)."""
+    fsm = FiniteAutomata()
+    fsm.start('q0').accept(f'q{n}')
+    fsm.transition('q0', 'a', 'q0')
+    fsm.transition('q0', 'b', 'q0')
+    fsm.transition('q0', 'a', 'q1')
+    for i in range(1, n):
+        fsm.transition(f'q{i}', 'a', f'q{i + 1}')
+        fsm.transition(f'q{i}', 'b', f'q{i + 1}')
+    return fsm
+
+
+def test_lazy_dfa_agrees_with_nfa():
+    fsm = build_nth_from_last(4)
+    lazy, nfa = fsm.compile_lazy(), fsm.compile_nfa()
+    for word in ('abbb', 'babbb', 'bbbb', 'aaaa', 'abab', ''):
+        assert lazy.accepts(word) == nfa.accepts(word)
+    assert lazy.run('a') == frozenset({'q0', 'q1'})
+
+
+def test_lazy_dfa_cache_hits():
+    lazy = build_nth_from_last(3).compile_lazy()
+    assert lazy.accepts('abb')
+    first = lazy.cache_info()
+    assert first.misses == 3 and first.hits == 0
+    assert lazy.accepts('abb')
+    second = lazy.cache_info()
+    assert second.misses == 3 and second.hits == 3
+    assert second.hit_rate == 0.5
+
+
+def test_lazy_dfa_cache_is_bounded():
+    lazy = build_nth_from_last(8).compile_lazy(cache_size=16)
+    word = 'abbabaabbbabaabababbbaaab' * 4
+    assert lazy.accepts(word) == build_nth_from_last(8).compile_nfa().accepts(word)
+    stats = lazy.cache_info()
+    assert stats.size <= 16
+    assert stats.evictions > 0
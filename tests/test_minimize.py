@@ -0,0 +1,55 @@
+import pytest
+
+from finiteautomata import FiniteAutomata
+
+
+def build_redundant_mod3():
+    """Counts a's modulo 3 using six states (each residue duplicated) plus an unreachable state."""
+    fsm = FiniteAutomata()
+    fsm.start('r0').accept('r0').accept('s0')
+    fsm.transition('r0', 'a', 's1')
+    fsm.transition('s1', 'a', 'r2')
+    fsm.transition('r2', 'a', 's0')
+    fsm.transition('s0', 'a', 'r1')
+    fsm.transition('r1', 'a', 's2')
+    fsm.transition('s2', 'a', 'r0')
+    for state in ('r0', 'r1', 'r2', 's0', 's1', 's2'):
+        fsm.transition(state, 'b', state)
+    fsm.transition('island', 'a', 'r0')
+    return fsm
+
+
+def test_minimize_merges_equivalent_states(all_words):
+    fsm = build_redundant_mod3()
+    minimal = fsm.minimize()
+    assert len(minimal.states) == 3
+    assert minimal.start_state == 'r0'
+    assert 'island' not in minimal.states
+    original, reduced = fsm.compile(), minimal.compile()
+    for word in all_words('ab', 7):
+        assert original.accepts(word) == reduced.accepts(word)
+
+
+def test_minimize_without_trim_keeps_unreachable_states():
+    minimal = build_redundant_mod3().minimize(trim=False)
+    assert 'island' in minimal.states
+
+
+def test_minimize_drops_dead_states():
+    fsm = FiniteAutomata()
+    fsm.start('q0').accept('q1')
+    fsm.transition('q0', 'a', 'q1')
+    fsm.transition('q0', 'b', 'trap')
+    fsm.transition('trap', 'a', 'trap')
+    minimal = fsm.minimize()
+    assert minimal.states == {'q0', 'q1'}
+    assert list(minimal.transitions) == [('q0', 'a', 'q1')]
+
+
+def test_minimize_requires_determinism():
+    fsm = FiniteAutomata()
+    fsm.start('q0')
+    fsm.transition('q0', 'a', 'q0')
+    fsm.transition('q0', 'a', 'q1')
+    with pytest.raises(ValueError):
+        fsm.minimize()
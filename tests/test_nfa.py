@@ -0,0 +1,45 @@
+from finiteautomata import EPSILON, FiniteAutomata
+
+
+def build_ends_with_ab():
+    fsm = FiniteAutomata()
+    fsm.start('q0').accept('q2')
+    fsm.transition('q0', 'a', 'q0')
+    fsm.transition('q0', 'b', 'q0')
+    fsm.transition('q0', 'a', 'q1')
+    fsm.transition('q1', 'b', 'q2')
+    return fsm
+
+
+def test_nfa_accepts_nondeterministic_language():
+    nfa = build_ends_with_ab().compile_nfa()
+    assert nfa.accepts('ab')
+    assert nfa.accepts('bbaab')
+    assert not nfa.accepts('aba')
+    assert not nfa.accepts('')
+    assert nfa.run('a') == frozenset({'q0', 'q1'})
+
+
+def test_nfa_epsilon_closure():
+    fsm = FiniteAutomata()
+    fsm.start('s').accept('f')
+    fsm.transition('s', EPSILON, 'x')
+    fsm.transition('x', EPSILON, 'y')
+    fsm.transition('y', 'c', 'z')
+    fsm.transition('z', EPSILON, 'f')
+    fsm.transition('f', EPSILON, 's')
+    nfa = fsm.compile_nfa()
+    assert nfa.run('') == frozenset({'s', 'x', 'y'})
+    assert nfa.accepts('c')
+    assert nfa.accepts('ccc')
+    assert not nfa.accepts('cd')
+
+
+def test_nfa_matches_dfa_on_deterministic_machine():
+    fsm = FiniteAutomata()
+    fsm.start('even').accept('even')
+    fsm.transition('even', 'a', 'odd')
+    fsm.transition('odd', 'a', 'even')
+    dfa, nfa = fsm.compile(), fsm.compile_nfa()
+    for n in range(6):
+        assert dfa.accepts('a' * n) == nfa.accepts('a' * n)
@@ -0,0 +1,98 @@
+import pytest
+
+from finiteautomata import SINK, FiniteAutomata
+
+
+def build_even_as():
+    fsm = FiniteAutomata()
+    fsm.start('e').accept('e')
+    fsm.transition('e', 'a', 'o').transition('o', 'a', 'e')
+    fsm.transition('e', 'b', 'e').transition('o', 'b', 'o')
+    return fsm
+
+
+def build_ends_with_b():
+    """Nondeterministic: guesses the final b."""
+    fsm = FiniteAutomata()
+    fsm.start('s').accept('f')
+    fsm.transition('s', 'a', 's').transition('s', 'b', 's')
+    fsm.transition('s', 'b', 'f')
+    return fsm
+
+
+@pytest.mark.parametrize('operator, expected', [
+    ('__and__', lambda x, y: x and y),
+    ('__or__', lambda x, y: x or y),
+    ('__sub__', lambda x, y: x and not y),
+])
+def test_binary_operations_match_components(operator, expected, all_words):
+    left, right = build_even_as(), build_ends_with_b()
+    combined = getattr(left, operator)(right)
+    nfa_l, nfa_r, nfa_c = left.compile_nfa(), right.compile_nfa(), combined.compile_nfa()
+    for word in all_words('ab', 6):
+        assert nfa_c.accepts(word) == expected(nfa_l.accepts(word), nfa_r.accepts(word))
+
+
+def test_complement_is_deterministic_and_complete(all_words):
+    fsm = build_ends_with_b()
+    complement = ~fsm
+    compiled = complement.compile()
+    for word in all_words('ab', 6):
+        assert compiled.accepts(word) != fsm.compile_nfa().accepts(word)
+    assert complement.start_state == 's'
+
+
+def test_intersection_only_builds_reachable_pairs():
+    fsm = FiniteAutomata()
+    fsm.start('q0').accept('q1')
+    fsm.transition('q0', 'a', 'q1')
+    for i in range(2, 50):
+        fsm.transition(f'q{i}', 'a', f'q{i}')
+    product = fsm & build_even_as()
+    assert product.states == {('q0', 'e'), ('q1', 'o')}
+    assert product.accept_states == set()
+
+
+def test_complement_names_the_sink():
+    fsm = FiniteAutomata()
+    fsm.start('q0').accept('q1')
+    fsm.transition('q0', 'a', 'q1')
+    complement = ~fsm
+    assert SINK in complement.states
+    assert complement.accept_states == {'q0', SINK}
+
+
+def test_emptiness_and_witness():
+    even, ends_b = build_even_as(), build_ends_with_b()
+    assert even.intersects(ends_b)
+    assert even.product(ends_b, 'intersection').find_word() == ('b',)
+    assert (even - even).is_empty()
+    assert even.product(even, 'difference').is_empty()
+    assert not even.is_empty()
+    assert FiniteAutomata().is_empty()
+
+
+def test_lazy_product_accepts():
+    product = build_even_as().product(build_ends_with_b(), 'union')
+    assert product.accepts('aab')
+    assert product.accepts('')
+    assert not product.accepts('ba')
+    assert not product.accepts('c')
+
+
+def test_unknown_operation():
+    with pytest.raises(ValueError):
+        build_even_as().product(build_even_as(), 'xor')
+
+
+def test_missing_start_state_is_the_empty_language():
+    even, empty = build_even_as(), FiniteAutomata()
+    assert (even & empty).is_empty()
+    assert (empty - even).is_empty()
+    assert (even | empty).equivalent(even)
+    assert (even - empty).equivalent(even)
+    assert not even.intersects(empty)
+    assert empty.is_subset_of(even)
+    result = even.equivalent(empty)
+    assert not result and result.counterexample == ''
+    assert empty.equivalent(FiniteAutomata())
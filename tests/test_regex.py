@@ -0,0 +1,55 @@
+import re
+
+import pytest
+
+from finiteautomata import EPSILON, FiniteAutomata, clear_regex_cache, regex_cache_info
+
+
+@pytest.mark.parametrize('pattern', [
+    '', 'a', 'ab|c', '(a|b)*abb', 'a+b?', '[a-c]+c', '(ab|)*', '\\(a\\)', '(a*)*',
+])
+def test_regex_matches_python_re(pattern, all_words):
+    nfa = FiniteAutomata.from_regex(pattern)
+    dfa = FiniteAutomata.from_regex(pattern, deterministic=True)
+    compiled_nfa, compiled_dfa = nfa.compile_nfa(), dfa.compile()
+    expected = re.compile(pattern)
+    for word in all_words('abc()', 4):
+        matched = expected.fullmatch(word) is not None
+        assert compiled_nfa.accepts(word) == matched
+        assert compiled_dfa.accepts(word) == matched
+
+
+def test_regex_result_is_an_ordinary_automaton():
+    fsm = FiniteAutomata.from_regex('ab*')
+    assert fsm.start_state == 'q0'
+    assert any(symbol == EPSILON for _, symbol, _ in fsm.transitions)
+    dfa = FiniteAutomata.from_regex('ab*', deterministic=True)
+    assert dfa.states == {'q0', 'q1'}
+    assert dfa.equivalent(fsm)
+
+
+def test_regex_cache_hits_and_returns_fresh_copies():
+    clear_regex_cache()
+    first = FiniteAutomata.from_regex('(a|b)+')
+    first.transition('q0', 'z', 'q0')
+    second = FiniteAutomata.from_regex('(a|b)+')
+    FiniteAutomata.from_regex('(a|b)+', deterministic=True)
+    assert ('q0', 'z', 'q0') not in second.transitions
+    stats = regex_cache_info()
+    assert (stats.hits, stats.misses, stats.size) == (1, 2, 2)
+    assert stats.hit_rate == pytest.approx(1 / 3)
+
+
+def test_regex_cache_is_bounded():
+    clear_regex_cache(maxsize=2)
+    for pattern in ('a', 'b', 'c'):
+        FiniteAutomata.from_regex(pattern)
+    stats = regex_cache_info()
+    assert stats.size == 2 and stats.evictions == 1
+    clear_regex_cache(maxsize=256)
+
+
+@pytest.mark.parametrize('pattern', ['(a', 'a)', '*a', '[a', '[]', 'a\\', '[c-a]'])
+def test_regex_syntax_errors(pattern):
+    with pytest.raises(ValueError):
+        FiniteAutomata.from_regex(pattern)
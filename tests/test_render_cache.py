@@ -0,0 +1,97 @@
+from pathlib import Path
+
+from finiteautomata import FiniteAutomata, RendererTheme
+from finiteautomata.renderer import AutomataRenderer
+
+
+def build_chain(length):
+    fsm = FiniteAutomata()
+    fsm.start('q0').accept(f'q{length}')
+    for idx in range(length):
+        fsm.transition(f'q{idx}', 'a', f'q{idx + 1}')
+    return fsm
+
+
+def test_theme_change_skips_layout(tmp_path):
+    fsm = build_chain(4)
+    fsm.draw(str(tmp_path / 'first'))
+    stats = fsm.render_cache.recomputed
+    assert stats['layout'] == 1 and stats['edges'] == 4 and stats['states'] == 5
+
+    fsm.draw(str(tmp_path / 'same'))
+    assert stats['layout'] == 1 and stats['layout_reused'] == 1
+    assert stats['edges'] == 4 and stats['states'] == 5
+
+    fsm.draw(str(tmp_path / 'themed'), theme=RendererTheme(state_fill='#000000'))
+    assert stats['layout'] == 1 and stats['layout_reused'] == 2
+    assert stats['edges'] == 8 and stats['states'] == 10
+
+
+def test_added_transition_only_recomputes_affected_parts(tmp_path):
+    fsm = build_chain(6)
+    fsm.draw(str(tmp_path / 'before'))
+    stats = fsm.render_cache.recomputed
+    levels_before, edges_before = stats['levels'], stats['edges']
+
+    fsm.transition('q6', 'b', 'q6')
+    fsm.draw(str(tmp_path / 'after'))
+    assert stats['layout'] == 1
+    assert stats['layout_incremental'] == 1
+    assert stats['levels'] == levels_before
+    assert stats['edges'] == edges_before + 1
+
+
+def test_incremental_layout_matches_full_layout(tmp_path):
+    fsm = build_chain(5)
+    fsm.draw(str(tmp_path / 'warm'))
+    fsm.transition('q0', 'b', 'q3')
+    fsm.transition('x', 'a', 'q1')
+    fsm.accept('q2')
+    outputs = fsm.draw(str(tmp_path / 'incremental'))
+    assert fsm.render_cache.recomputed['layout'] == 1
+
+    fresh = AutomataRenderer(fsm.states, fsm.start_state, fsm.accept_states, fsm.transitions)
+    assert fresh._positions == fsm.render_cache.positions
+    incremental_svg = Path(outputs['svg']).read_text(encoding='utf-8')
+    assert sorted(incremental_svg.splitlines()) == sorted(fresh._build_svg().splitlines())
+
+
+def test_store_append_is_folded_into_layout(tmp_path):
+    fsm = FiniteAutomata()
+    fsm.start('a').transition('a', 'x', 'b').state('c')
+    fsm.draw(str(tmp_path / 'before'))
+    assert fsm.render_cache.levels['c'] == 2
+    fsm.transitions.append(('a', 'y', 'c'))
+    fsm.draw(str(tmp_path / 'after'))
+    assert fsm.render_cache.levels['c'] == 1
+    assert fsm.render_cache.recomputed['layout_incremental'] == 1
+
+
+def test_same_length_store_edit_relayouts(tmp_path):
+    fsm = FiniteAutomata()
+    fsm.start('a').transition('a', 'x', 'b').transition('b', 'x', 'c')
+    fsm.draw(str(tmp_path / 'before'))
+    assert fsm.render_cache.levels['c'] == 2
+    fsm.transitions[1] = ('a', 'y', 'c')
+    fsm.draw(str(tmp_path / 'after'))
+    assert fsm.render_cache.levels['c'] == 1
+    assert fsm.render_cache.recomputed['layout'] == 2
+
+
+def test_fragment_retention_is_bounded(tmp_path):
+    fsm = build_chain(30)
+    fsm.render_cache.max_fragments = 20
+    fsm.draw(str(tmp_path / 'large'))
+    assert not fsm.render_cache.state_fragments and not fsm.render_cache.edge_fragments
+    fsm.render_cache.max_fragments = None
+    fsm.draw(str(tmp_path / 'retained'))
+    assert len(fsm.render_cache.state_fragments) == 31
+
+
+def test_recompute_hook_is_called(tmp_path):
+    events = []
+    fsm = build_chain(2)
+    fsm.render_cache.on_recompute = lambda counter, amount: events.append((counter, amount))
+    fsm.draw(str(tmp_path / 'hooked'))
+    assert ('layout', 1) in events
+    assert ('edges', 2) in events
@@ -0,0 +1,100 @@
+import random
+
+import pytest
+
+from finiteautomata import FiniteAutomata
+from finiteautomata.renderer import AutomataRenderer, RendererConfig
+from finiteautomata.routing import SpatialGrid, label_overlaps, route_edges
+
+
+def random_sparse(count, seed):
+    """A random tree over `count` states plus about one short forward edge per state."""
+    rng = random.Random(seed)
+    names = [f'q{idx}' for idx in range(count)]
+    transitions = [(names[rng.randrange(max(0, idx - 64), idx)], 'a', names[idx]) for idx in range(1, count)]
+    for _ in range(count):
+        src = rng.randrange(count)
+        transitions.append((names[src], 'b', names[min(count - 1, src + rng.randrange(1, 128))]))
+    return names, transitions
+
+
+def drawn_label_overlaps(renderer):
+    positions = renderer._positions
+    labels = (
+        (renderer._edge_geometry(src, dst, positions[src], positions[dst])[2], ', '.join(symbols))
+        for (src, dst), symbols in renderer._grouped_transitions.items()
+    )
+    return label_overlaps(labels, renderer.config.state_radius * 2)
+
+
+def test_grid_hits_ignore_owner():
+    grid = SpatialGrid(10)
+    grid.insert((0, 0, 5, 5), 'a')
+    assert grid.hits((4, 4, 8, 8))
+    assert not grid.hits((4, 4, 8, 8), ignore=('a',))
+    assert not grid.hits((5, 5, 8, 8))
+
+
+def test_long_boxes_are_indexed_near_their_ends():
+    grid = SpatialGrid(10)
+    grid.insert((0, 0, 2, 1000), 'run')
+    assert grid.hits((0, 5, 2, 6)) and grid.hits((0, 990, 2, 995))
+    assert not grid.hits((0, 500, 2, 505))
+
+
+def test_colliding_labels_are_nudged_apart():
+    positions = {'a': (0.0, 0.0), 'b': (200.0, 160.0)}
+
+    def geometry(src, dst, src_pos, dst_pos):
+        return 'L', [(36.0, 0.0), (100.0, 0.0), (100.0, 160.0), (164.0, 160.0)], (100.0, 68.0)
+
+    routes = route_edges(positions, [('a', 'b', 'x'), ('b', 'a', 'y')], geometry, 36)
+    first, second = routes[('a', 'b')], routes[('b', 'a')]
+    assert first[2] == (100.0, 68.0)
+    assert second[2] != first[2]
+    # The second bend moves to a free lane next to the first one.
+    assert second[1][1][0] != first[1][1][0]
+
+
+def test_spatial_routing_reduces_label_overlaps():
+    states, transitions = random_sparse(300, seed=1)
+    overlaps = {}
+    for routing in ('direct', 'spatial'):
+        config = RendererConfig(routing=routing)
+        renderer = AutomataRenderer(states, states[0], (), transitions, config=config)
+        overlaps[routing] = drawn_label_overlaps(renderer)
+    assert overlaps['spatial'] < overlaps['direct'] / 10
+    assert 'route' in renderer.stats
+
+
+def test_routes_are_cached_with_the_layout(tmp_path):
+    fsm = FiniteAutomata()
+    fsm.start('a').accept('c').transition('a', 'x', 'b').transition('b', 'y', 'c')
+    fsm.configure_renderer(routing='spatial')
+    fsm.draw(str(tmp_path / 'first'))
+    assert fsm.render_cache.recomputed['routes'] == 2
+    fsm.draw(str(tmp_path / 'again'))
+    assert fsm.render_cache.recomputed['routes'] == 2
+    fsm.transition('a', 'z', 'c')
+    fsm.draw(str(tmp_path / 'grown'))
+    assert fsm.render_cache.recomputed['routes'] == 5
+    assert '>z<' in (tmp_path / 'grown.svg').read_text(encoding='utf-8')
+
+
+def test_routes_follow_same_length_edits(tmp_path):
+    fsm = FiniteAutomata()
+    fsm.start('a').transition('a', 'x', 'b').transition('b', 'y', 'c')
+    fsm.configure_renderer(routing='spatial')
+    fsm.draw(str(tmp_path / 'first'))
+    routes = fsm.render_cache.routes
+    fsm.transitions[1] = ('a', 'y', 'c')
+    fsm.draw(str(tmp_path / 'edited'))
+    assert set(fsm.render_cache.routes) == {('a', 'b'), ('a', 'c')} != set(routes)
+    assert fsm.render_cache.routes_key == (fsm.renderer_config.state_radius, fsm.version)
+
+
+def test_unknown_routing_is_rejected(tmp_path):
+    fsm = FiniteAutomata()
+    fsm.start('a').configure_renderer(routing='manhattan')
+    with pytest.raises(ValueError):
+        fsm.draw(str(tmp_path / 'bad'))
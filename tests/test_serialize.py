@@ -0,0 +1,103 @@
+import pytest
+
+from finiteautomata import EPSILON, AutomatonImage, FiniteAutomata
+
+
+def build_machine():
+    fsm = FiniteAutomata()
+    fsm.start('q0').accept('q2').accept('é')
+    fsm.transition('q0', 'a', 'q1')
+    fsm.transition('q1', 'b', 'q2')
+    fsm.transition('q2', 'a', 'q2')
+    fsm.transition('q1', 'c', 'é')
+    fsm.state('island')
+    return fsm
+
+
+def assert_same(loaded, original):
+    assert isinstance(loaded, FiniteAutomata)
+    assert loaded.states == original.states
+    assert loaded.start_state == original.start_state
+    assert loaded.accept_states == original.accept_states
+    assert set(loaded.transitions) == set(original.transitions)
+
+
+@pytest.mark.parametrize('name', ['fsm.json', 'fsm.fab'])
+def test_round_trip(tmp_path, name):
+    fsm = build_machine()
+    path = tmp_path / name
+    fsm.save(path)
+    assert_same(FiniteAutomata.load(path), fsm)
+
+
+def test_format_override_and_detection(tmp_path):
+    fsm = build_machine()
+    path = tmp_path / 'machine.json'
+    fsm.save(path, format='binary')
+    assert path.read_bytes()[:4] == b'FAUT'
+    assert_same(FiniteAutomata.load(path), fsm)
+    with pytest.raises(ValueError):
+        fsm.save(path, format='xml')
+
+
+def test_image_queries_without_materializing(tmp_path):
+    fsm = build_machine()
+    path = tmp_path / 'fsm.fab'
+    fsm.save(path)
+    with AutomatonImage(path) as image:
+        assert len(image) == 4
+        assert list(image.states)[0] == 'q0' and image.start_state == 'q0'
+        assert 'é' in image.states and image.states.index('é') >= 0
+        assert image.accepts('ab') and image.accepts('abaa') and image.accepts('ac')
+        assert not image.accepts('a') and not image.accepts('ax')
+        assert image.run('ab') == frozenset({'q2'})
+        compiled = image.compile()
+        for word in ['', 'a', 'ab', 'aba', 'ac', 'bb']:
+            assert compiled.accepts(word) == fsm.compile().accepts(word)
+        assert_same(image.to_automaton(), fsm)
+
+
+def test_image_simulates_nondeterminism_and_epsilon(tmp_path):
+    fsm = FiniteAutomata()
+    fsm.start('s').accept('f')
+    fsm.transition('s', EPSILON, 'x')
+    fsm.transition('x', 'a', 'x')
+    fsm.transition('x', 'a', 'f')
+    path = tmp_path / 'nfa.fab'
+    fsm.save(path)
+    with AutomatonImage(path) as image:
+        assert image.run('aa') == frozenset({'x', 'f'})
+        assert image.accepts('a') and not image.accepts('')
+        with pytest.raises(ValueError):
+            image.compile()
+
+
+def test_binary_rejects_non_string_names_and_bad_files(tmp_path):
+    fsm = FiniteAutomata()
+    fsm.start(0).transition(0, 'a', 1)
+    with pytest.raises(TypeError):
+        fsm.save(tmp_path / 'ints.fab')
+    fsm.save(tmp_path / 'ints.json')
+    assert FiniteAutomata.load(tmp_path / 'ints.json').transitions == [(0, 'a', 1)]
+
+    bogus = tmp_path / 'bogus.fab'
+    bogus.write_bytes(b'FAUT' + b'\0' * 8)
+    with pytest.raises(ValueError):
+        AutomatonImage(bogus)
+
+
+def test_json_round_trips_product_state_names(tmp_path):
+    left = FiniteAutomata()
+    left.start('p').accept('q').transition('p', 'a', 'q').transition('p', 'a', 'p')
+    right = FiniteAutomata()
+    right.start('x').accept('x').transition('x', 'a', 'x')
+    product = left & right
+    assert any(isinstance(state[0], frozenset) for state in product.states)
+    path = tmp_path / 'product.json'
+    product.save(path)
+    assert_same(FiniteAutomata.load(path), product)
+
+    fsm = FiniteAutomata()
+    fsm.start(object())
+    with pytest.raises(TypeError):
+        fsm.save(tmp_path / 'objects.json')
@@ -0,0 +1,51 @@
+import io
+import mmap
+
+from finiteautomata import FiniteAutomata
+
+
+def build_error_matcher():
+    fsm = FiniteAutomata()
+    fsm.start('s').accept('done')
+    fsm.transition('s', 'E', 'e')
+    fsm.transition('e', 'R', 'er')
+    fsm.transition('er', 'R', 'done')
+    return fsm
+
+
+DATA = b'INFO ok\nERROR boom\nWARN ERR ERRR\n'
+EXPECTED = [DATA.index(b'ERROR') + 3, DATA.index(b'ERR ') + 3, DATA.index(b'ERRR') + 3]
+
+
+def test_scan_bytes_and_memoryview():
+    fsm = build_error_matcher()
+    assert [m.offset for m in fsm.scan(DATA)] == EXPECTED
+    assert [m.offset for m in fsm.scan(memoryview(DATA))] == EXPECTED
+    assert {m.state for m in fsm.scan(DATA)} == {'done'}
+
+
+def test_scan_file_path_and_objects(tmp_path):
+    fsm = build_error_matcher()
+    path = tmp_path / 'app.log'
+    path.write_bytes(DATA)
+    assert [m.offset for m in fsm.scan(str(path))] == EXPECTED
+    assert [m.offset for m in fsm.scan(io.BytesIO(DATA), chunk_size=4)] == EXPECTED
+    with open(path, 'rb') as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        assert [m.offset for m in fsm.scan(mapped)] == EXPECTED
+
+
+def test_matcher_carries_state_across_chunks():
+    matcher = build_error_matcher().matcher()
+    offsets = []
+    for idx in range(0, len(DATA), 3):
+        offsets.extend(m.offset for m in matcher.feed(DATA[idx:idx + 3]))
+    assert offsets == EXPECTED
+    assert matcher.offset == len(DATA)
+
+
+def test_anchored_scan_stops_when_run_dies():
+    matcher = build_error_matcher().matcher(search=False)
+    assert [m.offset for m in matcher.feed(b'ERRORS')] == [3]
+    assert not matcher.alive
+    assert list(matcher.feed(b'ERR')) == []
+    assert matcher.offset == 9
@@ -0,0 +1,146 @@
+import random
+from array import array
+from pathlib import Path
+
+from finiteautomata import FiniteAutomata
+from finiteautomata.transitions import CompactTransitionStore, TransitionStore
+
+
+def test_transition_store_is_list_compatible():
+    fsm = FiniteAutomata()
+    fsm.transition('q0', 'a', 'q1').transition('q1', 'b', 'q0')
+    assert len(fsm.transitions) == 2
+    assert fsm.transitions[0] == ('q0', 'a', 'q1')
+    assert list(fsm.transitions) == [('q0', 'a', 'q1'), ('q1', 'b', 'q0')]
+    assert fsm.transitions == [('q0', 'a', 'q1'), ('q1', 'b', 'q0')]
+    assert ('q1', 'b', 'q0') in fsm.transitions
+    assert ('q1', 'a', 'q0') not in fsm.transitions
+
+
+def test_duplicate_transitions_are_ignored():
+    fsm = FiniteAutomata()
+    fsm.transition('q0', 'a', 'q1').transition('q0', 'a', 'q1')
+    assert len(fsm.transitions) == 1
+    assert fsm.transitions.symbols_between('q0', 'q1') == ('a',)
+
+
+def test_adjacency_indexes():
+    store = TransitionStore([
+        ('q0', 'a', 'q1'),
+        ('q0', 'b', 'q1'),
+        ('q0', 'b', 'q2'),
+        ('q2', 'a', 'q1'),
+    ])
+    assert set(store.successors('q0')) == {'q1', 'q2'}
+    assert set(store.successors('q0', 'b')) == {'q1', 'q2'}
+    assert set(store.predecessors('q1')) == {'q0', 'q2'}
+    assert set(store.predecessors('q1', 'a')) == {'q0', 'q2'}
+    assert not store.successors('q1')
+    assert dict(store.grouped()) == {
+        ('q0', 'q1'): ['a', 'b'],
+        ('q0', 'q2'): ['b'],
+        ('q2', 'q1'): ['a'],
+    }
+
+
+def test_assigning_a_list_keeps_indexes():
+    fsm = FiniteAutomata()
+    fsm.transitions = [('q0', 'a', 'q1'), ('q0', 'a', 'q1')]
+    assert isinstance(fsm.transitions, TransitionStore)
+    assert len(fsm.transitions) == 1
+    assert set(fsm.transitions.successors('q0')) == {'q1'}
+
+
+def test_from_unique_matches_incremental_build():
+    transitions = [('a', 'x', 'b'), ('a', 'y', 'b'), ('b', 'x', 'a'), ('a', 'x', 'c')]
+    bulk = TransitionStore.from_unique(transitions)
+    store = TransitionStore(transitions)
+    assert bulk == store
+    assert bulk.grouped() == store.grouped()
+    assert set(bulk.successors('a', 'x')) == {'b', 'c'}
+    assert set(bulk.predecessors('b')) == {'a'}
+    assert bulk.symbols_between('a', 'b') == ('x', 'y')
+
+
+def test_compact_store_matches_indexed_store():
+    edges = [
+        ('q0', 'a', 'q1'),
+        ('q0', 'b', 'q1'),
+        ('q0', 'b', 'q2'),
+        ('q2', 'a', 'q1'),
+        ('q0', 'a', 'q1'),
+    ]
+    compact, indexed = CompactTransitionStore(edges), TransitionStore(edges)
+    assert compact == indexed and len(compact) == 4
+    assert compact[1:3] == indexed[1:3] and compact[-1] == ('q2', 'a', 'q1')
+    assert ('q0', 'b', 'q2') in compact and ('q2', 'b', 'q0') not in compact
+    for state in ('q0', 'q1', 'q2', 'missing'):
+        assert set(compact.successors(state)) == set(indexed.successors(state))
+        assert set(compact.predecessors(state, 'a')) == set(indexed.predecessors(state, 'a'))
+    assert dict(compact.grouped()) == dict(indexed.grouped())
+    compact.add('q1', 'c', 'q0')
+    assert compact.symbols_between('q1', 'q0') == ('c',)
+    assert set(compact.successors('q1')) == {'q0'}
+
+
+def test_list_edits_keep_indexes_in_step():
+    edges = [('q0', 'a', 'q1'), ('q0', 'b', 'q1'), ('q1', 'a', 'q2'), ('q2', 'a', 'q0')]
+    for store_type in (TransitionStore, CompactTransitionStore):
+        store, expected = store_type(edges), list(edges)
+        store.remove(('q0', 'b', 'q1'))
+        expected.remove(('q0', 'b', 'q1'))
+        store.insert(0, ('q2', 'b', 'q2'))
+        expected.insert(0, ('q2', 'b', 'q2'))
+        store.insert(0, ('q1', 'a', 'q2'))  # already present
+        assert store.pop() == expected.pop()
+        store[1] = expected[1] = ('q0', 'c', 'q2')
+        del store[-1]
+        del expected[-1]
+        assert store == expected == [('q2', 'b', 'q2'), ('q0', 'c', 'q2')]
+        assert dict(store.grouped()) == {('q2', 'q2'): ['b'], ('q0', 'q2'): ['c']}
+        assert set(store.successors('q0')) == {'q2'} and not store.successors('q1')
+        assert ('q0', 'a', 'q1') not in store and store.index(('q0', 'c', 'q2')) == 1
+        assert store.mutations == 10 and store.rewrites == 6
+        store[:] = edges
+        assert store == edges and store.grouped()[('q0', 'q1')] == ['a', 'b']
+        store.clear()
+        assert not store and not store.grouped()
+
+
+def test_store_edits_bump_the_version():
+    fsm = FiniteAutomata()
+    fsm.transition('q0', 'a', 'q1')
+    version = fsm.version
+    fsm.transitions[0] = ('q0', 'b', 'q1')
+    assert fsm.version > version
+    version = fsm.version
+    fsm.transitions = []
+    assert fsm.version > version
+
+
+def test_compact_store_deduplicates_without_a_key_set():
+    rng = random.Random(5)
+    edges = [(rng.randrange(3000), f's{rng.randrange(40)}', rng.randrange(3000)) for _ in range(20000)]
+    compact = CompactTransitionStore(edges)
+    assert list(compact) == list(dict.fromkeys(edges))
+    assert all(edge in compact for edge in edges[::50])
+    assert (0, 's999', 0) not in compact and (5000, 's0', 0) not in compact
+    keys = compact._keys
+    assert isinstance(keys._sorted, array) and keys._sorted.typecode == 'Q'
+    assert len(keys._pending) <= max(keys.MIN_PENDING, len(keys._sorted) >> 4)
+
+
+def test_compact_automaton_keeps_the_public_api(tmp_path):
+    fsm = FiniteAutomata(compact=True)
+    fsm.start('q0').accept('q2')
+    fsm.transition('q0', 'a', 'q1').transition('q1', 'b', 'q2').transition('q1', 'b', 'q2')
+    assert isinstance(fsm.transitions, CompactTransitionStore)
+    assert list(fsm.transitions) == [('q0', 'a', 'q1'), ('q1', 'b', 'q2')]
+    assert fsm.compile().accepts('ab')
+    assert fsm.minimize().compact
+    outputs = fsm.draw(str(tmp_path / 'compact'))
+    regular = FiniteAutomata()
+    regular.start('q0').accept('q2')
+    regular.transition('q0', 'a', 'q1').transition('q1', 'b', 'q2')
+    expected = regular.draw(str(tmp_path / 'regular'))
+    assert Path(outputs['svg']).read_text() == Path(expected['svg']).read_text()